@@ -251,7 +251,7 @@ def populate_neo4j_dotnet_data():
         return False
     
     # Create client
-    client = Neo4jDotNetClient(config.uri, config.username, config.password)
+    client = Neo4jDotNetClient(config.uri, config.username, config.password, config.database)
     if not client.connect():
         console.print("[red]❌ Failed to connect to Neo4j.[/red]")
         return False
@@ -304,53 +304,40 @@ def populate_neo4j_dotnet_data():
             )
             progress.advance(task4)
         
+        # Queue relationships and write them per type once every node exists
+        client.begin_bulk()
+        
         # Create classes and relationships
         task5 = progress.add_task("Creating classes and relationships...", total=20)
         for repo_name, repo_data in fake_data["repositories"].items():
-            # Create classes
+            # Create classes, their methods and stored procedure calls in one query
+            client.bulk_ingest_class_tree([
+                {
+                    "name": class_name,
+                    "namespace": class_data["namespace"],
+                    "type": class_data["type"],
+                    "source": "dotnet",
+                    "methods": [
+                        {"name": method_name, "namespace": f"{class_data['namespace']}.{method_name}"}
+                        for method_name in class_data["methods"]
+                    ],
+                    "calls_sps": [
+                        {"name": sp_name, "namespace": "dbo"}
+                        for sp_name in class_data["calls_sp"]
+                    ]
+                }
+                for class_name, class_data in repo_data["classes"].items()
+            ])
+            
             for class_name, class_data in repo_data["classes"].items():
-                client.create_class_node(
-                    class_name, 
-                    class_data["namespace"], 
-                    class_data["type"], 
-                    "dotnet"
-                )
-                
                 # Create repository has class relationship
                 client.create_repository_has_class(
-                    repo_name, 
+                    repo_name,
                     repo_data["namespace"],
-                    class_name, 
+                    class_name,
                     class_data["namespace"]
                 )
                 
-                # Create methods
-                for method_name in class_data["methods"]:
-                    method_namespace = f"{class_data['namespace']}.{method_name}"
-                    client.create_method_node(
-                        method_name, 
-                        method_namespace, 
-                        "Method", 
-                        "dotnet"
-                    )
-                    
-                    # Create class has method relationship
-                    client.create_class_has_method(
-                        class_name, 
-                        class_data["namespace"],
-                        method_name, 
-                        method_namespace
-                    )
-                
-                # Create class calls stored procedure relationships
-                for sp_name in class_data["calls_sp"]:
-                    client.create_class_calls_sp(
-                        class_name, 
-                        class_data["namespace"],
-                        sp_name, 
-                        "dbo"
-                    )
-                
                 # Create method calls method relationships (simplified - methods call other methods in same class)
                 for i, method_name in enumerate(class_data["methods"]):
                     for j, other_method_name in enumerate(class_data["methods"]):
@@ -417,6 +404,10 @@ def populate_neo4j_dotnet_data():
                     "dbo"
                 )
                 progress.advance(task8)
+        
+        task9 = progress.add_task("Writing queued relationships...", total=None)
+        client.commit_bulk()
+        progress.update(task9, description="✅ Relationships written")
     
     # Show summary
     console.print("\n[bold green]✅ .NET Data Population Complete![/bold green]")
@@ -1,5 +1,12 @@
+import os
 from setuptools import setup, find_packages
 
+# Opt-in: compile the persona detection loops with mypyc (needs mypy at build time)
+ext_modules = []
+if os.getenv("LUMOS_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["src/lumos_cli/core/persona_fast.py"])
+
 setup(
     name="lumos_cli",
     version="0.1.0",
@@ -12,6 +19,10 @@ setup(
         "sqlite-utils>=3.36",
         "numpy>=1.26",
     ],
+    extras_require={
+        "performance": ["neo4j-rust-ext", "orjson", "msgpack"],
+    },
+    ext_modules=ext_modules,
     entry_points={
         "console_scripts": [
             "lumos-cli=lumos_cli.cli_refactored_v2:app",
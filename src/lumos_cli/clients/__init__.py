@@ -6,7 +6,7 @@ from .github_client import GitHubClient
 from .jenkins_client import JenkinsClient
 from .jira_client import JiraClient
 from .neo4j_client import Neo4jClient
-from .neo4j_dotnet_client import Neo4jDotNetClient
+from .neo4j_dotnet_client import Neo4jDotNetClient, AsyncNeo4jDotNetClient, ClassResult
 from .appdynamics_client import AppDynamicsClient
 
 __all__ = [
@@ -15,5 +15,7 @@ __all__ = [
     'JiraClient',
     'Neo4jClient',
     'Neo4jDotNetClient',
+    'AsyncNeo4jDotNetClient',
+    'ClassResult',
     'AppDynamicsClient'
 ]
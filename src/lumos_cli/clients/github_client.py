@@ -780,7 +780,7 @@ class GitHubClient:
             if not config:
                 return "[dim]Neo4j configuration not found[/dim]"
             
-            client = Neo4jDotNetClient(config.uri, config.username, config.password)
+            client = Neo4jDotNetClient(config.uri, config.username, config.password, config.database)
             if not client.connect():
                 return "[dim]Failed to connect to Neo4j[/dim]"
             
@@ -4,44 +4,515 @@ Implements the specific schema for .NET repositories with Controllers, Classes,
 """
 
 import os
+import io
+import importlib.util
+import csv
 import json
-from typing import List, Dict, Optional, Any
-from neo4j import GraphDatabase
+import time
+import asyncio
+import statistics
+import threading
+from collections import OrderedDict, defaultdict, deque
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Final, List, Dict, Iterator, Optional, Tuple, Any
+from neo4j import GraphDatabase, AsyncGraphDatabase, READ_ACCESS, WRITE_ACCESS, RoutingControl
+from neo4j.exceptions import TransientError, SessionExpired, ServiceUnavailable
 from rich.console import Console
 from ..utils.debug_logger import get_debug_logger
 
 console = Console()
 debug_logger = get_debug_logger()
 
+# neo4j-rust-ext (the "performance" extra) installs neo4j._rust, which the driver
+# uses for PackStream encoding/decoding in place of the pure-Python codec
+_RUST_CODEC = importlib.util.find_spec("neo4j._rust") is not None
+
+# Cypher queries are module-level constants so the strings are built once and
+# Neo4j's plan cache sees an identical query text on every call. Never format
+# values into them: pass every value as a $parameter, or each distinct value
+# becomes a new query text that Neo4j has to plan again. Labels and
+# relationship types, which cannot be parameters, are only interpolated here,
+# once per known key.
+# Batch queries all take their payload as one $rows list of maps, which Bolt
+# packs as a single list parameter.
+_Q_CONNECTION_TEST: Final[str] = "RETURN 1 as test"
+
+# Node creation: one label-keyed table drives the per-node and batched queries
+# (default source per label; the default type is the label itself)
+_NODE_DEFAULT_SOURCE = {
+    "Repository": "github",
+    "Class": "dotnet",
+    "Method": "dotnet",
+    "Enum": "dotnet",
+    "Constant": "dotnet",
+    "Controller": "dotnet",
+    "StoredProcedure": "database",
+    "Table": "database",
+}
+
+# Classes typed "Controller" also get the :Controller label, so controller lookups
+# use the label index instead of filtering every :Class on its type property
+_SET_CONTROLLER_LABEL = ' FOREACH (_ IN CASE WHEN {var}.type = "Controller" THEN [1] ELSE [] END | SET {var}:Controller)'
+_LABEL_SUFFIX = {"Class": _SET_CONTROLLER_LABEL.format(var="n")}
+
+_Q_CREATE_NODE: Final[Dict[str, str]] = {
+    label: f"""
+    MERGE (n:{label} {{name: $name, namespace: $namespace}})
+    ON CREATE SET n.type = $type,
+        n.source = $source,
+        n.created_at = datetime()
+    ON MATCH SET n.type = $type,
+        n.source = $source
+""" + _LABEL_SUFFIX.get(label, "")
+    for label in _NODE_DEFAULT_SOURCE
+}
+
+# Per-row MERGE shared by the UNWIND, APOC and LOAD CSV paths
+_MERGE_NODE_ROW: Final[Dict[str, str]] = {
+    label: (
+        f"MERGE (n:{label} {{name: row.name, namespace: row.namespace}}) "
+        f"ON CREATE SET n.type = coalesce(row.type, '{label}'), "
+        f"n.source = coalesce(row.source, '{source}'), "
+        "n.created_at = datetime() "
+        f"ON MATCH SET n.type = coalesce(row.type, '{label}'), "
+        f"n.source = coalesce(row.source, '{source}')"
+    ) + _LABEL_SUFFIX.get(label, "")
+    for label, source in _NODE_DEFAULT_SOURCE.items()
+}
+
+_Q_BATCH_MERGE: Final[Dict[str, str]] = {label: "UNWIND $rows AS row " + row for label, row in _MERGE_NODE_ROW.items()}
+
+# Schema: (name, namespace) uniqueness per label, plus a :Class(type) index
+_Q_CREATE_CONSTRAINT: Final[Dict[str, str]] = {
+    label: f"CREATE CONSTRAINT {label.lower()}_name_namespace IF NOT EXISTS "
+           f"FOR (n:{label}) REQUIRE (n.name, n.namespace) IS UNIQUE"
+    for label in _NODE_DEFAULT_SOURCE
+}
+
+_Q_CREATE_CLASS_TYPE_INDEX: Final[str] = "CREATE INDEX class_type IF NOT EXISTS FOR (n:Class) ON (n.type)"
+
+# Labels Class nodes written before the :Controller label was applied on write
+_Q_LABEL_TYPED_CONTROLLERS: Final[str] = """
+    MATCH (c:Class {type: "Controller"})
+    WHERE NOT c:Controller
+    SET c:Controller
+"""
+
+# apoc.periodic.iterate splits a large import into many smaller (optionally parallel) transactions
+_Q_APOC_ITERATE: Final[str] = """
+    CALL apoc.periodic.iterate(
+        "UNWIND $rows AS row RETURN row",
+        $statement,
+        {batchSize: $batch_size, parallel: $parallel, params: {rows: $rows}}
+    )
+    YIELD batches, total, errorMessages
+    RETURN batches, total, errorMessages
+"""
+
+_Q_APOC_AVAILABLE: Final[str] = "CALL apoc.help('periodic')"
+
+# Relationship batches larger than this go through apoc.periodic.iterate when available
+_APOC_MIN_ROWS = 10000
+
+# LOAD CSV streams the file inside the server, bypassing Bolt parameter encoding;
+# the file URL is a parameter so the query text (and its cached plan) is fixed per label
+_CSV_HEADER = ("name", "namespace", "type", "source")
+_CSV_COMMIT_ROWS = 10000
+_Q_LOAD_CSV: Final[Dict[str, str]] = {
+    label: "LOAD CSV WITH HEADERS FROM $url AS row "
+           "CALL { WITH row " + row + " } "
+           f"IN TRANSACTIONS OF {_CSV_COMMIT_ROWS} ROWS"
+    for label, row in _MERGE_NODE_ROW.items()
+}
+
+# Relationship creation
+_Q_CREATE_REPOSITORY_DEPENDENCY: Final[str] = """
+    MATCH (from:Repository {name: $from_repo, namespace: $from_namespace})
+    MATCH (to:Repository {name: $to_repo, namespace: $to_namespace})
+    MERGE (from)-[r:DEPENDS_ON]->(to)
+    ON CREATE SET r.created_at = datetime()
+"""
+
+_Q_CREATE_REPOSITORY_HAS_CLASS: Final[str] = """
+    MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
+    MATCH (c:Class {name: $class_name, namespace: $class_namespace})
+    MERGE (r)-[r2c:HAS_CLASSES]->(c)
+    ON CREATE SET r2c.created_at = datetime()
+"""
+
+_Q_CREATE_REPOSITORY_HAS_CONSTANT: Final[str] = """
+    MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
+    MATCH (c:Constant {name: $constant_name, namespace: $constant_namespace})
+    MERGE (r)-[r2c:HAS_CONSTANTS]->(c)
+    ON CREATE SET r2c.created_at = datetime()
+"""
+
+_Q_CREATE_REPOSITORY_HAS_ENUM: Final[str] = """
+    MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
+    MATCH (e:Enum {name: $enum_name, namespace: $enum_namespace})
+    MERGE (r)-[r2e:HAS_ENUMS]->(e)
+    ON CREATE SET r2e.created_at = datetime()
+"""
+
+_Q_CREATE_CLASS_HAS_METHOD: Final[str] = """
+    MATCH (c:Class {name: $class_name, namespace: $class_namespace})
+    MATCH (m:Method {name: $method_name, namespace: $method_namespace})
+    MERGE (c)-[c2m:HAS_METHOD]->(m)
+    ON CREATE SET c2m.created_at = datetime()
+"""
+
+_Q_CREATE_METHOD_CALLS_METHOD: Final[str] = """
+    MATCH (from:Method {name: $from_method, namespace: $from_namespace})
+    MATCH (to:Method {name: $to_method, namespace: $to_namespace})
+    MERGE (from)-[m2m:CALLS_METHOD]->(to)
+    ON CREATE SET m2m.created_at = datetime()
+"""
+
+_Q_CREATE_CLASS_CALLS_SP: Final[str] = """
+    MATCH (c:Class {name: $class_name, namespace: $class_namespace})
+    MATCH (sp:StoredProcedure {name: $sp_name, namespace: $sp_namespace})
+    MERGE (c)-[c2sp:CALLS_SP]->(sp)
+    ON CREATE SET c2sp.created_at = datetime()
+"""
+
+_Q_CREATE_SP_HAS_TABLE: Final[str] = """
+    MATCH (sp:StoredProcedure {name: $sp_name, namespace: $sp_namespace})
+    MATCH (t:Table {name: $table_name, namespace: $table_namespace})
+    MERGE (sp)-[sp2t:HAS_TABLES]->(t)
+    ON CREATE SET sp2t.created_at = datetime()
+"""
+
+# (from_label, to_label) for every relationship type; drives the batched UNWIND queries
+_REL_SPECS = {
+    "DEPENDS_ON": ("Repository", "Repository"),
+    "HAS_CLASSES": ("Repository", "Class"),
+    "HAS_CONSTANTS": ("Repository", "Constant"),
+    "HAS_ENUMS": ("Repository", "Enum"),
+    "HAS_METHOD": ("Class", "Method"),
+    "CALLS_METHOD": ("Method", "Method"),
+    "CALLS_SP": ("Class", "StoredProcedure"),
+    "HAS_TABLES": ("StoredProcedure", "Table"),
+}
+
+# Both MATCHes stay inside the UNWIND row and the WITH makes the second seek
+# depend on the first, so the plan is two NodeIndexSeeks per pair rather than
+# a CartesianProduct of every from-node with every to-node.
+_MERGE_REL_ROW = (
+    "MATCH (a:{from_label} {{name: row.from_name, namespace: row.from_ns}}) "
+    "WITH row, a "
+    "MATCH (b:{to_label} {{name: row.to_name, namespace: row.to_ns}}) "
+    "MERGE (a)-[r:{rel_type}]->(b) "
+    "ON CREATE SET r.created_at = datetime()"
+)
+
+_Q_BATCH_REL: Final[Dict[str, str]] = {
+    rel_type: "UNWIND $rows AS row " + _MERGE_REL_ROW.format(rel_type=rel_type, from_label=from_label, to_label=to_label)
+    for rel_type, (from_label, to_label) in _REL_SPECS.items()
+}
+
+_Q_EXPLAIN_BATCH_REL: Final[Dict[str, str]] = {rel_type: "EXPLAIN " + query for rel_type, query in _Q_BATCH_REL.items()}
+
+# Bulk ingestion
+_Q_BULK_INGEST_CLASS_TREE: Final[str] = """
+    UNWIND $rows AS cl
+    MERGE (c:Class {name: cl.name, namespace: cl.namespace})
+    ON CREATE SET c.type = coalesce(cl.type, "Class"),
+        c.source = coalesce(cl.source, "dotnet"),
+        c.created_at = datetime()
+    ON MATCH SET c.type = coalesce(cl.type, "Class"),
+        c.source = coalesce(cl.source, "dotnet")
+    FOREACH (_ IN CASE WHEN c.type = "Controller" THEN [1] ELSE [] END | SET c:Controller)
+    FOREACH (m IN coalesce(cl.methods, []) |
+        MERGE (mm:Method {name: m.name, namespace: m.namespace})
+        ON CREATE SET mm.type = "Method",
+            mm.source = "dotnet",
+            mm.created_at = datetime()
+        MERGE (c)-[c2m:HAS_METHOD]->(mm)
+        ON CREATE SET c2m.created_at = datetime()
+    )
+    FOREACH (sp IN coalesce(cl.calls_sps, []) |
+        MERGE (s:StoredProcedure {name: sp.name, namespace: sp.namespace})
+        ON CREATE SET s.type = "StoredProcedure",
+            s.source = "database",
+            s.created_at = datetime()
+        MERGE (c)-[c2sp:CALLS_SP]->(s)
+        ON CREATE SET c2sp.created_at = datetime()
+    )
+"""
+
+# Writes that can add a Class-HAS_METHOD->Method-CALLS_METHOD->Method edge, i.e.
+# change which classes reach a constant; they reset the constant -> classes cache
+_CONSTANT_PATH_WRITES: Final[frozenset] = frozenset({
+    _Q_CREATE_CLASS_HAS_METHOD,
+    _Q_CREATE_METHOD_CALLS_METHOD,
+    _Q_BATCH_REL["HAS_METHOD"],
+    _Q_BATCH_REL["CALLS_METHOD"],
+    _Q_BULK_INGEST_CLASS_TREE,
+})
+
+# Queries
+# Direct Class-[:CALLS_SP] and method-mediated calls in one round trip; UNION de-duplicates c
+_Q_FIND_CONTROLLERS_CALLING_SP: Final[str] = """
+    CALL {
+        MATCH (c:Controller)-[:CALLS_SP]->(:StoredProcedure {name: $sp_name, namespace: $sp_namespace})
+        RETURN c
+        UNION
+        MATCH (c:Controller)-[:HAS_METHOD]->(:Method)-[:CALLS_SP]->(:StoredProcedure {name: $sp_name, namespace: $sp_namespace})
+        RETURN c
+    }
+    RETURN c.name as controller_name, c.namespace as controller_namespace
+    ORDER BY c.name
+"""
+
+# One row per (constant, class); single lookups pass a one-element $rows so both share a plan.
+# The path is anchored on the indexed Constant and walked back to the classes.
+_Q_FIND_CLASSES_USING_CONSTANTS: Final[str] = """
+    UNWIND $rows AS p
+    MATCH (:Constant {name: p.name, namespace: p.namespace})<-[:USES_CONSTANT]-(:Method)<-[:CALLS_METHOD]-(:Method)<-[:HAS_METHOD]-(c:Class)
+    RETURN DISTINCT p.name as constant_name, p.namespace as constant_namespace,
+           c.name as class_name, c.namespace as class_namespace
+    ORDER BY constant_name, constant_namespace, class_name
+"""
+
+# Repository-scoped variant: seeded from one Repository and its HAS_CLASSES edges,
+# so only that repository's classes are expanded
+_Q_FIND_REPO_CLASSES_USING_CONSTANT: Final[str] = """
+    MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})-[:HAS_CLASSES]->(c:Class)
+    MATCH (c)-[:HAS_METHOD]->(:Method)-[:CALLS_METHOD]->(:Method)-[:USES_CONSTANT]->(:Constant {name: $constant_name, namespace: $constant_namespace})
+    RETURN DISTINCT c.name as class_name, c.namespace as class_namespace
+    ORDER BY class_name
+"""
+
+# Each count runs in its own subquery, so the planner never multiplies classes
+# by constants by enums by methods before aggregating
+_Q_REPOSITORY_OVERVIEW: Final[str] = """
+    MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
+    CALL { WITH r MATCH (r)-[:HAS_CLASSES]->(c:Class) RETURN count(c) as class_count }
+    CALL { WITH r MATCH (r)-[:HAS_CONSTANTS]->(const:Constant) RETURN count(const) as constant_count }
+    CALL { WITH r MATCH (r)-[:HAS_ENUMS]->(e:Enum) RETURN count(e) as enum_count }
+    CALL { WITH r MATCH (r)-[:HAS_CLASSES]->(:Class)-[:HAS_METHOD]->(m:Method) RETURN count(DISTINCT m) as method_count }
+    CALL { WITH r MATCH (r)-[:HAS_CLASSES]->(ctrl:Controller) RETURN count(ctrl) as controller_count }
+    RETURN coalesce(class_count, 0), coalesce(constant_count, 0), coalesce(enum_count, 0),
+           coalesce(method_count, 0), coalesce(controller_count, 0)
+"""
+
+# Deleting a repository runs in two phases: its classes (with their methods),
+# constants and enums are removed in chunked transactions, so a large repository
+# never holds every lock and tx-log entry in one commit, and then the repository
+# node itself. Stored procedures and tables are shared database objects and stay.
+_DELETE_COMMIT_ROWS = 10000
+_Q_CLEAR_REPOSITORY_CONTENTS: Final[str] = f"""
+    MATCH (r:Repository {{name: $repo_name, namespace: $repo_namespace}})-[:HAS_CLASSES|HAS_CONSTANTS|HAS_ENUMS]->(x)
+    OPTIONAL MATCH (x)-[:HAS_METHOD]->(m:Method)
+    WITH x, collect(m) AS methods
+    UNWIND [x] + methods AS n
+    WITH DISTINCT n
+    CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {_DELETE_COMMIT_ROWS} ROWS
+"""
+
+_Q_CLEAR_REPOSITORY: Final[str] = """
+    MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
+    DETACH DELETE r
+"""
+
+# Compiled with EXPLAIN once per server on connect so the first real call finds
+# its plan cached; EXPLAIN plans without executing, so placeholder values are fine
+_WARM_QUERIES: Final[Tuple[Tuple[str, Dict], ...]] = (
+    (_Q_FIND_CONTROLLERS_CALLING_SP, {"sp_name": "", "sp_namespace": ""}),
+    (_Q_FIND_CLASSES_USING_CONSTANTS, {"rows": []}),
+    (_Q_FIND_REPO_CLASSES_USING_CONSTANT, {"repo_name": "", "repo_namespace": "", "constant_name": "", "constant_namespace": ""}),
+    (_Q_REPOSITORY_OVERVIEW, {"repo_name": "", "repo_namespace": ""}),
+    (_Q_BULK_INGEST_CLASS_TREE, {"rows": []}),
+    *((query, {"rows": []}) for query in _Q_BATCH_MERGE.values()),
+    *((query, {"rows": []}) for query in _Q_BATCH_REL.values()),
+)
+
+
+def _plan_operators(plan: Optional[Dict]) -> Iterator[Dict]:
+    """Yield every operator in an EXPLAIN/PROFILE plan tree"""
+    stack = [plan] if plan else []
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.get("children", []))
+
+def _log_count(records: Iterator[Dict], description: str) -> Iterator[Dict]:
+    """Pass streamed records through, logging how many there were once the stream ends"""
+    count = 0
+    for record in records:
+        count += 1
+        yield record
+    debug_logger.debug("Streamed %d %s", count, description)
+
+
+@dataclass(slots=True)
+class ClassResult:
+    """Classes returned by a lookup, held as parallel name/namespace lists
+    
+    Iterating yields ``{"class_name", "class_namespace"}`` dicts built on
+    demand, so callers written against the old list-of-dicts result keep working.
+    """
+    names: List[str] = field(default_factory=list)
+    namespaces: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for name, namespace in zip(self.names, self.namespaces):
+            yield {"class_name": name, "class_namespace": namespace}
+    
+    def copy(self) -> "ClassResult":
+        """Return a result with its own lists"""
+        return ClassResult(list(self.names), list(self.namespaces))
+
+
+class _QueryCache:
+    """Thread-safe LRU cache of read results with a per-entry TTL"""
+    
+    _MISS = object()
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        """Return the cached value for ``key`` or _QueryCache._MISS"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return self._MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key, value):
+        """Cache ``value`` under ``key``, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def pop(self, key):
+        """Drop the entry for ``key`` if cached"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
 class Neo4jDotNetClient:
     """Client for Neo4j graph database operations specific to .NET Core applications"""
     
-    def __init__(self, uri: str = None, username: str = None, password: str = None):
+    # Node labels keyed by (name, namespace); each gets a uniqueness constraint on connect
+    _LABELS = ("Repository", "Class", "Method", "Enum", "Constant", "Controller", "StoredProcedure", "Table")
+    
+    # Bolt connection pool; connect() opens PREWARM_CONNECTIONS up front so bulk work doesn't wait on handshakes
+    MAX_POOL_SIZE = 100
+    PREWARM_CONNECTIONS = 16
+    # Rows per UNWIND query when bulk_create_parallel splits a label into batches
+    BULK_BATCH_SIZE = 1000
+    # (server URI, database) pairs whose schema this process already ensured; connect() skips the DDL for them
+    _schema_ensured = set()
+    _schema_lock = threading.Lock()
+    # Constants whose consuming classes are kept in the entity cache
+    CONSTANT_CACHE_SIZE = 10000
+    # Writes retry TransientError/SessionExpired with exponential backoff from RETRY_BASE_DELAY seconds
+    MAX_RETRIES = 5
+    RETRY_BASE_DELAY = 0.1
+    # Writes pause while the median of the last LATENCY_WINDOW runs is SLOW_FACTOR x the baseline
+    LATENCY_WINDOW = 100
+    SLOW_FACTOR = 5
+    
+    def __init__(self, uri: str = None, username: str = None, password: str = None, database: str = None):
         """Initialize Neo4j .NET client"""
         self.uri = uri or os.getenv('NEO4J_URI', 'bolt://localhost:7687')
         self.username = username or os.getenv('NEO4J_USERNAME', 'neo4j')
         self.password = password or os.getenv('NEO4J_PASSWORD', 'password')
+        # Named explicitly on every session so the driver skips home-database resolution
+        self.database = database or os.getenv('NEO4J_DATABASE', 'neo4j')
         self.driver = None
+        # Relationship pairs queued between begin_bulk() and commit_bulk(), keyed by type
+        self._rel_buffer = None
+        # Set by connect(); enables the apoc.periodic.iterate bulk paths
+        self._has_apoc = False
+        # Worker pool created by connect(); reused for pool warm-up and parallel bulk work
+        self._executor = None
+        # WRITE sessions on self.database, bound once by connect() so per-entity writes skip the attribute chase
+        self._session_factory = None
+        # Relationships (type, from, from_ns, to, to_ns) created this run; repeat create_*
+        # calls return without a round trip. An edge whose MATCH found no endpoint created
+        # nothing, so it is not recorded and a later call retries it
+        self._seen = set()
+        # (label, name, namespace) -> (type, source) last written, so a node is only
+        # skipped when the repeat call would SET the same properties
+        self._seen_nodes = {}
+        # Recent write latencies and the median of the first full window, for write throttling
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._baseline_latency = None
+        # Read results for repeated lookups; every successful write clears it
+        self._query_cache = _QueryCache()
+        # Constant -> consuming classes; unlike the query cache it is only reset by
+        # writes to the method graph, so it survives ordinary node ingestion
+        self._constant_classes = _QueryCache(maxsize=self.CONSTANT_CACHE_SIZE, ttl=float("inf"))
+        # LUMOS_CYPHER_PROFILE=1 logs PROFILE db hits for every read query
+        self._profile = os.getenv('LUMOS_CYPHER_PROFILE') == '1'
+        # Per-thread read sessions reused across read calls; all are tracked so close() can end them
+        self._local = threading.local()
+        self._read_sessions = []
+        self._read_sessions_lock = threading.Lock()
         
         debug_logger.log_function_call("Neo4jDotNetClient.__init__", kwargs={
             "uri": self.uri,
             "username": self.username
         })
+        debug_logger.info("Neo4j PackStream codec: %s", "rust" if _RUST_CODEC else "python")
     
     def connect(self) -> bool:
         """Connect to Neo4j database"""
         debug_logger.log_function_call("Neo4jDotNetClient.connect")
         
         try:
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.username, self.password))
+            # One driver (and connection pool) per client; reconnecting reuses it
+            if self.driver is None:
+                self.driver = GraphDatabase.driver(
+                    self.uri,
+                    auth=(self.username, self.password),
+                    max_connection_pool_size=self.MAX_POOL_SIZE,
+                    connection_acquisition_timeout=60,
+                    keep_alive=True
+                )
+            self._session_factory = partial(self.driver.session, database=self.database, default_access_mode=WRITE_ACCESS)
             # Test connection
-            with self.driver.session() as session:
-                result = session.run("RETURN 1 as test")
+            with self._session_factory() as session:
+                result = session.run(_Q_CONNECTION_TEST)
                 test_value = result.single()["test"]
                 if test_value == 1:
                     debug_logger.info("Neo4j .NET connection successful")
-                    debug_logger.log_function_return("Neo4jDotNetClient.connect", "Success")
-                    return True
+                    self._ensure_schema(session)
+                    self._has_apoc = self._detect_apoc(session)
+            
+            if test_value == 1:
+                self._prewarm_pool()
+                debug_logger.log_function_return("Neo4jDotNetClient.connect", "Success")
+                return True
         except Exception as e:
             debug_logger.error(f"Neo4j .NET connection failed: {e}")
             debug_logger.log_function_return("Neo4jDotNetClient.connect", "Failed")
@@ -49,6 +520,75 @@ class Neo4jDotNetClient:
         
         return False
     
+    def _prewarm_pool(self):
+        """Open PREWARM_CONNECTIONS pooled connections concurrently so later sessions skip the handshake"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.PREWARM_CONNECTIONS, thread_name_prefix="neo4j-dotnet")
+        
+        def ping(_):
+            try:
+                with self._session_factory() as session:
+                    session.run(_Q_CONNECTION_TEST).consume()
+            except Exception as e:
+                debug_logger.warning(f"Neo4j pool warm-up query failed: {e}")
+        
+        list(self._executor.map(ping, range(self.PREWARM_CONNECTIONS)))
+    
+    def _ensure_schema(self, session):
+        """Create constraints/indexes, label legacy controllers and warm the plan cache, once per database per process"""
+        with self._schema_lock:
+            if (self.uri, self.database) in self._schema_ensured:
+                return
+            self._create_constraints(session)
+            self._label_typed_controllers(session)
+            self._warm_plan_cache(session)
+            self._schema_ensured.add((self.uri, self.database))
+    
+    def _label_typed_controllers(self, session):
+        """Add :Controller to Class nodes typed "Controller" that were written before the label existed"""
+        try:
+            session.run(_Q_LABEL_TYPED_CONTROLLERS).consume()
+        except Exception as e:
+            # A :Controller node already holding the same (name, namespace) violates its constraint
+            debug_logger.warning(f"Could not label legacy controllers: {e}")
+    
+    def _warm_plan_cache(self, session):
+        """EXPLAIN each lookup and batch query so Neo4j compiles and caches its plan up front"""
+        for query, parameters in _WARM_QUERIES:
+            try:
+                session.run("EXPLAIN " + query, **parameters).consume()
+            except Exception as e:
+                debug_logger.warning(f"Could not warm plan cache: {e}")
+                return
+    
+    def _create_constraints(self, session):
+        """Create (name, namespace) uniqueness constraints so MERGE uses an index seek instead of a label scan
+        
+        Each constraint is backed by a composite (name, namespace) index, which
+        also turns the Constant, Class and Repository lookups into index seeks;
+        a :Class(type) index is added for type filters.
+        """
+        for label in self._LABELS:
+            try:
+                session.run(_Q_CREATE_CONSTRAINT[label]).consume()
+            except Exception as e:
+                # Existing duplicate nodes or an older server; MERGE still works, just without the index
+                debug_logger.warning(f"Could not create constraint for {label}: {e}")
+        try:
+            # Backs the one-off (:Class {type: "Controller"}) labelling on connect
+            session.run(_Q_CREATE_CLASS_TYPE_INDEX).consume()
+        except Exception as e:
+            debug_logger.warning(f"Could not create Class type index: {e}")
+    
+    def _detect_apoc(self, session) -> bool:
+        """Check whether the APOC plugin is installed on the server"""
+        try:
+            session.run(_Q_APOC_AVAILABLE).consume()
+            debug_logger.info("APOC available; large imports use apoc.periodic.iterate")
+            return True
+        except Exception:
+            return False
+    
     def test_connection(self) -> bool:
         """Test if Neo4j connection is working"""
         debug_logger.log_function_call("Neo4jDotNetClient.test_connection")
@@ -59,8 +599,8 @@ class Neo4jDotNetClient:
                 return False
         
         try:
-            with self.driver.session() as session:
-                result = session.run("RETURN 1 as test")
+            with self._session_factory() as session:
+                result = session.run(_Q_CONNECTION_TEST)
                 test_value = result.single()["test"]
                 success = test_value == 1
                 debug_logger.log_function_return("Neo4jDotNetClient.test_connection", f"Success: {success}")
@@ -72,680 +612,1080 @@ class Neo4jDotNetClient:
     
     def close(self):
         """Close Neo4j connection"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._read_sessions_lock:
+            sessions, self._read_sessions = self._read_sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
         if self.driver:
             self.driver.close()
+            self.driver = None
+            self._session_factory = None
             debug_logger.info("Neo4j .NET connection closed")
     
-    def create_repository_node(self, name: str, namespace: str, type: str = "Repository", source: str = "github") -> bool:
-        """Create a Repository node"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_repository_node", kwargs={
-            "name": name, "namespace": namespace, "type": type, "source": source
-        })
+    def _get_read_session(self):
+        """Return this thread's cached read session, opening one if needed"""
+        session = getattr(self._local, "session", None)
+        if session is None or session.closed():
+            session = self.driver.session(database=self.database, default_access_mode=READ_ACCESS)
+            self._local.session = session
+            with self._read_sessions_lock:
+                self._read_sessions.append(session)
+        return session
+    
+    def _drop_read_session(self):
+        """Close and forget this thread's read session after a connection failure"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            return
+        self._local.session = None
+        with self._read_sessions_lock:
+            if session in self._read_sessions:
+                self._read_sessions.remove(session)
+        try:
+            session.close()
+        except Exception:
+            pass
+    
+    def _run_read(self, query: str, **parameters):
+        """Run a read query on the thread's cached session, reopening it once if the connection dropped"""
+        if self._profile:
+            self._profile_read(query, parameters)
+        try:
+            return self._get_read_session().run(query, **parameters)
+        except (SessionExpired, ServiceUnavailable) as e:
+            debug_logger.warning(f"Neo4j read session lost ({e}); reopening")
+            self._drop_read_session()
+            return self._get_read_session().run(query, **parameters)
+    
+    def _profile_read(self, query: str, parameters: Dict):
+        """Run ``query`` under PROFILE and log its total and per-operator db hits (LUMOS_CYPHER_PROFILE=1)
         
+        A diagnostic aid only: the profiled run is separate, so each read executes twice.
+        """
         try:
-            with self.driver.session() as session:
-                query = """
-                MERGE (r:Repository {name: $name, namespace: $namespace})
-                SET r.type = $type,
-                    r.source = $source,
-                    r.created_at = datetime()
-                RETURN r
-                """
-                
-                result = session.run(query, {
-                    "name": name,
-                    "namespace": namespace,
-                    "type": type,
-                    "source": source
-                })
-                
-                debug_logger.info(f"Created repository node: {name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_node", "Success")
-                return True
-                
+            summary = self._get_read_session().run("PROFILE " + query, **parameters).consume()
+            operators = list(_plan_operators(summary.profile))
+            hits = ", ".join(f"{op.get('operatorType', '')}={op.get('dbHits', 0)}" for op in operators)
+            debug_logger.info("PROFILE %d db hits [%s] for: %s", sum(op.get("dbHits", 0) for op in operators), hits, " ".join(query.split()))
         except Exception as e:
-            debug_logger.error(f"Failed to create repository node: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_repository_node", "Failed")
-            return False
+            debug_logger.warning(f"Could not profile query: {e}")
     
-    def create_class_node(self, name: str, namespace: str, type: str = "Class", source: str = "dotnet") -> bool:
-        """Create a Class node"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_class_node", kwargs={
-            "name": name, "namespace": namespace, "type": type, "source": source
-        })
+    def _run_with_retry(self, session, query: str, **parameters):
+        """Run and consume a write, retrying transient failures with exponential backoff
+        
+        Every write here is a MERGE, so a retry after a partial failure is
+        safe. While Neo4j is stalled (e.g. during an index merge) the call
+        first waits one median latency so the caller doesn't pile on more work.
+        """
+        self._throttle()
+        for attempt in range(self.MAX_RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                summary = session.run(query, **parameters).consume()
+            except (TransientError, SessionExpired) as e:
+                if attempt == self.MAX_RETRIES:
+                    raise
+                delay = self.RETRY_BASE_DELAY * 2 ** attempt
+                debug_logger.warning(f"Neo4j write failed transiently ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            self._record_latency(time.perf_counter() - started)
+            self._query_cache.clear()
+            if query in _CONSTANT_PATH_WRITES:
+                self._constant_classes.clear()
+            return summary
+    
+    def _record_latency(self, seconds: float):
+        """Add a write latency to the rolling window, fixing the baseline once the window first fills"""
+        self._latencies.append(seconds)
+        if self._baseline_latency is None and len(self._latencies) == self.LATENCY_WINDOW:
+            self._baseline_latency = statistics.median(self._latencies)
+    
+    def _throttle(self):
+        """Sleep for one median latency while writes are SLOW_FACTOR times slower than the baseline"""
+        if not self._baseline_latency:
+            return
+        median = statistics.median(self._latencies)
+        if median > self.SLOW_FACTOR * self._baseline_latency:
+            debug_logger.warning(f"Neo4j writes slowed to {median * 1000:.0f}ms (baseline {self._baseline_latency * 1000:.0f}ms); backing off")
+            time.sleep(median)
+    
+    def _create_node(self, label: str, name: str, namespace: str, type: str, source: str) -> bool:
+        """MERGE a node of ``label`` keyed by (name, namespace) and set its type and source"""
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient._create_node", kwargs={
+                "label": label, "name": name, "namespace": namespace, "type": type, "source": source
+            })
+        
+        key = (label, name, namespace)
+        if self._seen_nodes.get(key) == (type, source):
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MERGE (c:Class {name: $name, namespace: $namespace})
-                SET c.type = $type,
-                    c.source = $source,
-                    c.created_at = datetime()
-                RETURN c
-                """
-                
-                result = session.run(query, {
-                    "name": name,
-                    "namespace": namespace,
-                    "type": type,
-                    "source": source
-                })
+            with self._session_factory() as session:
+                self._run_with_retry(session, _Q_CREATE_NODE[label], name=name, namespace=namespace, type=type, source=source)
+                self._seen_nodes[key] = (type, source)
                 
-                debug_logger.info(f"Created class node: {name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_class_node", "Success")
+                debug_logger.info("Created %s node: %s", label, name)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient._create_node", "Success")
                 return True
                 
         except Exception as e:
-            debug_logger.error(f"Failed to create class node: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_class_node", "Failed")
+            debug_logger.error(f"Failed to create {label} node: {e}")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient._create_node", "Failed")
             return False
     
+    def create_repository_node(self, name: str, namespace: str, type: str = "Repository", source: str = "github") -> bool:
+        """Create a Repository node"""
+        return self._create_node("Repository", name, namespace, type, source)
+    
+    def create_class_node(self, name: str, namespace: str, type: str = "Class", source: str = "dotnet") -> bool:
+        """Create a Class node"""
+        return self._create_node("Class", name, namespace, type, source)
+    
     def create_method_node(self, name: str, namespace: str, type: str = "Method", source: str = "dotnet") -> bool:
         """Create a Method node"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_method_node", kwargs={
-            "name": name, "namespace": namespace, "type": type, "source": source
-        })
-        
-        try:
-            with self.driver.session() as session:
-                query = """
-                MERGE (m:Method {name: $name, namespace: $namespace})
-                SET m.type = $type,
-                    m.source = $source,
-                    m.created_at = datetime()
-                RETURN m
-                """
-                
-                result = session.run(query, {
-                    "name": name,
-                    "namespace": namespace,
-                    "type": type,
-                    "source": source
-                })
-                
-                debug_logger.info(f"Created method node: {name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_method_node", "Success")
-                return True
-                
-        except Exception as e:
-            debug_logger.error(f"Failed to create method node: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_method_node", "Failed")
-            return False
+        return self._create_node("Method", name, namespace, type, source)
     
     def create_enum_node(self, name: str, namespace: str, type: str = "Enum", source: str = "dotnet") -> bool:
         """Create an Enum node"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_enum_node", kwargs={
-            "name": name, "namespace": namespace, "type": type, "source": source
-        })
-        
-        try:
-            with self.driver.session() as session:
-                query = """
-                MERGE (e:Enum {name: $name, namespace: $namespace})
-                SET e.type = $type,
-                    e.source = $source,
-                    e.created_at = datetime()
-                RETURN e
-                """
-                
-                result = session.run(query, {
-                    "name": name,
-                    "namespace": namespace,
-                    "type": type,
-                    "source": source
-                })
-                
-                debug_logger.info(f"Created enum node: {name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_enum_node", "Success")
-                return True
-                
-        except Exception as e:
-            debug_logger.error(f"Failed to create enum node: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_enum_node", "Failed")
-            return False
+        return self._create_node("Enum", name, namespace, type, source)
     
     def create_constant_node(self, name: str, namespace: str, type: str = "Constant", source: str = "dotnet") -> bool:
         """Create a Constant node"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_constant_node", kwargs={
-            "name": name, "namespace": namespace, "type": type, "source": source
-        })
-        
-        try:
-            with self.driver.session() as session:
-                query = """
-                MERGE (c:Constant {name: $name, namespace: $namespace})
-                SET c.type = $type,
-                    c.source = $source,
-                    c.created_at = datetime()
-                RETURN c
-                """
-                
-                result = session.run(query, {
-                    "name": name,
-                    "namespace": namespace,
-                    "type": type,
-                    "source": source
-                })
-                
-                debug_logger.info(f"Created constant node: {name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_constant_node", "Success")
-                return True
-                
-        except Exception as e:
-            debug_logger.error(f"Failed to create constant node: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_constant_node", "Failed")
-            return False
+        return self._create_node("Constant", name, namespace, type, source)
     
     def create_controller_node(self, name: str, namespace: str, type: str = "Controller", source: str = "dotnet") -> bool:
         """Create a Controller node (represents API routes)"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_controller_node", kwargs={
-            "name": name, "namespace": namespace, "type": type, "source": source
-        })
-        
-        try:
-            with self.driver.session() as session:
-                query = """
-                MERGE (c:Controller {name: $name, namespace: $namespace})
-                SET c.type = $type,
-                    c.source = $source,
-                    c.created_at = datetime()
-                RETURN c
-                """
-                
-                result = session.run(query, {
-                    "name": name,
-                    "namespace": namespace,
-                    "type": type,
-                    "source": source
-                })
-                
-                debug_logger.info(f"Created controller node: {name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_controller_node", "Success")
-                return True
-                
-        except Exception as e:
-            debug_logger.error(f"Failed to create controller node: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_controller_node", "Failed")
-            return False
+        return self._create_node("Controller", name, namespace, type, source)
     
     def create_stored_procedure_node(self, name: str, namespace: str, type: str = "StoredProcedure", source: str = "database") -> bool:
         """Create a StoredProcedure node"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_stored_procedure_node", kwargs={
-            "name": name, "namespace": namespace, "type": type, "source": source
-        })
-        
-        try:
-            with self.driver.session() as session:
-                query = """
-                MERGE (sp:StoredProcedure {name: $name, namespace: $namespace})
-                SET sp.type = $type,
-                    sp.source = $source,
-                    sp.created_at = datetime()
-                RETURN sp
-                """
-                
-                result = session.run(query, {
-                    "name": name,
-                    "namespace": namespace,
-                    "type": type,
-                    "source": source
-                })
-                
-                debug_logger.info(f"Created stored procedure node: {name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_stored_procedure_node", "Success")
-                return True
-                
-        except Exception as e:
-            debug_logger.error(f"Failed to create stored procedure node: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_stored_procedure_node", "Failed")
-            return False
+        return self._create_node("StoredProcedure", name, namespace, type, source)
     
     def create_table_node(self, name: str, namespace: str, type: str = "Table", source: str = "database") -> bool:
         """Create a Table node"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_table_node", kwargs={
-            "name": name, "namespace": namespace, "type": type, "source": source
-        })
-        
-        try:
-            with self.driver.session() as session:
-                query = """
-                MERGE (t:Table {name: $name, namespace: $namespace})
-                SET t.type = $type,
-                    t.source = $source,
-                    t.created_at = datetime()
-                RETURN t
-                """
-                
-                result = session.run(query, {
-                    "name": name,
-                    "namespace": namespace,
-                    "type": type,
-                    "source": source
-                })
-                
-                debug_logger.info(f"Created table node: {name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_table_node", "Success")
-                return True
-                
-        except Exception as e:
-            debug_logger.error(f"Failed to create table node: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_table_node", "Failed")
-            return False
+        return self._create_node("Table", name, namespace, type, source)
     
     # Relationship creation methods
     def create_repository_dependency(self, from_repo: str, to_repo: str, from_namespace: str, to_namespace: str) -> bool:
         """Create Repository :DEPENDS_ON Repository relationship"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_repository_dependency", kwargs={
-            "from_repo": from_repo, "to_repo": to_repo
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_repository_dependency", kwargs={
+                "from_repo": from_repo, "to_repo": to_repo
+            })
+        
+        key = ("DEPENDS_ON", from_repo, from_namespace, to_repo, to_namespace)
+        if key in self._seen:
+            return True
+        
+        if self._rel_buffer is not None:
+            self._rel_buffer["DEPENDS_ON"][key] = {"from_name": from_repo, "from_ns": from_namespace, "to_name": to_repo, "to_ns": to_namespace}
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (from:Repository {name: $from_repo, namespace: $from_namespace})
-                MATCH (to:Repository {name: $to_repo, namespace: $to_namespace})
-                MERGE (from)-[r:DEPENDS_ON]->(to)
-                SET r.created_at = datetime()
-                RETURN r
-                """
-                
-                result = session.run(query, {
-                    "from_repo": from_repo,
-                    "to_repo": to_repo,
-                    "from_namespace": from_namespace,
-                    "to_namespace": to_namespace
-                })
-                
-                debug_logger.info(f"Created repository dependency: {from_repo} -> {to_repo}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_dependency", "Success")
+            with self._session_factory() as session:
+                summary = self._run_with_retry(session, _Q_CREATE_REPOSITORY_DEPENDENCY, from_repo=from_repo, to_repo=to_repo, from_namespace=from_namespace, to_namespace=to_namespace)
+                if summary.counters.relationships_created:
+                    self._seen.add(key)
+                
+                debug_logger.info("Created repository dependency: %s -> %s", from_repo, to_repo)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_repository_dependency", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to create repository dependency: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_repository_dependency", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_dependency", "Failed")
             return False
     
     def create_repository_has_class(self, repo_name: str, repo_namespace: str, class_name: str, class_namespace: str) -> bool:
         """Create Repository :HAS_CLASSES Class relationship"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_repository_has_class", kwargs={
-            "repo_name": repo_name, "class_name": class_name
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_repository_has_class", kwargs={
+                "repo_name": repo_name, "class_name": class_name
+            })
+        
+        key = ("HAS_CLASSES", repo_name, repo_namespace, class_name, class_namespace)
+        if key in self._seen:
+            return True
+        
+        if self._rel_buffer is not None:
+            self._rel_buffer["HAS_CLASSES"][key] = {"from_name": repo_name, "from_ns": repo_namespace, "to_name": class_name, "to_ns": class_namespace}
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
-                MATCH (c:Class {name: $class_name, namespace: $class_namespace})
-                MERGE (r)-[r2c:HAS_CLASSES]->(c)
-                SET r2c.created_at = datetime()
-                RETURN r2c
-                """
-                
-                result = session.run(query, {
-                    "repo_name": repo_name,
-                    "repo_namespace": repo_namespace,
-                    "class_name": class_name,
-                    "class_namespace": class_namespace
-                })
-                
-                debug_logger.info(f"Created repository has class: {repo_name} -> {class_name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_class", "Success")
+            with self._session_factory() as session:
+                summary = self._run_with_retry(session, _Q_CREATE_REPOSITORY_HAS_CLASS, repo_name=repo_name, repo_namespace=repo_namespace, class_name=class_name, class_namespace=class_namespace)
+                if summary.counters.relationships_created:
+                    self._seen.add(key)
+                
+                debug_logger.info("Created repository has class: %s -> %s", repo_name, class_name)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_class", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to create repository has class: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_class", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_class", "Failed")
             return False
     
     def create_repository_has_constant(self, repo_name: str, repo_namespace: str, constant_name: str, constant_namespace: str) -> bool:
         """Create Repository :HAS_CONSTANTS Constant relationship"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_repository_has_constant", kwargs={
-            "repo_name": repo_name, "constant_name": constant_name
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_repository_has_constant", kwargs={
+                "repo_name": repo_name, "constant_name": constant_name
+            })
+        
+        key = ("HAS_CONSTANTS", repo_name, repo_namespace, constant_name, constant_namespace)
+        if key in self._seen:
+            return True
+        
+        if self._rel_buffer is not None:
+            self._rel_buffer["HAS_CONSTANTS"][key] = {"from_name": repo_name, "from_ns": repo_namespace, "to_name": constant_name, "to_ns": constant_namespace}
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
-                MATCH (c:Constant {name: $constant_name, namespace: $constant_namespace})
-                MERGE (r)-[r2c:HAS_CONSTANTS]->(c)
-                SET r2c.created_at = datetime()
-                RETURN r2c
-                """
-                
-                result = session.run(query, {
-                    "repo_name": repo_name,
-                    "repo_namespace": repo_namespace,
-                    "constant_name": constant_name,
-                    "constant_namespace": constant_namespace
-                })
-                
-                debug_logger.info(f"Created repository has constant: {repo_name} -> {constant_name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_constant", "Success")
+            with self._session_factory() as session:
+                summary = self._run_with_retry(session, _Q_CREATE_REPOSITORY_HAS_CONSTANT, repo_name=repo_name, repo_namespace=repo_namespace, constant_name=constant_name, constant_namespace=constant_namespace)
+                if summary.counters.relationships_created:
+                    self._seen.add(key)
+                
+                debug_logger.info("Created repository has constant: %s -> %s", repo_name, constant_name)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_constant", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to create repository has constant: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_constant", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_constant", "Failed")
             return False
     
     def create_repository_has_enum(self, repo_name: str, repo_namespace: str, enum_name: str, enum_namespace: str) -> bool:
         """Create Repository :HAS_ENUMS Enum relationship"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_repository_has_enum", kwargs={
-            "repo_name": repo_name, "enum_name": enum_name
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_repository_has_enum", kwargs={
+                "repo_name": repo_name, "enum_name": enum_name
+            })
+        
+        key = ("HAS_ENUMS", repo_name, repo_namespace, enum_name, enum_namespace)
+        if key in self._seen:
+            return True
+        
+        if self._rel_buffer is not None:
+            self._rel_buffer["HAS_ENUMS"][key] = {"from_name": repo_name, "from_ns": repo_namespace, "to_name": enum_name, "to_ns": enum_namespace}
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
-                MATCH (e:Enum {name: $enum_name, namespace: $enum_namespace})
-                MERGE (r)-[r2e:HAS_ENUMS]->(e)
-                SET r2e.created_at = datetime()
-                RETURN r2e
-                """
-                
-                result = session.run(query, {
-                    "repo_name": repo_name,
-                    "repo_namespace": repo_namespace,
-                    "enum_name": enum_name,
-                    "enum_namespace": enum_namespace
-                })
-                
-                debug_logger.info(f"Created repository has enum: {repo_name} -> {enum_name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_enum", "Success")
+            with self._session_factory() as session:
+                summary = self._run_with_retry(session, _Q_CREATE_REPOSITORY_HAS_ENUM, repo_name=repo_name, repo_namespace=repo_namespace, enum_name=enum_name, enum_namespace=enum_namespace)
+                if summary.counters.relationships_created:
+                    self._seen.add(key)
+                
+                debug_logger.info("Created repository has enum: %s -> %s", repo_name, enum_name)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_enum", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to create repository has enum: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_enum", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_repository_has_enum", "Failed")
             return False
     
     def create_class_has_method(self, class_name: str, class_namespace: str, method_name: str, method_namespace: str) -> bool:
         """Create Class :HAS_METHOD Method relationship"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_class_has_method", kwargs={
-            "class_name": class_name, "method_name": method_name
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_class_has_method", kwargs={
+                "class_name": class_name, "method_name": method_name
+            })
+        
+        key = ("HAS_METHOD", class_name, class_namespace, method_name, method_namespace)
+        if key in self._seen:
+            return True
+        
+        if self._rel_buffer is not None:
+            self._rel_buffer["HAS_METHOD"][key] = {"from_name": class_name, "from_ns": class_namespace, "to_name": method_name, "to_ns": method_namespace}
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (c:Class {name: $class_name, namespace: $class_namespace})
-                MATCH (m:Method {name: $method_name, namespace: $method_namespace})
-                MERGE (c)-[c2m:HAS_METHOD]->(m)
-                SET c2m.created_at = datetime()
-                RETURN c2m
-                """
-                
-                result = session.run(query, {
-                    "class_name": class_name,
-                    "class_namespace": class_namespace,
-                    "method_name": method_name,
-                    "method_namespace": method_namespace
-                })
-                
-                debug_logger.info(f"Created class has method: {class_name} -> {method_name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_class_has_method", "Success")
+            with self._session_factory() as session:
+                summary = self._run_with_retry(session, _Q_CREATE_CLASS_HAS_METHOD, class_name=class_name, class_namespace=class_namespace, method_name=method_name, method_namespace=method_namespace)
+                if summary.counters.relationships_created:
+                    self._seen.add(key)
+                
+                debug_logger.info("Created class has method: %s -> %s", class_name, method_name)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_class_has_method", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to create class has method: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_class_has_method", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_class_has_method", "Failed")
             return False
     
     def create_method_calls_method(self, from_method: str, from_namespace: str, to_method: str, to_namespace: str) -> bool:
         """Create Method :CALLS_METHOD Method relationship"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_method_calls_method", kwargs={
-            "from_method": from_method, "to_method": to_method
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_method_calls_method", kwargs={
+                "from_method": from_method, "to_method": to_method
+            })
+        
+        key = ("CALLS_METHOD", from_method, from_namespace, to_method, to_namespace)
+        if key in self._seen:
+            return True
+        
+        if self._rel_buffer is not None:
+            self._rel_buffer["CALLS_METHOD"][key] = {"from_name": from_method, "from_ns": from_namespace, "to_name": to_method, "to_ns": to_namespace}
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (from:Method {name: $from_method, namespace: $from_namespace})
-                MATCH (to:Method {name: $to_method, namespace: $to_namespace})
-                MERGE (from)-[m2m:CALLS_METHOD]->(to)
-                SET m2m.created_at = datetime()
-                RETURN m2m
-                """
-                
-                result = session.run(query, {
-                    "from_method": from_method,
-                    "from_namespace": from_namespace,
-                    "to_method": to_method,
-                    "to_namespace": to_namespace
-                })
-                
-                debug_logger.info(f"Created method calls method: {from_method} -> {to_method}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_method_calls_method", "Success")
+            with self._session_factory() as session:
+                summary = self._run_with_retry(session, _Q_CREATE_METHOD_CALLS_METHOD, from_method=from_method, from_namespace=from_namespace, to_method=to_method, to_namespace=to_namespace)
+                if summary.counters.relationships_created:
+                    self._seen.add(key)
+                
+                debug_logger.info("Created method calls method: %s -> %s", from_method, to_method)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_method_calls_method", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to create method calls method: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_method_calls_method", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_method_calls_method", "Failed")
             return False
     
     def create_class_calls_sp(self, class_name: str, class_namespace: str, sp_name: str, sp_namespace: str) -> bool:
         """Create Class :CALLS_SP StoredProcedure relationship"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_class_calls_sp", kwargs={
-            "class_name": class_name, "sp_name": sp_name
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_class_calls_sp", kwargs={
+                "class_name": class_name, "sp_name": sp_name
+            })
+        
+        key = ("CALLS_SP", class_name, class_namespace, sp_name, sp_namespace)
+        if key in self._seen:
+            return True
+        
+        if self._rel_buffer is not None:
+            self._rel_buffer["CALLS_SP"][key] = {"from_name": class_name, "from_ns": class_namespace, "to_name": sp_name, "to_ns": sp_namespace}
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (c:Class {name: $class_name, namespace: $class_namespace})
-                MATCH (sp:StoredProcedure {name: $sp_name, namespace: $sp_namespace})
-                MERGE (c)-[c2sp:CALLS_SP]->(sp)
-                SET c2sp.created_at = datetime()
-                RETURN c2sp
-                """
-                
-                result = session.run(query, {
-                    "class_name": class_name,
-                    "class_namespace": class_namespace,
-                    "sp_name": sp_name,
-                    "sp_namespace": sp_namespace
-                })
-                
-                debug_logger.info(f"Created class calls stored procedure: {class_name} -> {sp_name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_class_calls_sp", "Success")
+            with self._session_factory() as session:
+                summary = self._run_with_retry(session, _Q_CREATE_CLASS_CALLS_SP, class_name=class_name, class_namespace=class_namespace, sp_name=sp_name, sp_namespace=sp_namespace)
+                if summary.counters.relationships_created:
+                    self._seen.add(key)
+                
+                debug_logger.info("Created class calls stored procedure: %s -> %s", class_name, sp_name)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_class_calls_sp", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to create class calls stored procedure: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_class_calls_sp", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_class_calls_sp", "Failed")
             return False
     
     def create_sp_has_table(self, sp_name: str, sp_namespace: str, table_name: str, table_namespace: str) -> bool:
         """Create StoredProcedure :HAS_TABLES Table relationship"""
-        debug_logger.log_function_call("Neo4jDotNetClient.create_sp_has_table", kwargs={
-            "sp_name": sp_name, "table_name": table_name
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_sp_has_table", kwargs={
+                "sp_name": sp_name, "table_name": table_name
+            })
+        
+        key = ("HAS_TABLES", sp_name, sp_namespace, table_name, table_namespace)
+        if key in self._seen:
+            return True
+        
+        if self._rel_buffer is not None:
+            self._rel_buffer["HAS_TABLES"][key] = {"from_name": sp_name, "from_ns": sp_namespace, "to_name": table_name, "to_ns": table_namespace}
+            return True
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (sp:StoredProcedure {name: $sp_name, namespace: $sp_namespace})
-                MATCH (t:Table {name: $table_name, namespace: $table_namespace})
-                MERGE (sp)-[sp2t:HAS_TABLES]->(t)
-                SET sp2t.created_at = datetime()
-                RETURN sp2t
-                """
-                
-                result = session.run(query, {
-                    "sp_name": sp_name,
-                    "sp_namespace": sp_namespace,
-                    "table_name": table_name,
-                    "table_namespace": table_namespace
-                })
-                
-                debug_logger.info(f"Created stored procedure has table: {sp_name} -> {table_name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.create_sp_has_table", "Success")
+            with self._session_factory() as session:
+                summary = self._run_with_retry(session, _Q_CREATE_SP_HAS_TABLE, sp_name=sp_name, sp_namespace=sp_namespace, table_name=table_name, table_namespace=table_namespace)
+                if summary.counters.relationships_created:
+                    self._seen.add(key)
+                
+                debug_logger.info("Created stored procedure has table: %s -> %s", sp_name, table_name)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_sp_has_table", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to create stored procedure has table: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.create_sp_has_table", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_sp_has_table", "Failed")
             return False
     
-    # Query methods
-    def find_controllers_calling_sp(self, sp_name: str, sp_namespace: str) -> List[Dict]:
-        """Find all controllers that call a specific stored procedure"""
-        debug_logger.log_function_call("Neo4jDotNetClient.find_controllers_calling_sp", kwargs={
-            "sp_name": sp_name, "sp_namespace": sp_namespace
-        })
+    # Bulk ingestion methods
+    def create_relationships(self, rel_type: str, pairs: List[Dict]) -> bool:
+        """Create many relationships of one type in a single UNWIND query
+        
+        ``rel_type`` is a key of _REL_SPECS and each pair is
+        ``{from_name, from_ns, to_name, to_ns}``.
+        """
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.create_relationships", kwargs={
+                "rel_type": rel_type, "count": len(pairs)
+            })
         
         try:
-            with self.driver.session() as session:
-                # First try direct class to stored procedure relationship
-                query = """
-                MATCH (c:Class {type: "Controller"})-[:CALLS_SP]->(sp:StoredProcedure {name: $sp_name, namespace: $sp_namespace})
-                RETURN DISTINCT c.name as controller_name, c.namespace as controller_namespace
-                ORDER BY c.name
-                """
+            with self._session_factory() as session:
+                self._batch_rel(session, rel_type, pairs)
                 
-                result = session.run(query, {
-                    "sp_name": sp_name,
-                    "sp_namespace": sp_namespace
-                })
+                debug_logger.info("Created %d %s relationships", len(pairs), rel_type)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.create_relationships", "Success")
+                return True
                 
-                controllers = []
-                for record in result:
-                    controllers.append({
-                        "controller_name": record["controller_name"],
-                        "controller_namespace": record["controller_namespace"]
-                    })
+        except Exception as e:
+            debug_logger.error(f"Failed to create {rel_type} relationships: {e}")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.create_relationships", "Failed")
+            return False
+    
+    def _batch_rel(self, session, rel_type: str, pairs: List[Dict]):
+        """Run the batched MERGE for one relationship type on an open session"""
+        if self._has_apoc and len(pairs) >= _APOC_MIN_ROWS:
+            # Relationships share endpoint nodes, so batches must not run in parallel
+            from_label, to_label = _REL_SPECS[rel_type]
+            statement = _MERGE_REL_ROW.format(rel_type=rel_type, from_label=from_label, to_label=to_label)
+            self._apoc_iterate(session, statement, pairs, batch_size=1000, parallel=False)
+        else:
+            self._run_with_retry(session, _Q_BATCH_REL[rel_type], rows=pairs)
+    
+    def _batch_merge(self, session, label: str, rows: List[Dict]):
+        """Run the batched node MERGE for one label on an open session"""
+        self._run_with_retry(session, _Q_BATCH_MERGE[label], rows=rows)
+    
+    def _apoc_iterate(self, session, statement: str, rows: List[Dict], batch_size: int, parallel: bool):
+        """Run ``statement`` once per row through apoc.periodic.iterate, raising on batch errors"""
+        record = session.run(_Q_APOC_ITERATE, statement=statement, rows=rows,
+                             batch_size=batch_size, parallel=parallel).single()
+        if record and record["errorMessages"]:
+            raise RuntimeError(f"apoc.periodic.iterate failed: {record['errorMessages']}")
+        self._query_cache.clear()
+        self._constant_classes.clear()
+    
+    def bulk_ingest_via_apoc(self, label: str, rows: List[Dict], batch_size: int = 1000, parallel: bool = True) -> bool:
+        """Create many nodes of one label through apoc.periodic.iterate
+        
+        Rows are ``{name, namespace, type?, source?}``. They are de-duplicated
+        on (name, namespace) first so parallel batches never MERGE the same
+        node. Falls back to a single UNWIND query when APOC is not installed.
+        """
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.bulk_ingest_via_apoc", kwargs={
+                "label": label, "count": len(rows), "batch_size": batch_size, "parallel": parallel
+            })
+        
+        unique_rows = list({(row["name"], row["namespace"]): row for row in rows}.values())
+        
+        try:
+            with self._session_factory() as session:
+                if self._has_apoc:
+                    self._apoc_iterate(session, _MERGE_NODE_ROW[label], unique_rows, batch_size, parallel)
+                else:
+                    self._batch_merge(session, label, unique_rows)
+                
+                debug_logger.info("Ingested %d %s nodes", len(unique_rows), label)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.bulk_ingest_via_apoc", "Success")
+                return True
                 
-                # If no direct relationships found, try through methods
-                if not controllers:
-                    query2 = """
-                    MATCH (c:Class {type: "Controller"})-[:HAS_METHOD]->(m:Method)
-                    MATCH (m)-[:CALLS_SP]->(sp:StoredProcedure {name: $sp_name, namespace: $sp_namespace})
-                    RETURN DISTINCT c.name as controller_name, c.namespace as controller_namespace
-                    ORDER BY c.name
-                    """
-                    
-                    result2 = session.run(query2, {
-                        "sp_name": sp_name,
-                        "sp_namespace": sp_namespace
-                    })
-                    
-                    for record in result2:
-                        controllers.append({
-                            "controller_name": record["controller_name"],
-                            "controller_namespace": record["controller_namespace"]
-                        })
+        except Exception as e:
+            debug_logger.error(f"Failed to bulk ingest {label} nodes: {e}")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.bulk_ingest_via_apoc", "Failed")
+            return False
+    
+    @staticmethod
+    def render_csv(rows: List[Dict], header: tuple = _CSV_HEADER) -> str:
+        """Render ``rows`` as CSV text with a header line, quoting values as needed"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow([row.get(column, "") for column in header])
+        return buffer.getvalue()
+    
+    def bulk_ingest_via_csv(self, label: str, rows: List[Dict], import_dir: str = None) -> bool:
+        """Create many nodes of one label by writing a CSV and running LOAD CSV
+        
+        The file is written as ``{label}.csv`` into ``import_dir`` (default
+        NEO4J_IMPORT_DIR), which must be the server's dbms.directories.import.
+        The server commits every _CSV_COMMIT_ROWS rows (Neo4j 4.4+).
+        """
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.bulk_ingest_via_csv", kwargs={
+                "label": label, "count": len(rows), "import_dir": import_dir
+            })
+        
+        import_dir = import_dir or os.getenv('NEO4J_IMPORT_DIR')
+        if not import_dir:
+            debug_logger.error("No Neo4j import directory; set NEO4J_IMPORT_DIR or pass import_dir")
+            return False
+        
+        unique_rows = list({(row["name"], row["namespace"]): row for row in rows}.values())
+        
+        try:
+            file_name = f"{label}.csv"
+            with open(os.path.join(import_dir, file_name), "w", newline="", encoding="utf-8") as f:
+                f.write(self.render_csv(unique_rows))
+            
+            with self._session_factory() as session:
+                # CALL { } IN TRANSACTIONS needs an auto-commit transaction, which session.run() is
+                self._run_with_retry(session, _Q_LOAD_CSV[label], url=f"file:///{file_name}")
+                
+                debug_logger.info("Ingested %d %s nodes via LOAD CSV", len(unique_rows), label)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.bulk_ingest_via_csv", "Success")
+                return True
                 
-                debug_logger.info(f"Found {len(controllers)} controllers calling {sp_name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.find_controllers_calling_sp", f"Found {len(controllers)} controllers")
-                return controllers
+        except Exception as e:
+            debug_logger.error(f"Failed to ingest {label} nodes via LOAD CSV: {e}")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.bulk_ingest_via_csv", "Failed")
+            return False
+    
+    def explain_relationship_batch(self, rel_type: str) -> List[str]:
+        """Return the operator types of the batched query plan for ``rel_type``
+        
+        Runs EXPLAIN, so nothing is written; used to confirm the plan seeks
+        each endpoint instead of building a CartesianProduct.
+        """
+        try:
+            with self._session_factory() as session:
+                summary = session.run(_Q_EXPLAIN_BATCH_REL[rel_type], rows=[]).consume()
+                operators = [node.get("operatorType", "") for node in _plan_operators(summary.plan)]
+                
+                if any(op.startswith("CartesianProduct") for op in operators):
+                    debug_logger.warning(f"Batched {rel_type} plan contains a CartesianProduct: {operators}")
+                return operators
                 
         except Exception as e:
-            debug_logger.error(f"Failed to find controllers calling stored procedure: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.find_controllers_calling_sp", "Failed")
+            debug_logger.error(f"Failed to explain {rel_type} batch: {e}")
             return []
     
-    def find_classes_using_constant(self, constant_name: str, constant_namespace: str) -> List[Dict]:
-        """Find all classes that use a specific constant"""
-        debug_logger.log_function_call("Neo4jDotNetClient.find_classes_using_constant", kwargs={
-            "constant_name": constant_name, "constant_namespace": constant_namespace
-        })
+    def clear_dedup_cache(self):
+        """Forget which nodes and relationships were written so the next create_* calls hit Neo4j again"""
+        self._seen.clear()
+        self._seen_nodes.clear()
+    
+    def begin_bulk(self):
+        """Queue relationship creation calls until commit_bulk() instead of writing each one"""
+        # Queued rows are keyed like the seen set so repeats within a batch collapse
+        self._rel_buffer = defaultdict(dict)
+    
+    def commit_bulk(self) -> bool:
+        """Write all queued relationships, one UNWIND query per relationship type"""
+        buffer, self._rel_buffer = self._rel_buffer or {}, None
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.commit_bulk", kwargs={
+                rel_type: len(pairs) for rel_type, pairs in buffer.items()
+            })
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (c:Class)-[:HAS_METHOD]->(m:Method)
-                MATCH (m)-[:CALLS_METHOD]->(m2:Method)
-                MATCH (m2)-[:USES_CONSTANT]->(const:Constant {name: $constant_name, namespace: $constant_namespace})
-                RETURN DISTINCT c.name as class_name, c.namespace as class_namespace
-                ORDER BY c.name
-                """
+            with self._session_factory() as session:
+                for rel_type, pairs in buffer.items():
+                    self._batch_rel(session, rel_type, list(pairs.values()))
                 
-                result = session.run(query, {
-                    "constant_name": constant_name,
-                    "constant_namespace": constant_namespace
-                })
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.commit_bulk", "Success")
+                return True
                 
-                classes = []
-                for record in result:
-                    classes.append({
-                        "class_name": record["class_name"],
-                        "class_namespace": record["class_namespace"]
-                    })
+        except Exception as e:
+            debug_logger.error(f"Failed to commit bulk relationships: {e}")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.commit_bulk", "Failed")
+            return False
+    
+    def bulk_create_parallel(self, items: List[Dict], workers: int = None) -> bool:
+        """Create nodes of several labels concurrently, one batched UNWIND per worker
+        
+        Each item is ``{label, name, namespace, type?, source?}``. Items are
+        grouped by label, de-duplicated on (name, namespace) and split into
+        BULK_BATCH_SIZE batches, so concurrent batches never MERGE the same
+        node. Batches run on the client's worker pool, or on a dedicated pool
+        of ``workers`` threads when given; each uses its own pooled session.
+        """
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.bulk_create_parallel", kwargs={
+                "count": len(items), "workers": workers
+            })
+        
+        grouped_by_label = defaultdict(dict)
+        for item in items:
+            row = {k: v for k, v in item.items() if k != "label"}
+            grouped_by_label[item["label"]][(row["name"], row["namespace"])] = row
+        
+        batches = []
+        for label, rows_by_key in grouped_by_label.items():
+            rows = list(rows_by_key.values())
+            for start in range(0, len(rows), self.BULK_BATCH_SIZE):
+                batches.append((label, rows[start:start + self.BULK_BATCH_SIZE]))
+        
+        def merge_batch(batch) -> bool:
+            label, rows = batch
+            try:
+                with self._session_factory() as session:
+                    self._batch_merge(session, label, rows)
+                return True
+            except Exception as e:
+                debug_logger.error(f"Failed to create {len(rows)} {label} nodes: {e}")
+                return False
+        
+        if workers is None and self._executor is not None:
+            results = list(self._executor.map(merge_batch, batches))
+        else:
+            with ThreadPoolExecutor(max_workers=workers or self.PREWARM_CONNECTIONS) as executor:
+                results = list(executor.map(merge_batch, batches))
+        
+        success = all(results)
+        debug_logger.info("Created nodes in %d parallel batches (%d failed)", len(batches), results.count(False))
+        if debug_logger.enabled:
+            debug_logger.log_function_return("Neo4jDotNetClient.bulk_create_parallel", "Success" if success else "Failed")
+        return success
+    
+    def bulk_ingest_class_tree(self, classes: List[Dict]) -> bool:
+        """Create classes with their methods and stored procedure calls in one query
+        
+        Each entry is ``{name, namespace, type?, source?, methods: [{name, namespace}],
+        calls_sps: [{name, namespace}]}``. Replaces the create_class_node /
+        create_method_node / create_class_has_method / create_class_calls_sp
+        sequence (2N+1 round trips per class) with a single UNWIND transaction.
+        """
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.bulk_ingest_class_tree", kwargs={
+                "class_count": len(classes)
+            })
+        
+        try:
+            with self._session_factory() as session:
+                self._run_with_retry(session, _Q_BULK_INGEST_CLASS_TREE, rows=classes)
                 
-                debug_logger.info(f"Found {len(classes)} classes using {constant_name}")
+                debug_logger.info("Ingested class tree: %d classes", len(classes))
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.bulk_ingest_class_tree", "Success")
+                return True
+        
+        except Exception as e:
+            debug_logger.error(f"Failed to ingest class tree: {e}")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.bulk_ingest_class_tree", "Failed")
+            return False
+    
+    # Query methods
+    def iter_controllers_calling_sp(self, sp_name: str, sp_namespace: str) -> Iterator[Dict]:
+        """Yield controllers that call a stored procedure as records arrive
+        
+        Records are pulled lazily, so callers can stop early without the full
+        result being fetched. Errors propagate to the caller.
+        """
+        records = self._iter_controllers_calling_sp(sp_name, sp_namespace)
+        if debug_logger.enabled:
+            return _log_count(records, f"controllers calling {sp_name}")
+        return records
+    
+    def _iter_controllers_calling_sp(self, sp_name: str, sp_namespace: str) -> Iterator[Dict]:
+        """Generator behind iter_controllers_calling_sp"""
+        # The query aliases its columns to the dict keys, so Record.data() is the row
+        for record in self._run_read(_Q_FIND_CONTROLLERS_CALLING_SP, sp_name=sp_name, sp_namespace=sp_namespace):
+            yield record.data()
+    
+    def find_controllers_calling_sp(self, sp_name: str, sp_namespace: str) -> List[Dict]:
+        """Find all controllers that call a specific stored procedure"""
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.find_controllers_calling_sp", kwargs={
+                "sp_name": sp_name, "sp_namespace": sp_namespace
+            })
+        
+        try:
+            controllers = list(self.iter_controllers_calling_sp(sp_name, sp_namespace))
+            
+            debug_logger.info("Found %d controllers calling %s", len(controllers), sp_name)
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.find_controllers_calling_sp", f"Found {len(controllers)} controllers")
+            return controllers
+            
+        except Exception as e:
+            debug_logger.error(f"Failed to find controllers calling stored procedure: {e}")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.find_controllers_calling_sp", "Failed")
+            return []
+    
+    def iter_classes_using_constant(self, constant_name: str, constant_namespace: str,
+                                    repo_name: str = None, repo_namespace: str = None) -> Iterator[Dict]:
+        """Yield classes that use a constant as records arrive; errors propagate to the caller
+        
+        Passing ``repo_name`` and ``repo_namespace`` limits the search to that
+        repository's classes.
+        """
+        records = self._iter_classes_using_constant(constant_name, constant_namespace, repo_name, repo_namespace)
+        if debug_logger.enabled:
+            return _log_count(records, f"classes using {constant_name}")
+        return records
+    
+    def _iter_classes_using_constant(self, constant_name: str, constant_namespace: str,
+                                     repo_name: str = None, repo_namespace: str = None) -> Iterator[Dict]:
+        """Generator behind iter_classes_using_constant"""
+        for class_name, class_namespace in self._iter_class_pairs(constant_name, constant_namespace, repo_name, repo_namespace):
+            yield {"class_name": class_name, "class_namespace": class_namespace}
+    
+    def _iter_class_pairs(self, constant_name: str, constant_namespace: str,
+                          repo_name: str = None, repo_namespace: str = None) -> Iterator[Tuple[str, str]]:
+        """Yield (class_name, class_namespace) for each class using a constant"""
+        if repo_name is not None:
+            yield from self._run_read(_Q_FIND_REPO_CLASSES_USING_CONSTANT, repo_name=repo_name, repo_namespace=repo_namespace,
+                                      constant_name=constant_name, constant_namespace=constant_namespace)
+            return
+        
+        rows = [{"name": constant_name, "namespace": constant_namespace}]
+        # Records are tuples in RETURN order; unpacking skips the per-key index lookups
+        for _, _, class_name, class_namespace in self._run_read(_Q_FIND_CLASSES_USING_CONSTANTS, rows=rows):
+            yield class_name, class_namespace
+    
+    def find_classes_using_constant(self, constant_name: str, constant_namespace: str,
+                                    repo_name: str = None, repo_namespace: str = None) -> ClassResult:
+        """Find all classes that use a specific constant, optionally within one repository"""
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.find_classes_using_constant", kwargs={
+                "constant_name": constant_name, "constant_namespace": constant_namespace, "repo_name": repo_name
+            })
+        
+        # Unscoped results live in the constant cache; repository-scoped ones in the query cache
+        if repo_name is None:
+            cache, key = self._constant_classes, (constant_name, constant_namespace)
+        else:
+            cache, key = self._query_cache, ("find_classes_using_constant", constant_name, constant_namespace, repo_name, repo_namespace)
+        cached = cache.get(key)
+        if cached is not _QueryCache._MISS:
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.find_classes_using_constant", f"Found {len(cached)} classes (cached)")
+            return cached.copy()
+        
+        try:
+            names, namespaces = [], []
+            for class_name, class_namespace in self._iter_class_pairs(constant_name, constant_namespace, repo_name, repo_namespace):
+                names.append(class_name)
+                namespaces.append(class_namespace)
+            classes = ClassResult(names=names, namespaces=namespaces)
+            cache.set(key, classes.copy())
+            
+            debug_logger.info("Found %d classes using %s", len(classes), constant_name)
+            if debug_logger.enabled:
                 debug_logger.log_function_return("Neo4jDotNetClient.find_classes_using_constant", f"Found {len(classes)} classes")
-                return classes
-                
+            return classes
+            
         except Exception as e:
             debug_logger.error(f"Failed to find classes using constant: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.find_classes_using_constant", "Failed")
-            return []
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.find_classes_using_constant", "Failed")
+            return ClassResult()
+    
+    def find_classes_using_constants_batch(self, constants: List[Tuple[str, str]]) -> Dict[Tuple[str, str], List[Dict]]:
+        """Find the classes using each of several constants in one query
+        
+        ``constants`` is a list of (name, namespace) pairs; the result maps
+        every pair to its classes, with an empty list when nothing uses it.
+        """
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.find_classes_using_constants_batch", kwargs={
+                "count": len(constants)
+            })
+        
+        classes_by_constant = {(name, namespace): [] for name, namespace in constants}
+        rows = [{"name": name, "namespace": namespace} for name, namespace in classes_by_constant]
+        
+        try:
+            for constant_name, constant_namespace, class_name, class_namespace in self._run_read(_Q_FIND_CLASSES_USING_CONSTANTS, rows=rows):
+                classes_by_constant[(constant_name, constant_namespace)].append({
+                    "class_name": class_name,
+                    "class_namespace": class_namespace
+                })
+            
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.find_classes_using_constants_batch", f"Looked up {len(rows)} constants")
+            return classes_by_constant
+            
+        except Exception as e:
+            debug_logger.error(f"Failed to find classes using constants: {e}")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.find_classes_using_constants_batch", "Failed")
+            return {}
     
     def get_repository_overview(self, repo_name: str, repo_namespace: str) -> Dict:
         """Get overview of repository structure"""
-        debug_logger.log_function_call("Neo4jDotNetClient.get_repository_overview", kwargs={
-            "repo_name": repo_name, "repo_namespace": repo_namespace
-        })
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.get_repository_overview", kwargs={
+                "repo_name": repo_name, "repo_namespace": repo_namespace
+            })
+        
+        key = ("get_repository_overview", repo_name, repo_namespace)
+        cached = self._query_cache.get(key)
+        if cached is not _QueryCache._MISS:
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.get_repository_overview", f"Overview: {cached} (cached)")
+            return dict(cached)
         
         try:
-            with self.driver.session() as session:
-                # Get counts for each node type
-                count_query = """
-                MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
-                OPTIONAL MATCH (r)-[:HAS_CLASSES]->(c:Class)
-                OPTIONAL MATCH (r)-[:HAS_CONSTANTS]->(const:Constant)
-                OPTIONAL MATCH (r)-[:HAS_ENUMS]->(e:Enum)
-                OPTIONAL MATCH (c)-[:HAS_METHOD]->(m:Method)
-                OPTIONAL MATCH (r)-[:HAS_CLASSES]->(ctrl:Class {type: "Controller"})
-                RETURN count(DISTINCT c) as class_count,
-                       count(DISTINCT const) as constant_count,
-                       count(DISTINCT e) as enum_count,
-                       count(DISTINCT m) as method_count,
-                       count(DISTINCT ctrl) as controller_count
-                """
-                
-                result = session.run(count_query, {"repo_name": repo_name, "repo_namespace": repo_namespace})
-                record = result.single()
-                
-                overview = {
-                    "class_count": record["class_count"] or 0,
-                    "constant_count": record["constant_count"] or 0,
-                    "enum_count": record["enum_count"] or 0,
-                    "method_count": record["method_count"] or 0,
-                    "controller_count": record["controller_count"] or 0
-                }
-                
-                debug_logger.info(f"Repository overview: {overview}")
+            # Get counts for each node type
+            result = self._run_read(_Q_REPOSITORY_OVERVIEW, repo_name=repo_name, repo_namespace=repo_namespace)
+            # Zero defaults come from coalesce() in the query; strict raises if the repository is missing
+            class_count, constant_count, enum_count, method_count, controller_count = result.single(strict=True)
+            
+            overview = {
+                "class_count": class_count,
+                "constant_count": constant_count,
+                "enum_count": enum_count,
+                "method_count": method_count,
+                "controller_count": controller_count
+            }
+            self._query_cache.set(key, dict(overview))
+            
+            debug_logger.info("Repository overview: %s", overview)
+            if debug_logger.enabled:
                 debug_logger.log_function_return("Neo4jDotNetClient.get_repository_overview", f"Overview: {overview}")
-                return overview
-                
+            return overview
+            
         except Exception as e:
             debug_logger.error(f"Failed to get repository overview: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.get_repository_overview", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.get_repository_overview", "Failed")
             return {}
     
+    def invalidate_constant(self, constant_name: str, constant_namespace: str):
+        """Forget the cached classes for one constant"""
+        self._constant_classes.pop((constant_name, constant_namespace))
+    
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return hit/miss counters for the query-result and constant caches"""
+        return {"queries": self._query_cache.stats(), "constants": self._constant_classes.stats()}
+    
     def clear_repository_data(self, repo_name: str, repo_namespace: str) -> bool:
-        """Clear all data for a specific repository"""
-        debug_logger.log_function_call("Neo4jDotNetClient.clear_repository_data", kwargs={
-            "repo_name": repo_name, "repo_namespace": repo_namespace
-        })
+        """Clear all data for a specific repository (its classes, methods, constants and enums)"""
+        if debug_logger.enabled:
+            debug_logger.log_function_call("Neo4jDotNetClient.clear_repository_data", kwargs={
+                "repo_name": repo_name, "repo_namespace": repo_namespace
+            })
         
         try:
-            with self.driver.session() as session:
-                query = """
-                MATCH (r:Repository {name: $repo_name, namespace: $repo_namespace})
-                DETACH DELETE r
-                """
-                
-                session.run(query, {"repo_name": repo_name, "repo_namespace": repo_namespace})
-                
-                debug_logger.info(f"Cleared all data for repository: {repo_name}")
-                debug_logger.log_function_return("Neo4jDotNetClient.clear_repository_data", "Success")
+            with self._session_factory() as session:
+                # CALL { } IN TRANSACTIONS needs an auto-commit transaction, which session.run() is
+                session.run(_Q_CLEAR_REPOSITORY_CONTENTS, repo_name=repo_name, repo_namespace=repo_namespace).consume()
+                session.run(_Q_CLEAR_REPOSITORY, repo_name=repo_name, repo_namespace=repo_namespace).consume()
+                self.clear_dedup_cache()
+                self._query_cache.clear()
+                # The repository's classes may have used constants from any repository
+                self._constant_classes.clear()
+                
+                debug_logger.info("Cleared all data for repository: %s", repo_name)
+                if debug_logger.enabled:
+                    debug_logger.log_function_return("Neo4jDotNetClient.clear_repository_data", "Success")
                 return True
                 
         except Exception as e:
             debug_logger.error(f"Failed to clear repository data: {e}")
-            debug_logger.log_function_return("Neo4jDotNetClient.clear_repository_data", "Failed")
+            if debug_logger.enabled:
+                debug_logger.log_function_return("Neo4jDotNetClient.clear_repository_data", "Failed")
+            return False
+
+
+class AsyncNeo4jDotNetClient:
+    """Async mirror of Neo4jDotNetClient for pipelined bulk writes and concurrent lookups
+    
+    Queries go through ``driver.execute_query`` so BEGIN is pipelined with the
+    first RUN, and many MERGEs can be in flight at once via ``bulk_create``;
+    ``find_classes_using_constants`` overlaps many lookups the same way.
+    """
+    
+    MAX_CONCURRENT_WRITES = 64
+    # Concurrent lookups in find_classes_using_constants; the pool is sized for the larger fan-out
+    MAX_CONCURRENT_READS = 64
+    
+    def __init__(self, uri: str = None, username: str = None, password: str = None, database: str = None):
+        """Initialize async Neo4j .NET client"""
+        self.uri = uri or os.getenv('NEO4J_URI', 'bolt://localhost:7687')
+        self.username = username or os.getenv('NEO4J_USERNAME', 'neo4j')
+        self.password = password or os.getenv('NEO4J_PASSWORD', 'password')
+        self.database = database or os.getenv('NEO4J_DATABASE', 'neo4j')
+        self.driver = None
+        
+        debug_logger.log_function_call("AsyncNeo4jDotNetClient.__init__", kwargs={
+            "uri": self.uri,
+            "username": self.username
+        })
+    
+    async def connect(self) -> bool:
+        """Connect to Neo4j database"""
+        debug_logger.log_function_call("AsyncNeo4jDotNetClient.connect")
+        
+        try:
+            self.driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.username, self.password),
+                max_connection_pool_size=max(self.MAX_CONCURRENT_WRITES, self.MAX_CONCURRENT_READS)
+            )
+            # Test connection
+            records, _, _ = await self.driver.execute_query(_Q_CONNECTION_TEST, database_=self.database)
+            if records[0]["test"] == 1:
+                debug_logger.info("Async Neo4j .NET connection successful")
+                debug_logger.log_function_return("AsyncNeo4jDotNetClient.connect", "Success")
+                return True
+        except Exception as e:
+            debug_logger.error(f"Async Neo4j .NET connection failed: {e}")
+            debug_logger.log_function_return("AsyncNeo4jDotNetClient.connect", "Failed")
+            return False
+        
+        return False
+    
+    async def close(self):
+        """Close Neo4j connection"""
+        if self.driver:
+            await self.driver.close()
+            debug_logger.info("Async Neo4j .NET connection closed")
+    
+    async def _execute_write(self, query: str, description: str, **parameters) -> bool:
+        """Run a single write query, logging instead of raising on failure"""
+        try:
+            await self.driver.execute_query(query, database_=self.database, **parameters)
+            return True
+        except Exception as e:
+            debug_logger.error(f"Failed to create {description}: {e}")
             return False
+    
+    async def _create_node(self, label: str, name: str, namespace: str, type: str, source: str) -> bool:
+        """MERGE a node of ``label`` keyed by (name, namespace) and set its type and source"""
+        return await self._execute_write(_Q_CREATE_NODE[label], f"{label} node", name=name, namespace=namespace, type=type, source=source)
+    
+    async def create_repository_node(self, name: str, namespace: str, type: str = "Repository", source: str = "github") -> bool:
+        """Create a Repository node"""
+        return await self._create_node("Repository", name, namespace, type, source)
+    
+    async def create_class_node(self, name: str, namespace: str, type: str = "Class", source: str = "dotnet") -> bool:
+        """Create a Class node"""
+        return await self._create_node("Class", name, namespace, type, source)
+    
+    async def create_method_node(self, name: str, namespace: str, type: str = "Method", source: str = "dotnet") -> bool:
+        """Create a Method node"""
+        return await self._create_node("Method", name, namespace, type, source)
+    
+    async def create_enum_node(self, name: str, namespace: str, type: str = "Enum", source: str = "dotnet") -> bool:
+        """Create an Enum node"""
+        return await self._create_node("Enum", name, namespace, type, source)
+    
+    async def create_constant_node(self, name: str, namespace: str, type: str = "Constant", source: str = "dotnet") -> bool:
+        """Create a Constant node"""
+        return await self._create_node("Constant", name, namespace, type, source)
+    
+    async def create_controller_node(self, name: str, namespace: str, type: str = "Controller", source: str = "dotnet") -> bool:
+        """Create a Controller node (represents API routes)"""
+        return await self._create_node("Controller", name, namespace, type, source)
+    
+    async def create_stored_procedure_node(self, name: str, namespace: str, type: str = "StoredProcedure", source: str = "database") -> bool:
+        """Create a StoredProcedure node"""
+        return await self._create_node("StoredProcedure", name, namespace, type, source)
+    
+    async def create_table_node(self, name: str, namespace: str, type: str = "Table", source: str = "database") -> bool:
+        """Create a Table node"""
+        return await self._create_node("Table", name, namespace, type, source)
+    
+    async def create_repository_dependency(self, from_repo: str, to_repo: str, from_namespace: str, to_namespace: str) -> bool:
+        """Create Repository :DEPENDS_ON Repository relationship"""
+        return await self._execute_write(_Q_CREATE_REPOSITORY_DEPENDENCY, "repository dependency", from_repo=from_repo, from_namespace=from_namespace, to_repo=to_repo, to_namespace=to_namespace)
+    
+    async def create_repository_has_class(self, repo_name: str, repo_namespace: str, class_name: str, class_namespace: str) -> bool:
+        """Create Repository :HAS_CLASSES Class relationship"""
+        return await self._execute_write(_Q_CREATE_REPOSITORY_HAS_CLASS, "repository has class", repo_name=repo_name, repo_namespace=repo_namespace, class_name=class_name, class_namespace=class_namespace)
+    
+    async def create_repository_has_constant(self, repo_name: str, repo_namespace: str, constant_name: str, constant_namespace: str) -> bool:
+        """Create Repository :HAS_CONSTANTS Constant relationship"""
+        return await self._execute_write(_Q_CREATE_REPOSITORY_HAS_CONSTANT, "repository has constant", repo_name=repo_name, repo_namespace=repo_namespace, constant_name=constant_name, constant_namespace=constant_namespace)
+    
+    async def create_repository_has_enum(self, repo_name: str, repo_namespace: str, enum_name: str, enum_namespace: str) -> bool:
+        """Create Repository :HAS_ENUMS Enum relationship"""
+        return await self._execute_write(_Q_CREATE_REPOSITORY_HAS_ENUM, "repository has enum", repo_name=repo_name, repo_namespace=repo_namespace, enum_name=enum_name, enum_namespace=enum_namespace)
+    
+    async def create_class_has_method(self, class_name: str, class_namespace: str, method_name: str, method_namespace: str) -> bool:
+        """Create Class :HAS_METHOD Method relationship"""
+        return await self._execute_write(_Q_CREATE_CLASS_HAS_METHOD, "class has method", class_name=class_name, class_namespace=class_namespace, method_name=method_name, method_namespace=method_namespace)
+    
+    async def create_method_calls_method(self, from_method: str, from_namespace: str, to_method: str, to_namespace: str) -> bool:
+        """Create Method :CALLS_METHOD Method relationship"""
+        return await self._execute_write(_Q_CREATE_METHOD_CALLS_METHOD, "method calls method", from_method=from_method, from_namespace=from_namespace, to_method=to_method, to_namespace=to_namespace)
+    
+    async def create_class_calls_sp(self, class_name: str, class_namespace: str, sp_name: str, sp_namespace: str) -> bool:
+        """Create Class :CALLS_SP StoredProcedure relationship"""
+        return await self._execute_write(_Q_CREATE_CLASS_CALLS_SP, "class calls stored procedure", class_name=class_name, class_namespace=class_namespace, sp_name=sp_name, sp_namespace=sp_namespace)
+    
+    async def create_sp_has_table(self, sp_name: str, sp_namespace: str, table_name: str, table_namespace: str) -> bool:
+        """Create StoredProcedure :HAS_TABLES Table relationship"""
+        return await self._execute_write(_Q_CREATE_SP_HAS_TABLE, "stored procedure has table", sp_name=sp_name, sp_namespace=sp_namespace, table_name=table_name, table_namespace=table_namespace)
+    
+    async def bulk_create(self, items: List[Dict], node_type: str = "class") -> List[bool]:
+        """Create many nodes concurrently, e.g. ``bulk_create(items, "method")``
+        
+        Each item holds the keyword arguments of the matching ``create_<node_type>_node``
+        method. At most MAX_CONCURRENT_WRITES queries are in flight at once.
+        """
+        debug_logger.log_function_call("AsyncNeo4jDotNetClient.bulk_create", kwargs={
+            "node_type": node_type, "count": len(items)
+        })
+        
+        create = getattr(self, f"create_{node_type}_node")
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_WRITES)
+        
+        async def bounded_create(item: Dict) -> bool:
+            async with semaphore:
+                return await create(**item)
+        
+        results = await asyncio.gather(*[bounded_create(item) for item in items])
+        debug_logger.log_function_return("AsyncNeo4jDotNetClient.bulk_create", f"Created {sum(results)}/{len(items)}")
+        return list(results)
+    
+    async def find_classes_using_constant(self, constant_name: str, constant_namespace: str) -> List[Dict]:
+        """Find all classes that use a specific constant"""
+        try:
+            records, _, _ = await self.driver.execute_query(
+                _Q_FIND_CLASSES_USING_CONSTANTS,
+                rows=[{"name": constant_name, "namespace": constant_namespace}],
+                database_=self.database,
+                routing_=RoutingControl.READ
+            )
+            return [{"class_name": class_name, "class_namespace": class_namespace}
+                    for _, _, class_name, class_namespace in records]
+        except Exception as e:
+            debug_logger.error(f"Failed to find classes using constant: {e}")
+            return []
+    
+    async def find_classes_using_constants(self, constants: List[Tuple[str, str]]) -> List[List[Dict]]:
+        """Look up several (name, namespace) constants concurrently, returning results in input order
+        
+        At most MAX_CONCURRENT_READS lookups are in flight at once.
+        """
+        debug_logger.log_function_call("AsyncNeo4jDotNetClient.find_classes_using_constants", kwargs={
+            "count": len(constants)
+        })
+        
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_READS)
+        
+        async def bounded_find(name: str, namespace: str) -> List[Dict]:
+            async with semaphore:
+                return await self.find_classes_using_constant(name, namespace)
+        
+        results = await asyncio.gather(*[bounded_find(name, namespace) for name, namespace in constants])
+        debug_logger.log_function_return("AsyncNeo4jDotNetClient.find_classes_using_constants", f"Looked up {len(results)} constants")
+        return list(results)
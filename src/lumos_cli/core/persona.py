@@ -1,13 +1,136 @@
 """Repository-aware persona and context detection system"""
 
 import os
+import sys
+import ast
 import json
 import glob
 import re
-from typing import Dict, List, Optional, Set, Any
-from dataclasses import dataclass, asdict
+from collections import defaultdict, deque
+from typing import Dict, Iterator, List, Optional, Set, Any
+from dataclasses import dataclass, asdict, fields, is_dataclass
 from pathlib import Path
 import subprocess
+import numpy as np
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11: fall back to scanning pyproject.toml for quoted requirements
+    tomllib = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from ..utils.platform_utils import get_cache_directory
+from .persona_fast import count_glob_matches, count_regex_matches
+
+# Splits a requirement string at its version specifier, marker or extras
+_REQUIREMENT_NAME_END = re.compile(r'[\[>=<!~;\s]')
+
+# Byte-level manifest patterns; only the captured names are ever decoded
+_RE_VERSION_SPEC = re.compile(rb'[>=<!]')
+_RE_ARTIFACT_ID = re.compile(rb'<artifactId>([^<]+)</artifactId>')
+_RE_GRADLE_IMPLEMENTATION = re.compile(rb'implementation\s+[\'"]([^:\'"]+)')
+_RE_GRADLE_COMPILE = re.compile(rb'compile\s+[\'"]([^:\'"]+)')
+
+_READ_CHUNK = 64 * 1024
+
+
+def _read_bytes(file_path: str) -> bytes:
+    """Read a whole (small) file without the text-mode wrapper"""
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, _READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _decode(value: bytes) -> str:
+    return value.decode("utf-8", "replace")
+
+
+def _dataclass_fields(obj: Any) -> Dict[str, Any]:
+    """json ``default`` hook: a dataclass's fields as they are, without asdict's deep copy"""
+    if is_dataclass(obj):
+        return {field.name: getattr(obj, field.name) for field in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_STREAM_ENCODER = json.JSONEncoder(default=_dataclass_fields)
+
+
+def _iter_json_bytes(obj: Any) -> Iterator[bytes]:
+    """Encode ``obj`` as JSON; dataclasses are encoded from their fields in place"""
+    if orjson is not None:
+        # orjson serializes dataclasses natively in one C pass
+        yield orjson.dumps(obj)
+        return
+    for chunk in _STREAM_ENCODER.iterencode(obj):
+        yield chunk.encode("utf-8")
+
+
+# Root-level manifests whose stat the walk keeps for extract_dependencies
+MANIFEST_FILES = frozenset({
+    'requirements.txt', 'pyproject.toml', 'setup.py', 'package.json', 'pom.xml', 'build.gradle', 'go.mod',
+    'Cargo.toml', 'Pipfile',
+})
+
+
+def git_head_markers(repo_path: str) -> List[str]:
+    """Change markers for .git/HEAD and the branch ref it names: checkouts move the first, commits the second"""
+    git_dir = os.path.join(repo_path, ".git")
+    head_path = os.path.join(git_dir, "HEAD")
+    try:
+        markers = [f"HEAD:{os.stat(head_path).st_mtime_ns}"]
+        with open(head_path, 'r') as f:
+            head = f.read().strip()
+    except OSError:
+        return []
+    
+    if head.startswith("ref: "):
+        # A branch that has not moved since `git gc` only lives in packed-refs
+        ref = head[5:]
+        for path in (os.path.join(git_dir, *ref.split("/")), os.path.join(git_dir, "packed-refs")):
+            try:
+                markers.append(f"ref:{os.stat(path).st_mtime_ns}")
+                break
+            except OSError:
+                pass
+    return markers
+
+# Extensions of files reported as config_files
+CONFIG_EXTENSIONS = ('.json', '.yml', '.yaml', '.toml', '.ini', '.conf')
+
+# Extension buckets larger than this are matched with numpy string ops instead of a Python loop
+VECTORIZE_THRESHOLD = 5000
+
+# Literal file extension a regex is anchored to, e.g. "\.py$" or "pom\.xml$" -> ".py" / ".xml"
+_ANCHORED_EXTENSION = re.compile(r'\\(\.\w+)\$$')
+
+
+def _compile_indicator_pattern(pattern: str):
+    """Compile an indicator regex, paired with the extension it is anchored to (or None)"""
+    anchored = _ANCHORED_EXTENSION.search(pattern)
+    return (anchored.group(1) if anchored else None), re.compile(pattern)
+
+# Dependency, build-output and tool-state directories: only their presence matters
+# to detection, so the walk records them but never lists their contents
+PRUNE_DIRS = frozenset({
+    'node_modules', 'target', 'venv', '.venv', '__pycache__', '.pytest_cache', 'dist', 'build',
+    '.gradle', 'vendor', 'bin', 'obj', '.next', '.nuxt',
+})
 
 @dataclass
 class ProjectContext:
@@ -24,8 +147,31 @@ class ProjectContext:
     git_info: Dict[str, str]
     confidence_score: float  # How confident we are about the detection
     
+    def __post_init__(self):
+        # Names are compared against the module-level guideline tables; interning
+        # lets contexts built from split or JSON-loaded strings hit on identity
+        self.primary_languages = [sys.intern(lang) for lang in self.primary_languages]
+        self.frameworks = [sys.intern(framework) for framework in self.frameworks]
+    
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
+    
+    def fingerprint(self) -> tuple:
+        """Hashable summary of every field that shapes the system prompt
+        
+        Lists keep their order, since prompts list languages and frameworks
+        in ranked order.
+        """
+        return (
+            tuple(self.primary_languages),
+            self.project_type,
+            tuple(self.frameworks),
+            tuple((lang, tuple(deps)) for lang, deps in self.dependencies.items()),
+            tuple(self.build_tools),
+            tuple(self.testing_frameworks),
+            tuple(self.package_managers),
+            tuple(sorted(self.git_info.items())),
+        )
 
 class RepositoryAnalyzer:
     """Analyzes repository structure to determine project context"""
@@ -74,6 +220,12 @@ class RepositoryAnalyzer:
         }
     }
     
+    # LANGUAGE_INDICATORS patterns compiled once for every analyzer, as (extension, regex)
+    _LANGUAGE_PATTERNS = {
+        lang: tuple(_compile_indicator_pattern(pattern) for pattern in indicators["patterns"])
+        for lang, indicators in LANGUAGE_INDICATORS.items()
+    }
+    
     # Framework detection patterns
     FRAMEWORK_INDICATORS = {
         "python": {
@@ -123,6 +275,13 @@ class RepositoryAnalyzer:
         }
     }
     
+    # Inverted index of FRAMEWORK_INDICATORS: (language, dependency name) -> framework
+    _DEP_TO_FRAMEWORK = {
+        (lang, framework.lower()): framework
+        for lang, frameworks in FRAMEWORK_INDICATORS.items()
+        for framework in frameworks
+    }
+    
     # Project type classification
     PROJECT_TYPES = {
         "web_application": ["app.py", "server.js", "index.html", "package.json"],
@@ -136,39 +295,194 @@ class RepositoryAnalyzer:
         "documentation": ["docs/", "README.md", "*.md", "mkdocs.yml"],
     }
     
-    def __init__(self, repo_path: str):
+    BUILD_TOOL_INDICATORS = {
+        "webpack": ["webpack.config.js", "webpack.config.ts"],
+        "vite": ["vite.config.js", "vite.config.ts"],
+        "rollup": ["rollup.config.js"],
+        "gulp": ["gulpfile.js"],
+        "grunt": ["Gruntfile.js"],
+        "make": ["Makefile"],
+        "cmake": ["CMakeLists.txt"],
+        "docker": ["Dockerfile", "docker-compose.yml"],
+        "terraform": ["*.tf"],
+    }
+    
+    TESTING_FRAMEWORK_INDICATORS = {
+        "pytest": ["pytest.ini", "conftest.py"],
+        "unittest": ["test_*.py"],
+        "jest": ["jest.config.js"],
+        "mocha": ["mocha.opts", ".mocharc.json"],
+        "jasmine": ["jasmine.json"],
+        "junit": ["src/test/java/"],
+        "nunit": ["*.Tests.csproj"],
+        "go-test": ["*_test.go"],
+    }
+    
+    # Where analyze() keeps its per-repository ProjectContext snapshots
+    CONTEXT_CACHE_DIR = get_cache_directory() / "project_context"
+    
+    def __init__(self, repo_path: str, *, max_files: int = 20000, max_depth: int = 8):
         self.repo_path = os.path.abspath(repo_path)
-        self._file_cache = {}
-        self._populate_file_cache()
+        # Walk budget: detection saturates long before this, and it bounds the cost of
+        # pointing the CLI at a huge monorepo or a filesystem root
+        self.max_files = max_files
+        self.max_depth = max_depth
+        self._reset_caches()
+    
+    def _reset_caches(self):
+        """Forget the file walk and everything derived from it"""
+        # (relative paths, manifest stats, extension -> relative paths, bare file names,
+        # file count); walked on first use
+        self._walk = None
+        # Set when the walk stopped at max_files
+        self._truncated = False
+        # Per-pattern match counts over the (fixed) file cache, shared by the detectors
+        self._glob_counts = {}
+        self._regex_counts = {}
+        # extract_dependencies results per language set, and parsed manifests keyed by path
+        self._deps_cache = {}
+        self._parse_cache = {}
+    
+    def _walked(self) -> tuple:
+        if self._walk is None:
+            self._walk = self._populate_file_cache()
+        return self._walk
+    
+    @property
+    def _files(self) -> Set[str]:
+        """Relative paths of cached files, plus ``dir/`` markers for directories"""
+        return self._walked()[0]
+    
+    @property
+    def _manifests(self) -> Dict[str, os.stat_result]:
+        """Stat results of the root-level MANIFEST_FILES, taken during the walk"""
+        return self._walked()[1]
+    
+    @property
+    def _by_ext(self) -> Dict[str, List[str]]:
+        return self._walked()[2]
+    
+    @property
+    def _basenames(self) -> Set[str]:
+        return self._walked()[3]
+    
+    @property
+    def _n_files(self) -> int:
+        """Number of cached files, excluding directory markers"""
+        return self._walked()[4]
     
     def _populate_file_cache(self):
         """Cache all files in the repository for faster analysis"""
+        files = set()
+        manifests = {}
+        by_ext = defaultdict(list)
+        basenames = set()
+        file_count = 0
         try:
-            for root, dirs, files in os.walk(self.repo_path):
-                # Skip common ignore directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') or d in ['.github', '.vscode']]
-                
-                rel_root = os.path.relpath(root, self.repo_path)
-                if rel_root == '.':
-                    rel_root = ''
+            # Breadth-first scandir walk, so a truncated walk still covers the top levels;
+            # DirEntry carries the file type from the directory listing, so most entries
+            # need no extra stat call
+            pending = deque([(self.repo_path, '', 0)])
+            while pending and not self._truncated:
+                path, rel_root, depth = pending.popleft()
+                try:
+                    with os.scandir(path) as entries:
+                        entries = list(entries)
+                except OSError:
+                    # Unreadable directories are skipped, as os.walk does
+                    continue
                 
-                for file in files:
-                    if not file.startswith('.') or file in ['package.json', '.gitignore']:
-                        rel_path = os.path.join(rel_root, file) if rel_root else file
-                        full_path = os.path.join(root, file)
-                        self._file_cache[rel_path] = full_path
-                        
-                # Also cache directory names
-                for dir_name in dirs:
-                    rel_path = os.path.join(rel_root, dir_name) if rel_root else dir_name
-                    self._file_cache[f"{rel_path}/"] = os.path.join(root, dir_name)
+                for entry in entries:
+                    name = entry.name
+                    rel_path = rel_root + name
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if is_dir:
+                        if name in PRUNE_DIRS:
+                            files.add(f"{rel_path}/")
+                            continue
+                        # Skip common ignore directories
+                        if name.startswith('.') and name not in ['.github', '.vscode']:
+                            continue
+                        # Also cache directory names
+                        files.add(f"{rel_path}/")
+                        # Like os.walk, list symlinked directories but don't descend into them
+                        if depth < self.max_depth and not entry.is_symlink():
+                            pending.append((entry.path, f"{rel_path}/", depth + 1))
+                    elif not name.startswith('.') or name in ['package.json', '.gitignore']:
+                        if file_count >= self.max_files:
+                            self._truncated = True
+                            break
+                        file_count += 1
+                        files.add(rel_path)
+                        # Root-level manifests: DirEntry.stat() reuses what the listing already fetched where it can
+                        if rel_path in MANIFEST_FILES:
+                            try:
+                                manifests[rel_path] = entry.stat()
+                            except OSError:
+                                pass
+                        # A few extensions repeat across thousands of files; share one string each
+                        by_ext[sys.intern(os.path.splitext(name)[1])].append(rel_path)
+                        basenames.add(name)
                     
         except Exception as e:
             print(f"Warning: Error caching repository files: {e}")
+        return files, manifests, by_ext, basenames, file_count
+    
+    def _count_glob(self, file_pattern: str) -> int:
+        """Count cached files whose name matches a glob such as ``*.py`` or ``*_test.go``"""
+        count = self._glob_counts.get(file_pattern)
+        if count is None:
+            ext = os.path.splitext(file_pattern)[1]
+            candidates = self._by_ext.get(ext, ())
+            prefix, _, suffix = file_pattern.partition("*")
+            if file_pattern == f"*{ext}":
+                count = len(candidates)
+            elif len(candidates) > VECTORIZE_THRESHOLD and "*" not in suffix and not any(c in file_pattern for c in "?["):
+                # prefix*suffix over a large bucket: compare every name in C
+                names = np.array([os.path.basename(f) for f in candidates], dtype=str)
+                mask = np.char.startswith(names, prefix) & np.char.endswith(names, suffix)
+                mask &= np.char.str_len(names) >= len(prefix) + len(suffix)
+                count = int(mask.sum())
+            else:
+                count = count_glob_matches(candidates, file_pattern)
+            self._glob_counts[file_pattern] = count
+        return count
+    
+    def _count_regex(self, ext: Optional[str], pattern: "re.Pattern") -> int:
+        """Count cached paths matched by a compiled pattern
+        
+        A pattern anchored to a file extension can only match files in that
+        extension's bucket, so only those are searched; a bare ``\\.ext$`` is
+        just the bucket size.
+        """
+        count = self._regex_counts.get(pattern)
+        if count is None:
+            if ext is None:
+                candidates = self._files
+            else:
+                candidates = self._by_ext.get(ext, ())
+            if ext is not None and pattern.pattern == "\\" + ext + "$":
+                count = len(candidates)
+            else:
+                count = count_regex_matches(candidates, pattern)
+            self._regex_counts[pattern] = count
+        return count
     
-    def detect_languages(self) -> Dict[str, float]:
-        """Detect programming languages and confidence scores"""
+    def detect_languages(self, top_n: Optional[int] = None) -> Dict[str, float]:
+        """Detect programming languages and confidence scores
+        
+        With ``top_n``, stop once that many languages have the maximum score:
+        scores are capped at 1.0 and ties keep definition order, so no later
+        language could enter the top ``top_n``.
+        """
         language_scores = {}
+        # Normalize scores based on repository size
+        denominator = max(self._n_files * 0.1, 1)
+        saturated = 0
         
         for lang, indicators in self.LANGUAGE_INDICATORS.items():
             score = 0.0
@@ -178,47 +492,59 @@ class RepositoryAnalyzer:
             for file_pattern in indicators["files"]:
                 if "*" in file_pattern:
                     # Glob pattern
-                    pattern = file_pattern.replace("*", "")
-                    matching_files = [f for f in self._file_cache.keys() if pattern in f]
-                    if matching_files:
-                        score += len(matching_files) * 0.3
-                        matches += len(matching_files)
+                    matching_files = self._count_glob(file_pattern)
+                    score += matching_files * 0.3
+                    matches += matching_files
                 else:
                     # Exact match
-                    if file_pattern in self._file_cache:
+                    if file_pattern in self._basenames:
                         score += 1.0
                         matches += 1
             
             # Check for directories
             for dir_name in indicators["dirs"]:
-                if f"{dir_name}/" in self._file_cache:
+                if f"{dir_name}/" in self._files:
                     score += 0.5
                     matches += 1
             
             # Check patterns with regex
-            for pattern in indicators["patterns"]:
-                matching_files = [f for f in self._file_cache.keys() if re.search(pattern, f)]
-                if matching_files:
-                    score += len(matching_files) * 0.2
-                    matches += len(matching_files)
+            for ext, pattern in self._LANGUAGE_PATTERNS[lang]:
+                matching_files = self._count_regex(ext, pattern)
+                score += matching_files * 0.2
+                matches += matching_files
             
             if matches > 0:
-                # Normalize score based on repository size
-                total_files = len([f for f in self._file_cache.keys() if not f.endswith("/")])
-                normalized_score = min(score / max(total_files * 0.1, 1), 1.0)
+                normalized_score = min(score / denominator, 1.0)
                 language_scores[lang] = normalized_score
+                
+                if normalized_score >= 1.0:
+                    saturated += 1
+                    if top_n is not None and saturated >= top_n:
+                        break
         
         return language_scores
     
-    def detect_frameworks(self, languages: List[str]) -> Dict[str, float]:
-        """Detect frameworks for detected languages"""
+    def detect_frameworks(self, languages: List[str], deps_by_lang: Optional[Dict[str, List[str]]] = None) -> Dict[str, float]:
+        """Detect frameworks for detected languages
+        
+        ``deps_by_lang`` is extract_dependencies(languages) when the caller already has it.
+        """
         framework_scores = {}
+        # Dependencies don't depend on the framework; parse the manifests once up front
+        if deps_by_lang is None:
+            deps_by_lang = self.extract_dependencies(languages)
         
         for lang in languages:
             if lang not in self.FRAMEWORK_INDICATORS:
                 continue
                 
             lang_frameworks = self.FRAMEWORK_INDICATORS[lang]
+            # Frameworks named by a dependency, found with one pass over the dependency list
+            dep_frameworks = {
+                self._DEP_TO_FRAMEWORK[(lang, dep.lower())]
+                for dep in deps_by_lang.get(lang, ())
+                if (lang, dep.lower()) in self._DEP_TO_FRAMEWORK
+            }
             
             for framework, indicators in lang_frameworks.items():
                 score = 0.0
@@ -227,29 +553,24 @@ class RepositoryAnalyzer:
                 for indicator in indicators:
                     if "/" in indicator:
                         # Directory indicator
-                        if indicator in self._file_cache or f"{indicator}/" in self._file_cache:
+                        if indicator in self._files or f"{indicator}/" in self._files:
                             score += 1.0
                             matches += 1
                     elif "*" in indicator:
                         # Pattern indicator
-                        pattern = indicator.replace("*", "")
-                        matching_files = [f for f in self._file_cache.keys() if pattern in f]
-                        if matching_files:
-                            score += len(matching_files) * 0.5
-                            matches += len(matching_files)
+                        matching_files = self._count_glob(indicator)
+                        score += matching_files * 0.5
+                        matches += matching_files
                     else:
                         # Exact file match
-                        if indicator in self._file_cache:
+                        if indicator in self._basenames:
                             score += 1.0
                             matches += 1
                 
                 # Also check dependencies for framework presence
-                dependencies = self.extract_dependencies([lang])
-                if lang in dependencies:
-                    lang_deps = [dep.lower() for dep in dependencies[lang]]
-                    if framework.lower() in lang_deps:
-                        score += 2.0  # Strong indicator from dependencies
-                        matches += 1
+                if framework in dep_frameworks:
+                    score += 2.0  # Strong indicator from dependencies
+                    matches += 1
                 
                 if matches > 0:
                     framework_scores[f"{lang}:{framework}"] = min(score / max(len(indicators), 1), 1.0)
@@ -266,16 +587,14 @@ class RepositoryAnalyzer:
             for indicator in indicators:
                 if "/" in indicator:
                     # Directory indicator
-                    if indicator in self._file_cache or f"{indicator}/" in self._file_cache:
+                    if indicator in self._files or f"{indicator}/" in self._files:
                         score += 1.0
                 elif "*" in indicator:
                     # Pattern indicator
-                    pattern = indicator.replace("*", "")
-                    matching_files = [f for f in self._file_cache.keys() if pattern in f]
-                    score += len(matching_files) * 0.3
+                    score += self._count_glob(indicator) * 0.3
                 else:
                     # Exact file match
-                    if indicator in self._file_cache:
+                    if indicator in self._basenames:
                         score += 1.0
             
             if score > 0:
@@ -287,6 +606,32 @@ class RepositoryAnalyzer:
     
     def extract_dependencies(self, languages: List[str]) -> Dict[str, List[str]]:
         """Extract dependencies from package files"""
+        key = frozenset(languages)
+        if key not in self._deps_cache:
+            self._deps_cache[key] = self._extract_dependencies(key)
+        return {lang: list(deps) for lang, deps in self._deps_cache[key].items()}
+    
+    def _parse_manifest(self, parser, name: str) -> List[str]:
+        """Run ``parser`` on a cached manifest, reusing the result while its mtime and size are unchanged"""
+        file_path = os.path.join(self.repo_path, name)
+        cached = self._parse_cache.get(file_path)
+        if cached is None:
+            # First parse: the walk's stat is fresh enough
+            stat = self._manifests[name]
+        else:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                return parser(file_path)
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if cached is None or cached[0] != signature:
+            cached = (signature, parser(file_path))
+            self._parse_cache[file_path] = cached
+        return cached[1]
+    
+    def _extract_dependencies(self, languages: Set[str]) -> Dict[str, List[str]]:
+        """Uncached body of extract_dependencies"""
         dependencies = {}
         
         # Python dependencies
@@ -294,40 +639,40 @@ class RepositoryAnalyzer:
             python_deps = []
             
             # requirements.txt
-            if "requirements.txt" in self._file_cache:
-                python_deps.extend(self._parse_requirements_txt(self._file_cache["requirements.txt"]))
+            if "requirements.txt" in self._manifests:
+                python_deps.extend(self._parse_manifest(self._parse_requirements_txt, "requirements.txt"))
             
             # pyproject.toml
-            if "pyproject.toml" in self._file_cache:
-                python_deps.extend(self._parse_pyproject_toml(self._file_cache["pyproject.toml"]))
+            if "pyproject.toml" in self._manifests:
+                python_deps.extend(self._parse_manifest(self._parse_pyproject_toml, "pyproject.toml"))
             
             # setup.py
-            if "setup.py" in self._file_cache:
-                python_deps.extend(self._parse_setup_py(self._file_cache["setup.py"]))
+            if "setup.py" in self._manifests:
+                python_deps.extend(self._parse_manifest(self._parse_setup_py, "setup.py"))
             
             if python_deps:
                 dependencies["python"] = python_deps[:10]  # Limit to top 10
         
         # JavaScript/Node.js dependencies
         if "javascript" in languages or "typescript" in languages:
-            if "package.json" in self._file_cache:
-                js_deps = self._parse_package_json(self._file_cache["package.json"])
+            if "package.json" in self._manifests:
+                js_deps = self._parse_manifest(self._parse_package_json, "package.json")
                 if js_deps:
                     dependencies["javascript"] = js_deps[:10]
         
         # Java dependencies
         if "java" in languages:
             java_deps = []
-            if "pom.xml" in self._file_cache:
-                java_deps.extend(self._parse_pom_xml(self._file_cache["pom.xml"]))
-            if "build.gradle" in self._file_cache:
-                java_deps.extend(self._parse_build_gradle(self._file_cache["build.gradle"]))
+            if "pom.xml" in self._manifests:
+                java_deps.extend(self._parse_manifest(self._parse_pom_xml, "pom.xml"))
+            if "build.gradle" in self._manifests:
+                java_deps.extend(self._parse_manifest(self._parse_build_gradle, "build.gradle"))
             if java_deps:
                 dependencies["java"] = java_deps[:10]
         
         # Go dependencies
-        if "go" in languages and "go.mod" in self._file_cache:
-            go_deps = self._parse_go_mod(self._file_cache["go.mod"])
+        if "go" in languages and "go.mod" in self._manifests:
+            go_deps = self._parse_manifest(self._parse_go_mod, "go.mod")
             if go_deps:
                 dependencies["go"] = go_deps[:10]
         
@@ -337,14 +682,13 @@ class RepositoryAnalyzer:
         """Parse Python requirements.txt file"""
         deps = []
         try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        # Extract package name (before ==, >=, etc.)
-                        dep = re.split(r'[>=<!]', line)[0].strip()
-                        if dep:
-                            deps.append(dep)
+            for line in _read_bytes(file_path).splitlines():
+                line = line.strip()
+                if line and not line.startswith(b'#'):
+                    # Extract package name (before ==, >=, etc.)
+                    dep = _RE_VERSION_SPEC.split(line, 1)[0].strip()
+                    if dep:
+                        deps.append(_decode(dep))
         except Exception:
             pass
         return deps
@@ -368,32 +712,53 @@ class RepositoryAnalyzer:
         """Parse Python pyproject.toml file"""
         deps = []
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                # Simple regex parsing (would be better with toml library)
-                matches = re.findall(r'"([^"]+)"', content)
-                for match in matches:
-                    if '==' in match or '>=' in match:
-                        dep = re.split(r'[>=<!]', match)[0].strip()
-                        if dep and not dep.startswith('python'):
-                            deps.append(dep)
+            if tomllib is None:
+                return self._scan_pyproject_toml(file_path)
+            
+            with open(file_path, 'rb') as f:
+                data = tomllib.load(f)
+            
+            # PEP 621 requirement strings, then Poetry's name -> constraint table
+            requirements = list(data.get('project', {}).get('dependencies', []))
+            requirements.extend(data.get('tool', {}).get('poetry', {}).get('dependencies', {}).keys())
+            for requirement in requirements:
+                dep = _REQUIREMENT_NAME_END.split(requirement.strip(), 1)[0]
+                if dep and dep != 'python':
+                    deps.append(dep)
         except Exception:
             pass
         return deps
     
+    def _scan_pyproject_toml(self, file_path: str) -> List[str]:
+        """Regex scan of pyproject.toml for interpreters without tomllib"""
+        deps = []
+        with open(file_path, 'r') as f:
+            content = f.read()
+            matches = re.findall(r'"([^"]+)"', content)
+            for match in matches:
+                if '==' in match or '>=' in match:
+                    dep = re.split(r'[>=<!]', match)[0].strip()
+                    if dep and not dep.startswith('python'):
+                        deps.append(dep)
+        return deps
+    
     def _parse_setup_py(self, file_path: str) -> List[str]:
         """Parse Python setup.py file"""
         deps = []
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                # Look for install_requires
-                match = re.search(r'install_requires\s*=\s*\[(.*?)\]', content, re.DOTALL)
-                if match:
-                    requirements_str = match.group(1)
-                    # Extract quoted strings
-                    deps = re.findall(r'"([^"]+)"', requirements_str)
-                    deps = [re.split(r'[>=<!]', dep)[0].strip() for dep in deps]
+            # ast.parse honours the source's encoding declaration when given bytes
+            tree = ast.parse(_read_bytes(file_path), filename=file_path)
+            
+            # Literal install_requires=[...] keyword, wherever setup() is called
+            for node in ast.walk(tree):
+                if (isinstance(node, ast.keyword) and node.arg == 'install_requires'
+                        and isinstance(node.value, (ast.List, ast.Tuple))):
+                    for elt in node.value.elts:
+                        if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
+                            dep = _REQUIREMENT_NAME_END.split(elt.value.strip(), 1)[0]
+                            if dep:
+                                deps.append(dep)
+                    break
         except Exception:
             pass
         return deps
@@ -402,11 +767,9 @@ class RepositoryAnalyzer:
         """Parse Java pom.xml file"""
         deps = []
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                # Simple regex to find artifactId in dependencies
-                matches = re.findall(r'<artifactId>([^<]+)</artifactId>', content)
-                deps = matches[:10]  # Limit results
+            # Simple regex to find artifactId in dependencies
+            matches = _RE_ARTIFACT_ID.findall(_read_bytes(file_path))
+            deps = [_decode(match) for match in matches[:10]]  # Limit results
         except Exception:
             pass
         return deps
@@ -415,13 +778,10 @@ class RepositoryAnalyzer:
         """Parse Java build.gradle file"""
         deps = []
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                # Look for dependency declarations
-                matches = re.findall(r'implementation\s+[\'"]([^:\'"]+)', content)
-                deps.extend(matches)
-                matches = re.findall(r'compile\s+[\'"]([^:\'"]+)', content)
-                deps.extend(matches)
+            content = _read_bytes(file_path)
+            # Look for dependency declarations
+            deps.extend(_decode(match) for match in _RE_GRADLE_IMPLEMENTATION.findall(content))
+            deps.extend(_decode(match) for match in _RE_GRADLE_COMPILE.findall(content))
         except Exception:
             pass
         return deps
@@ -430,15 +790,26 @@ class RepositoryAnalyzer:
         """Parse Go go.mod file"""
         deps = []
         try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('require'):
+            in_require = False
+            for line in _read_bytes(file_path).splitlines():
+                line = line.strip()
+                if in_require:
+                    if line == b')':
+                        in_require = False
+                        continue
+                    module = line
+                elif line.startswith(b'require'):
+                    module = line[len(b'require'):].lstrip()
+                    # "require (" opens a block; "require path version" is a single requirement
+                    if module.startswith(b'('):
+                        in_require = True
                         continue
-                    if re.match(r'^[a-zA-Z]', line):
-                        dep = line.split()[0]
-                        if '/' in dep:  # Likely a module path
-                            deps.append(dep.split('/')[-1])  # Get last part
+                else:
+                    continue
+                
+                parts = module.split()
+                if parts and not parts[0].startswith(b'//') and b'/' in parts[0]:  # Likely a module path
+                    deps.append(_decode(parts[0].rsplit(b'/', 1)[-1]))  # Get last part
         except Exception:
             pass
         return deps
@@ -446,75 +817,149 @@ class RepositoryAnalyzer:
     def get_git_info(self) -> Dict[str, str]:
         """Extract git repository information"""
         git_info = {}
+        commands = [
+            # Remote URL
+            ["git", "remote", "get-url", "origin"],
+            # Last commit hash and subject plus the refs pointing at it (for the current branch)
+            ["git", "log", "-1", "--pretty=format:%H%x00%s%x00%D"],
+        ]
         try:
-            # Get remote URL
-            result = subprocess.run(
-                ["git", "remote", "get-url", "origin"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                git_info["remote_url"] = result.stdout.strip()
+            # Both processes start at once, so the lookup costs one git startup rather than two
+            with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+                remote, last_commit = executor.map(
+                    lambda command: subprocess.run(command, cwd=self.repo_path, capture_output=True, text=True),
+                    commands
+                )
             
-            # Get current branch
-            result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                git_info["current_branch"] = result.stdout.strip()
+            if remote.returncode == 0:
+                git_info["remote_url"] = remote.stdout.strip()
             
-            # Get last commit info
-            result = subprocess.run(
-                ["git", "log", "-1", "--pretty=format:%H %s"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                parts = result.stdout.strip().split(' ', 1)
-                if len(parts) == 2:
-                    git_info["last_commit_hash"] = parts[0][:8]
-                    git_info["last_commit_message"] = parts[1]
+            if last_commit.returncode == 0:
+                parts = last_commit.stdout.strip().split('\x00', 2)
+                if len(parts) == 3:
+                    commit_hash, message, refs = parts
+                    # "HEAD -> main, origin/main"; a detached HEAD has no "HEAD -> " ref
+                    git_info["current_branch"] = next(
+                        (ref[len("HEAD -> "):] for ref in refs.split(", ") if ref.startswith("HEAD -> ")), ""
+                    )
+                    if message:
+                        git_info["last_commit_hash"] = commit_hash[:8]
+                        git_info["last_commit_message"] = message
         except Exception:
             pass
         
         return git_info
     
+    def _context_cache_path(self) -> Path:
+        """On-disk cache file for this repository's ProjectContext"""
+        digest = hashlib.sha256(self.repo_path.encode("utf-8")).hexdigest()
+        return self.CONTEXT_CACHE_DIR / f"{digest}.json"
+    
+    def _signature(self) -> Optional[List[str]]:
+        """Cheap change marker: the mtimes of the repository root, its manifests and the checked-out ref"""
+        try:
+            signature = [f"root:{os.stat(self.repo_path).st_mtime_ns}"]
+            # Manifests are usually edited in place, which leaves the root's mtime alone
+            with os.scandir(self.repo_path) as entries:
+                signature.extend(sorted(
+                    f"{entry.name}:{entry.stat().st_mtime_ns}" for entry in entries if entry.name in MANIFEST_FILES
+                ))
+        except OSError:
+            return None
+        signature.extend(git_head_markers(self.repo_path))
+        return signature
+    
+    def _load_cached_context(self, signature: List[str]) -> Optional[ProjectContext]:
+        """Return the cached ProjectContext if it was taken at ``signature``"""
+        try:
+            with open(self._context_cache_path(), 'r') as f:
+                data = json.load(f)
+            if data.get("signature") == signature:
+                return ProjectContext(**data["context"])
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        return None
+    
+    def _save_cached_context(self, signature: List[str], context: ProjectContext):
+        """Write the context snapshot atomically so readers never see a partial file"""
+        path = self._context_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in _iter_json_bytes({"signature": signature, "context": context}):
+                        f.write(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Warning: Could not cache project context: {e}")
+    
+    def invalidate(self):
+        """Drop the cached ProjectContext and re-walk the repository on next use"""
+        try:
+            self._context_cache_path().unlink()
+        except FileNotFoundError:
+            pass
+        self._reset_caches()
+    
     def analyze(self) -> ProjectContext:
         """Perform complete repository analysis"""
-        # Detect languages
-        language_scores = self.detect_languages()
-        primary_languages = [lang for lang, score in language_scores.items() if score > 0.1]
-        primary_languages.sort(key=lambda x: language_scores[x], reverse=True)
-        
-        # Detect frameworks
-        framework_scores = self.detect_frameworks(primary_languages)
-        frameworks = [fw.split(':', 1)[1] for fw, score in framework_scores.items() if score > 0.3]
-        
-        # Detect project type
-        project_type = self.detect_project_type()
-        
-        # Extract dependencies
-        dependencies = self.extract_dependencies(primary_languages)
-        
-        # Get build tools, testing frameworks, etc.
-        build_tools = self._detect_build_tools()
-        testing_frameworks = self._detect_testing_frameworks()
-        package_managers = self._detect_package_managers()
-        
-        # Get config files
-        config_files = [f for f in self._file_cache.keys() 
-                       if any(f.endswith(ext) for ext in ['.json', '.yml', '.yaml', '.toml', '.ini', '.conf'])]
-        
-        # Get git info
-        git_info = self.get_git_info()
+        # Reuse the last analysis while the repository root, manifests and checked-out ref are untouched
+        # A missing or unreadable root has no signature and is never snapshotted
+        signature = self._signature()
+        if signature is None:
+            return self._analyze()
+        cached = self._load_cached_context(signature)
+        if cached is not None:
+            return cached
         
-        # Calculate confidence score
-        confidence_score = self._calculate_confidence(language_scores, framework_scores)
+        context = self._analyze()
+        self._save_cached_context(signature, context)
+        return context
+    
+    def _analyze(self) -> ProjectContext:
+        """Uncached body of analyze"""
+        # Git subprocesses and manifest reads release the GIL, so they run on a pool
+        # while the pattern matching over the (read-only) file cache stays on this thread
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            git_future = executor.submit(self.get_git_info)
+            
+            # Detect languages
+            # Only the top three languages are reported
+            language_scores = self.detect_languages(top_n=3)
+            primary_languages = [lang for lang, score in language_scores.items() if score > 0.1]
+            primary_languages.sort(key=lambda x: language_scores[x], reverse=True)
+            
+            # Extract dependencies, build tools, testing frameworks, etc.
+            dependencies_future = executor.submit(self.extract_dependencies, primary_languages)
+            build_tools_future = executor.submit(self._detect_build_tools)
+            testing_future = executor.submit(self._detect_testing_frameworks)
+            package_managers_future = executor.submit(self._detect_package_managers)
+            
+            # Detect frameworks from the same dependencies rather than parsing the manifests again
+            dependencies = dependencies_future.result()
+            framework_scores = self.detect_frameworks(primary_languages, dependencies)
+            frameworks = [fw.split(':', 1)[1] for fw, score in framework_scores.items() if score > 0.3]
+            
+            # Detect project type
+            project_type = self.detect_project_type()
+            
+            # Get config files
+            # Already bucketed by extension during the walk. Sorted, since only the first few are kept
+            config_files = sorted(f for ext in CONFIG_EXTENSIONS for f in self._by_ext.get(ext, ()))
+            
+            # Calculate confidence score
+            confidence_score = self._calculate_confidence(language_scores, framework_scores)
+            
+            build_tools = build_tools_future.result()
+            testing_frameworks = testing_future.result()
+            package_managers = package_managers_future.result()
+            git_info = git_future.result()
         
         return ProjectContext(
             repo_path=self.repo_path,
@@ -533,26 +978,14 @@ class RepositoryAnalyzer:
     def _detect_build_tools(self) -> List[str]:
         """Detect build tools in the repository"""
         tools = []
-        indicators = {
-            "webpack": ["webpack.config.js", "webpack.config.ts"],
-            "vite": ["vite.config.js", "vite.config.ts"],
-            "rollup": ["rollup.config.js"],
-            "gulp": ["gulpfile.js"],
-            "grunt": ["Gruntfile.js"],
-            "make": ["Makefile"],
-            "cmake": ["CMakeLists.txt"],
-            "docker": ["Dockerfile", "docker-compose.yml"],
-            "terraform": ["*.tf"],
-        }
         
-        for tool, files in indicators.items():
+        for tool, files in self.BUILD_TOOL_INDICATORS.items():
             for file_pattern in files:
                 if "*" in file_pattern:
-                    pattern = file_pattern.replace("*", "")
-                    if any(pattern in f for f in self._file_cache.keys()):
+                    if self._count_glob(file_pattern):
                         tools.append(tool)
                         break
-                elif file_pattern in self._file_cache:
+                elif file_pattern in self._basenames:
                     tools.append(tool)
                     break
         
@@ -561,29 +994,18 @@ class RepositoryAnalyzer:
     def _detect_testing_frameworks(self) -> List[str]:
         """Detect testing frameworks"""
         frameworks = []
-        indicators = {
-            "pytest": ["pytest.ini", "conftest.py"],
-            "unittest": ["test_*.py"],
-            "jest": ["jest.config.js"],
-            "mocha": ["mocha.opts", ".mocharc.json"],
-            "jasmine": ["jasmine.json"],
-            "junit": ["src/test/java/"],
-            "nunit": ["*.Tests.csproj"],
-            "go-test": ["*_test.go"],
-        }
         
-        for framework, files in indicators.items():
+        for framework, files in self.TESTING_FRAMEWORK_INDICATORS.items():
             for file_pattern in files:
                 if "*" in file_pattern:
-                    pattern = file_pattern.replace("*", "")
-                    if any(pattern in f for f in self._file_cache.keys()):
+                    if self._count_glob(file_pattern):
                         frameworks.append(framework)
                         break
                 elif "/" in file_pattern:
-                    if f"{file_pattern}" in self._file_cache:
+                    if f"{file_pattern}" in self._files:
                         frameworks.append(framework)
                         break
-                elif file_pattern in self._file_cache:
+                elif file_pattern in self._basenames:
                     frameworks.append(framework)
                     break
         
@@ -608,7 +1030,7 @@ class RepositoryAnalyzer:
         }
         
         for manager, files in indicators.items():
-            if any(f in self._file_cache for f in files):
+            if any(f in self._files for f in files):
                 managers.append(manager)
         
         return managers
@@ -626,6 +1048,9 @@ class RepositoryAnalyzer:
         framework_boost = 0.1 if framework_scores else 0.0
         
         # Boost confidence if we have config files
-        config_boost = 0.05 if len(self._file_cache) > 5 else 0.0
+        config_boost = 0.05 if len(self._files) > 5 else 0.0
+        
+        # A walk cut off at max_files saw only part of the repository
+        truncation_penalty = 0.1 if self._truncated else 0.0
         
-        return min(max_lang_score + framework_boost + config_boost, 1.0)
\ No newline at end of file
+        return max(min(max_lang_score + framework_boost + config_boost, 1.0) - truncation_penalty, 0.0)
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Per-file matching loops for repository persona detection
+
+Kept free of dynamic features so the module can be compiled with mypyc
+(``LUMOS_MYPYC=1 pip install .``); uncompiled it runs as plain Python.
+"""
+
+import fnmatch
+import posixpath
+from typing import Iterable, Pattern
+
+def count_glob_matches(paths: Iterable[str], file_pattern: str) -> int:
+    """Count relative paths whose base name matches ``file_pattern``"""
+    count = 0
+    for path in paths:
+        if fnmatch.fnmatchcase(posixpath.basename(path), file_pattern):
+            count += 1
+    return count
+
+def count_regex_matches(paths: Iterable[str], pattern: Pattern[str]) -> int:
+    """Count paths in which ``pattern`` finds a match"""
+    search = pattern.search
+    count = 0
+    for path in paths:
+        if search(path) is not None:
+            count += 1
+    return count
@@ -2,262 +2,421 @@
 
 import os
 import json
+import atexit
 import time
+import glob
+import hashlib
+import itertools
+import tempfile
+import weakref
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-from .persona import RepositoryAnalyzer, ProjectContext
+from .persona import RepositoryAnalyzer, ProjectContext, MANIFEST_FILES, git_head_markers
 from .history import HistoryManager
 
+# Cache entries are (de)serialized as bytes. msgpack is preferred, then orjson (both are in
+# the "performance" extra), then the standard library
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+    
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    
+    _json_loads = json.loads
+
+try:
+    import msgpack
+    
+    _dumps = msgpack.packb
+    
+    def _loads(data: bytes) -> Any:
+        # Entries written before msgpack was installed are JSON objects
+        if data[:1] == b"{":
+            return _json_loads(data)
+        return msgpack.unpackb(data, raw=False)
+    
+    _ENTRY_SUFFIX = ".msgpack"
+except ImportError:
+    _dumps = _json_dumps
+    _loads = _json_loads
+    _ENTRY_SUFFIX = ".json"
+
+# Static prompt tables; the guideline bullet lists are rendered once at import
+_COMMAND_INSTRUCTIONS = {
+    "plan": "Break down goals into step-by-step actionable tasks. Consider the project's architecture and existing patterns. Provide specific file paths and implementation details.",
+    
+    "edit": "Modify the provided code according to the user's instructions. Return ONLY the complete updated file content as raw code - no markdown blocks, no explanations, no comments about changes. The response must be directly writable to a file. Maintain existing code style and patterns.",
+    
+    "review": "Analyze the code for bugs, security issues, performance problems, and adherence to best practices. Provide specific, actionable feedback with line numbers when possible.",
+    
+    "debug": "Identify the root cause of the issue and provide a clear solution. Consider the project's dependencies and common patterns. Explain why the issue occurs.",
+    
+    "chat": "Provide helpful, context-aware responses. Reference the project's structure, dependencies, and patterns when relevant. Ask clarifying questions if needed.",
+    
+    "scaffold": "Help create well-structured project templates following best practices for the detected technology stack.",
+    
+    "general": "Provide helpful assistance tailored to this project's technology stack and structure."
+}
+_DEFAULT_INSTRUCTION = _COMMAND_INSTRUCTIONS["general"]
+
+_LANGUAGE_RULES = {
+    "python": [
+        "Follow PEP 8 style guidelines",
+        "Use type hints for function parameters and return values",
+        "Write clear docstrings (Google or NumPy style)",
+        "Use f-strings for string formatting",
+        "Handle exceptions appropriately with specific exception types"
+    ],
+    "javascript": [
+        "Use modern ES6+ syntax (const/let, arrow functions, destructuring)",
+        "Use async/await instead of promise chains where appropriate",
+        "Add JSDoc comments for functions and classes",
+        "Use strict equality (===) comparisons",
+        "Handle errors with try-catch blocks"
+    ],
+    "typescript": [
+        "Use explicit type annotations where beneficial",
+        "Define interfaces for object shapes",
+        "Use generics for reusable components",
+        "Enable strict mode in tsconfig.json",
+        "Use utility types (Partial, Pick, Omit) appropriately"
+    ],
+    "java": [
+        "Follow Java naming conventions (camelCase, PascalCase)",
+        "Use appropriate access modifiers (private, protected, public)",
+        "Handle exceptions with try-catch-finally",
+        "Use generics for type safety",
+        "Follow SOLID principles"
+    ],
+    "csharp": [
+        "Follow C# naming conventions (PascalCase for public members)",
+        "Use properties instead of public fields",
+        "Implement IDisposable for resource management",
+        "Use LINQ for data operations",
+        "Add XML documentation comments"
+    ],
+    "go": [
+        "Follow Go naming conventions (exported vs unexported)",
+        "Handle errors explicitly",
+        "Use gofmt for code formatting",
+        "Keep functions small and focused",
+        "Use interfaces effectively"
+    ]
+}
+
+_FRAMEWORK_RULES = {
+    "django": [
+        "Follow Django's MVT (Model-View-Template) pattern",
+        "Use Django's built-in authentication and permissions",
+        "Implement proper URL routing in urls.py",
+        "Use Django ORM for database operations",
+        "Follow Django's security best practices"
+    ],
+    "flask": [
+        "Use blueprints for organizing larger applications",
+        "Implement proper error handling with error handlers",
+        "Use Flask-SQLAlchemy for database operations",
+        "Follow RESTful API design principles",
+        "Use environment variables for configuration"
+    ],
+    "fastapi": [
+        "Use Pydantic models for request/response validation",
+        "Implement async/await for I/O operations",
+        "Use dependency injection for shared logic",
+        "Add comprehensive OpenAPI documentation",
+        "Implement proper error handling with HTTPException"
+    ],
+    "react": [
+        "Use functional components with hooks",
+        "Implement proper state management (useState, useContext, Redux)",
+        "Follow component composition patterns",
+        "Use React.memo for performance optimization",
+        "Implement proper error boundaries"
+    ],
+    "express": [
+        "Use middleware for cross-cutting concerns",
+        "Implement proper error handling middleware",
+        "Use routers to organize routes",
+        "Implement proper request validation",
+        "Follow RESTful API design principles"
+    ],
+    "spring": [
+        "Use dependency injection with @Autowired",
+        "Follow Spring Boot conventions",
+        "Use proper annotations (@Service, @Repository, @Controller)",
+        "Implement proper exception handling",
+        "Use Spring Security for authentication"
+    ]
+}
+
+def _render_guidelines(rules: Dict[str, List[str]]) -> Dict[str, str]:
+    """Render each entry as a "• Name:" heading over its "  - rule" bullets"""
+    return {
+        name: f"• {name.title()}:\n" + "".join(f"  - {rule}\n" for rule in name_rules) + "\n"
+        for name, name_rules in rules.items()
+    }
+
+_LANGUAGE_GUIDELINES = _render_guidelines(_LANGUAGE_RULES)
+_FRAMEWORK_GUIDELINES = _render_guidelines(_FRAMEWORK_RULES)
+
+# Managers still alive; a single exit hook flushes them without keeping any of them alive
+_live_managers = weakref.WeakSet()
+
+def _flush_live_managers():
+    """Retry failed cache writes of every manager that is still alive"""
+    for manager in list(_live_managers):
+        manager.flush()
+
+atexit.register(_flush_live_managers)
+
 class PersonaManager:
     """Manages repository-aware personas and system prompts"""
     
+    # Generated system prompts kept per (context fingerprint, command)
+    PROMPT_CACHE_SIZE = 64
+    PROMPT_CACHE_TTL = 300  # seconds
+    
     def __init__(self, cache_duration_hours: int = 24):
         self.cache_duration = timedelta(hours=cache_duration_hours)
-        self.cache_file = ".lumos_persona_cache.json"
+        # One JSON file per repository, so saving a context rewrites only that entry
+        self.cache_dir = ".lumos_persona_cache"
+        # Entries read or written this session, held in their JSON-ready on-disk form;
+        # others are loaded on first access
         self._context_cache = {}
-        self._load_cache()
+        # Parsed entry timestamps for freshness checks
+        self._timestamp_cache = {}
+        # ProjectContext objects already built from an entry, returned as-is on later hits
+        self._object_cache = {}
+        # Entries whose last write failed; flush() retries them, at the latest on exit
+        self._dirty = set()
+        _live_managers.add(self)
+        # (fingerprint, command) -> (expiry, prompt), least recently used first
+        self._prompt_cache = OrderedDict()
     
-    def _load_cache(self):
-        """Load cached project contexts from disk"""
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                    
-                    # Convert timestamps back to datetime objects
-                    for repo_path, data in cache_data.items():
-                        if 'timestamp' in data:
-                            data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-                    
-                    self._context_cache = cache_data
-        except Exception as e:
-            print(f"Warning: Could not load persona cache: {e}")
-            self._context_cache = {}
+    def _entry_path(self, repo_path: str) -> str:
+        """Cache file holding one repository's entry"""
+        digest = hashlib.blake2b(repo_path.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}{_ENTRY_SUFFIX}")
+    
+    def _legacy_entry_path(self, repo_path: str) -> Optional[str]:
+        """JSON cache file an entry was written to before msgpack was available"""
+        if _ENTRY_SUFFIX == ".json":
+            return None
+        return os.path.splitext(self._entry_path(repo_path))[0] + ".json"
     
-    def _save_cache(self):
-        """Save project contexts to disk cache"""
+    def _entry_files(self) -> List[str]:
+        """All entry files in the cache directory, in either format"""
+        return [path for suffix in (".json", ".msgpack")
+                for path in glob.glob(os.path.join(self.cache_dir, f"*{suffix}"))]
+    
+    def _read_entry_file(self, path: str) -> Dict[str, Any]:
+        """Read one cache file as stored"""
+        with open(path, 'rb') as f:
+            return _loads(f.read())
+    
+    def _load_entry(self, repo_path: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a repository, reading it from disk on first access"""
+        if repo_path not in self._context_cache:
+            path = self._entry_path(repo_path)
+            legacy_path = None
+            if not os.path.exists(path):
+                legacy_path = self._legacy_entry_path(repo_path)
+                if legacy_path is None or not os.path.exists(legacy_path):
+                    return None
+                path = legacy_path
+            try:
+                data = self._read_entry_file(path)
+                if 'timestamp' in data:
+                    self._timestamp_cache[repo_path] = datetime.fromisoformat(data['timestamp'])
+                self._context_cache[repo_path] = data
+            except Exception as e:
+                print(f"Warning: Could not load persona cache: {e}")
+                return None
+            if legacy_path is not None:
+                # Convert the entry once; the JSON file is only removed after the rewrite succeeds
+                self._save_entry(repo_path)
+                if repo_path not in self._dirty:
+                    try:
+                        os.remove(legacy_path)
+                    except OSError:
+                        pass
+        return self._context_cache[repo_path]
+    
+    def _save_entry(self, repo_path: str):
+        """Atomically write one repository's entry to the disk cache"""
+        data = self._context_cache[repo_path]
+        path = self._entry_path(repo_path)
         try:
-            # Convert datetime objects to ISO strings for JSON serialization
-            cache_data = {}
-            for repo_path, data in self._context_cache.items():
-                cache_data[repo_path] = data.copy()
-                if 'timestamp' in cache_data[repo_path]:
-                    cache_data[repo_path]['timestamp'] = cache_data[repo_path]['timestamp'].isoformat()
-            
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(_dumps(data))
+                    # Make the contents durable before the rename publishes them
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._dirty.discard(repo_path)
         except Exception as e:
+            self._dirty.add(repo_path)
             print(f"Warning: Could not save persona cache: {e}")
     
+    def flush(self):
+        """Retry any cache entries that could not be written"""
+        if not self._dirty:
+            return
+        for repo_path in list(self._dirty):
+            if repo_path in self._context_cache:
+                self._save_entry(repo_path)
+            else:
+                self._dirty.discard(repo_path)
+    
+    def _repo_signature(self, repo_path: str) -> Optional[str]:
+        """Digest of the repository's top-level entry names and its manifests' and checked-out ref's mtimes"""
+        try:
+            parts = []
+            with os.scandir(repo_path) as entries:
+                for entry in entries:
+                    if entry.name in MANIFEST_FILES:
+                        parts.append(f"{entry.name}:{entry.stat().st_mtime_ns}")
+                    else:
+                        parts.append(entry.name)
+            parts.extend(git_head_markers(repo_path))
+        except OSError:
+            return None
+        parts.sort()
+        return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _context_object(self, repo_path: str, cached_data: Dict[str, Any]) -> ProjectContext:
+        """ProjectContext for a cache entry, reconstructed from its dict only once"""
+        context = self._object_cache.get(repo_path)
+        if context is None:
+            context = ProjectContext(**cached_data['context'])
+            self._object_cache[repo_path] = context
+        return context
+    
     def get_project_context(self, repo_path: str, force_refresh: bool = False) -> ProjectContext:
         """Get project context with caching"""
         repo_path = os.path.abspath(repo_path)
+        signature = self._repo_signature(repo_path)
         
         # Check cache first
-        if not force_refresh and repo_path in self._context_cache:
-            cached_data = self._context_cache[repo_path]
-            
-            # Check if cache is still valid
-            if 'timestamp' in cached_data:
-                cache_age = datetime.now() - cached_data['timestamp']
+        cached_data = None if force_refresh else self._load_entry(repo_path)
+        if cached_data is not None:
+            # An unchanged top level and manifests keep an entry valid regardless of age;
+            # without a signature on either side, fall back to the TTL
+            cached_signature = cached_data.get('repo_signature')
+            if cached_signature is not None and signature is not None:
+                if cached_signature == signature:
+                    return self._context_object(repo_path, cached_data)
+            elif repo_path in self._timestamp_cache:
+                cache_age = datetime.now() - self._timestamp_cache[repo_path]
                 if cache_age < self.cache_duration:
-                    # Reconstruct ProjectContext from cached data
-                    context_dict = cached_data['context']
-                    return ProjectContext(**context_dict)
+                    return self._context_object(repo_path, cached_data)
         
         # Analyze repository
         print(f"[dim]Analyzing repository structure...[/dim]")
         analyzer = RepositoryAnalyzer(repo_path)
+        if force_refresh or cached_data is not None:
+            # A forced or stale entry must be re-analyzed, not served from the analyzer's own
+            # on-disk snapshot, which has no TTL
+            analyzer.invalidate()
         context = analyzer.analyze()
         
-        # Cache the result
+        # Cache the result, already in the form it is written to disk
+        timestamp = datetime.now()
+        self._timestamp_cache[repo_path] = timestamp
         self._context_cache[repo_path] = {
-            'timestamp': datetime.now(),
+            'repo_path': repo_path,
+            'timestamp': timestamp.isoformat(),
+            'repo_signature': signature,
             'context': context.to_dict()
         }
-        self._save_cache()
+        self._object_cache[repo_path] = context
+        self._save_entry(repo_path)
         
         return context
     
     def generate_system_prompt(self, context: ProjectContext, command: str = "general") -> str:
         """Generate a dynamic system prompt based on project context and command"""
+        key = (context.fingerprint(), command)
+        now = time.monotonic()
+        cached = self._prompt_cache.get(key)
+        if cached is not None and cached[0] > now:
+            self._prompt_cache.move_to_end(key)
+            return cached[1]
+        
+        prompt = self._build_system_prompt(context, command)
+        self._prompt_cache[key] = (now + self.PROMPT_CACHE_TTL, prompt)
+        self._prompt_cache.move_to_end(key)
+        if len(self._prompt_cache) > self.PROMPT_CACHE_SIZE:
+            self._prompt_cache.popitem(last=False)
+        return prompt
+    
+    def _build_system_prompt(self, context: ProjectContext, command: str) -> str:
+        """Uncached body of generate_system_prompt"""
         
-        # Base persona
-        base_prompt = "You are Lumos, an expert AI coding assistant."
+        # Base persona; sections are collected and joined once at the end
+        parts = ["You are Lumos, an expert AI coding assistant."]
         
         # Repository-specific context
         if context.primary_languages:
             languages_str = ", ".join(context.primary_languages)
-            base_prompt += f" You are working in a {languages_str} repository."
+            parts.append(f" You are working in a {languages_str} repository.")
         
         if context.project_type != "general_purpose":
             project_type_readable = context.project_type.replace("_", " ").title()
-            base_prompt += f" This is a {project_type_readable} project."
+            parts.append(f" This is a {project_type_readable} project.")
         
         if context.frameworks:
             frameworks_str = ", ".join(context.frameworks)
-            base_prompt += f" The project uses: {frameworks_str}."
+            parts.append(f" The project uses: {frameworks_str}.")
         
         # Command-specific instructions
         command_instructions = self._get_command_instructions(command, context)
         if command_instructions:
-            base_prompt += f"\n\n{command_instructions}"
+            parts.append(f"\n\n{command_instructions}")
         
         # Language-specific guidelines
         language_guidelines = self._get_language_guidelines(context.primary_languages)
         if language_guidelines:
-            base_prompt += f"\n\nLanguage Guidelines:\n{language_guidelines}"
+            parts.append(f"\n\nLanguage Guidelines:\n{language_guidelines}")
         
         # Framework-specific guidelines
         framework_guidelines = self._get_framework_guidelines(context.frameworks)
         if framework_guidelines:
-            base_prompt += f"\n\nFramework Guidelines:\n{framework_guidelines}"
+            parts.append(f"\n\nFramework Guidelines:\n{framework_guidelines}")
         
         # Project context information
         context_info = self._get_context_info(context)
         if context_info:
-            base_prompt += f"\n\nProject Context:\n{context_info}"
+            parts.append(f"\n\nProject Context:\n{context_info}")
         
         # General best practices
-        base_prompt += self._get_general_guidelines(command)
+        parts.append(self._get_general_guidelines(command))
         
-        return base_prompt
+        return "".join(parts)
     
     def _get_command_instructions(self, command: str, context: ProjectContext) -> str:
         """Get command-specific instructions"""
-        instructions = {
-            "plan": "Break down goals into step-by-step actionable tasks. Consider the project's architecture and existing patterns. Provide specific file paths and implementation details.",
-            
-            "edit": "Modify the provided code according to the user's instructions. Return ONLY the complete updated file content as raw code - no markdown blocks, no explanations, no comments about changes. The response must be directly writable to a file. Maintain existing code style and patterns.",
-            
-            "review": "Analyze the code for bugs, security issues, performance problems, and adherence to best practices. Provide specific, actionable feedback with line numbers when possible.",
-            
-            "debug": "Identify the root cause of the issue and provide a clear solution. Consider the project's dependencies and common patterns. Explain why the issue occurs.",
-            
-            "chat": "Provide helpful, context-aware responses. Reference the project's structure, dependencies, and patterns when relevant. Ask clarifying questions if needed.",
-            
-            "scaffold": "Help create well-structured project templates following best practices for the detected technology stack.",
-            
-            "general": "Provide helpful assistance tailored to this project's technology stack and structure."
-        }
-        
-        return instructions.get(command, instructions["general"])
+        return _COMMAND_INSTRUCTIONS.get(command, _DEFAULT_INSTRUCTION)
     
     def _get_language_guidelines(self, languages: List[str]) -> str:
         """Get language-specific guidelines"""
-        guidelines = []
-        
-        language_rules = {
-            "python": [
-                "Follow PEP 8 style guidelines",
-                "Use type hints for function parameters and return values",
-                "Write clear docstrings (Google or NumPy style)",
-                "Use f-strings for string formatting",
-                "Handle exceptions appropriately with specific exception types"
-            ],
-            "javascript": [
-                "Use modern ES6+ syntax (const/let, arrow functions, destructuring)",
-                "Use async/await instead of promise chains where appropriate",
-                "Add JSDoc comments for functions and classes",
-                "Use strict equality (===) comparisons",
-                "Handle errors with try-catch blocks"
-            ],
-            "typescript": [
-                "Use explicit type annotations where beneficial",
-                "Define interfaces for object shapes",
-                "Use generics for reusable components",
-                "Enable strict mode in tsconfig.json",
-                "Use utility types (Partial, Pick, Omit) appropriately"
-            ],
-            "java": [
-                "Follow Java naming conventions (camelCase, PascalCase)",
-                "Use appropriate access modifiers (private, protected, public)",
-                "Handle exceptions with try-catch-finally",
-                "Use generics for type safety",
-                "Follow SOLID principles"
-            ],
-            "csharp": [
-                "Follow C# naming conventions (PascalCase for public members)",
-                "Use properties instead of public fields",
-                "Implement IDisposable for resource management",
-                "Use LINQ for data operations",
-                "Add XML documentation comments"
-            ],
-            "go": [
-                "Follow Go naming conventions (exported vs unexported)",
-                "Handle errors explicitly",
-                "Use gofmt for code formatting",
-                "Keep functions small and focused",
-                "Use interfaces effectively"
-            ]
-        }
-        
-        for lang in languages:
-            if lang in language_rules:
-                guidelines.append(f"• {lang.title()}:")
-                for rule in language_rules[lang]:
-                    guidelines.append(f"  - {rule}")
-                guidelines.append("")
-        
-        return "\n".join(guidelines).strip()
+        return "".join(_LANGUAGE_GUIDELINES.get(lang, "") for lang in languages).strip()
     
     def _get_framework_guidelines(self, frameworks: List[str]) -> str:
         """Get framework-specific guidelines"""
-        guidelines = []
-        
-        framework_rules = {
-            "django": [
-                "Follow Django's MVT (Model-View-Template) pattern",
-                "Use Django's built-in authentication and permissions",
-                "Implement proper URL routing in urls.py",
-                "Use Django ORM for database operations",
-                "Follow Django's security best practices"
-            ],
-            "flask": [
-                "Use blueprints for organizing larger applications",
-                "Implement proper error handling with error handlers",
-                "Use Flask-SQLAlchemy for database operations",
-                "Follow RESTful API design principles",
-                "Use environment variables for configuration"
-            ],
-            "fastapi": [
-                "Use Pydantic models for request/response validation",
-                "Implement async/await for I/O operations",
-                "Use dependency injection for shared logic",
-                "Add comprehensive OpenAPI documentation",
-                "Implement proper error handling with HTTPException"
-            ],
-            "react": [
-                "Use functional components with hooks",
-                "Implement proper state management (useState, useContext, Redux)",
-                "Follow component composition patterns",
-                "Use React.memo for performance optimization",
-                "Implement proper error boundaries"
-            ],
-            "express": [
-                "Use middleware for cross-cutting concerns",
-                "Implement proper error handling middleware",
-                "Use routers to organize routes",
-                "Implement proper request validation",
-                "Follow RESTful API design principles"
-            ],
-            "spring": [
-                "Use dependency injection with @Autowired",
-                "Follow Spring Boot conventions",
-                "Use proper annotations (@Service, @Repository, @Controller)",
-                "Implement proper exception handling",
-                "Use Spring Security for authentication"
-            ]
-        }
-        
-        for framework in frameworks:
-            if framework in framework_rules:
-                guidelines.append(f"• {framework.title()}:")
-                for rule in framework_rules[framework]:
-                    guidelines.append(f"  - {rule}")
-                guidelines.append("")
-        
-        return "\n".join(guidelines).strip()
+        return "".join(_FRAMEWORK_GUIDELINES.get(framework, "") for framework in frameworks).strip()
     
     def _get_context_info(self, context: ProjectContext) -> str:
         """Get formatted project context information"""
@@ -307,20 +466,25 @@ General Guidelines:
 • Avoid code duplication (DRY principle)"""
     
     def get_enhanced_messages(self, messages: List[Dict[str, str]], 
-                            context: ProjectContext, command: str = "general") -> List[Dict[str, str]]:
-        """Add system prompt to message list if not present"""
+                            context: ProjectContext, command: str = "general",
+                            strict: bool = False) -> List[Dict[str, str]]:
+        """Add system prompt to message list if not present
+        
+        A system message is expected first; with strict=True the whole history
+        is searched before a prompt is prepended.
+        """
         if not messages:
             return messages
         
         # Check if system message already exists
-        has_system = any(msg.get("role") == "system" for msg in messages)
+        has_system = messages[0].get("role") == "system"
+        if not has_system and strict:
+            has_system = any(msg.get("role") == "system" for msg in messages)
         
         if not has_system:
             # Generate and prepend system prompt
             system_prompt = self.generate_system_prompt(context, command)
-            enhanced_messages = [{"role": "system", "content": system_prompt}]
-            enhanced_messages.extend(messages)
-            return enhanced_messages
+            return [{"role": "system", "content": system_prompt}, *messages]
         
         return messages
     
@@ -328,27 +492,61 @@ General Guidelines:
         """Invalidate persona cache for a repository or all repositories"""
         if repo_path:
             repo_path = os.path.abspath(repo_path)
-            if repo_path in self._context_cache:
-                del self._context_cache[repo_path]
+            self._context_cache.pop(repo_path, None)
+            self._timestamp_cache.pop(repo_path, None)
+            self._object_cache.pop(repo_path, None)
+            self._dirty.discard(repo_path)
+            paths = [self._entry_path(repo_path)]
+            legacy_path = self._legacy_entry_path(repo_path)
+            if legacy_path is not None:
+                paths.append(legacy_path)
         else:
             self._context_cache.clear()
-        
-        self._save_cache()
+            self._timestamp_cache.clear()
+            self._object_cache.clear()
+            self._dirty.clear()
+            paths = self._entry_files()
+        
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Warning: Could not remove persona cache entry: {e}")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
+        # Entries held in memory carry their own timestamp, including ones not written yet;
+        # the rest are dated by their file's mtime rather than by reading them
+        loaded = set()
+        for repo_path in self._timestamp_cache:
+            loaded.add(self._entry_path(repo_path))
+            loaded.add(self._legacy_entry_path(repo_path))
+        unloaded = []
+        for path in self._entry_files():
+            if path in loaded:
+                continue
+            try:
+                unloaded.append(datetime.fromtimestamp(os.stat(path).st_mtime))
+            except OSError:
+                pass
+        
         stats = {
-            "cached_repositories": len(self._context_cache),
-            "cache_file_exists": os.path.exists(self.cache_file),
+            "cached_repositories": len(self._timestamp_cache) + len(unloaded),
+            "cache_file_exists": os.path.isdir(self.cache_dir),
             "cache_duration_hours": self.cache_duration.total_seconds() / 3600
         }
         
-        if self._context_cache:
-            # Find oldest and newest cache entries
-            timestamps = [data.get('timestamp') for data in self._context_cache.values() 
-                         if data.get('timestamp')]
-            if timestamps:
-                stats["oldest_cache_entry"] = min(timestamps).isoformat()
-                stats["newest_cache_entry"] = max(timestamps).isoformat()
-        
-        return stats
\ No newline at end of file
+        # Find oldest and newest cache entries in one pass
+        oldest = newest = None
+        for timestamp in itertools.chain(self._timestamp_cache.values(), unloaded):
+            if oldest is None or timestamp < oldest:
+                oldest = timestamp
+            if newest is None or timestamp > newest:
+                newest = timestamp
+        if oldest is not None:
+            stats["oldest_cache_entry"] = oldest.isoformat()
+            stats["newest_cache_entry"] = newest.isoformat()
+        
+        return stats
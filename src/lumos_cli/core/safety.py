@@ -1,23 +1,49 @@
 """Safety and preview system for file operations"""
 
+import io
 import os
+import ast
+import stat
+import time
 import shutil
 import difflib
+import hashlib
 import tempfile
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Tuple
-from rich.console import Console
-from rich.syntax import Syntax
-from rich.panel import Panel
-from rich.prompt import Confirm
+from rich import get_console
 
-console = Console()
+# rich's global console, so this module shares terminal state with the rest of the CLI
+console = get_console()
+
+def _file_digest(file_path: str) -> str:
+    """blake2b of a file's contents"""
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "blake2b").hexdigest()
+        # Python < 3.11
+        digest = hashlib.blake2b()
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
 
 class SafeFileEditor:
     """Safe file editing with preview and backup capabilities"""
     
+    # Parse outcomes kept per content digest
+    SYNTAX_CACHE_SIZE = 128
+    # Longest diff shown in a preview, in characters
+    MAX_DIFF_CHARS = 200_000
+    
     def __init__(self, backup_dir: str = ".llm_backups"):
         self.backup_dir = backup_dir
+        # blake2b(content) -> syntax error message or None, least recently used first
+        self._syntax_cache = OrderedDict()
+        # (file name, content digest) -> backup already holding that content
+        self._backup_index = {}
+        # Nanosecond stamp of the last backup, so names stay unique within one clock tick
+        self._last_backup_ns = 0
         self._ensure_backup_dir()
     
     def _ensure_backup_dir(self):
@@ -25,35 +51,69 @@ class SafeFileEditor:
         if not os.path.exists(self.backup_dir):
             os.makedirs(self.backup_dir)
     
-    def create_backup(self, file_path: str) -> str:
-        """Create a timestamped backup of the file"""
-        if not os.path.exists(file_path):
+    def create_backup(self, file_path: str, checked: bool = False) -> str:
+        """Create a timestamped backup of the file
+        
+        checked=True skips the existence check for callers that have just stat'ed the file.
+        """
+        if not checked and not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Seconds stay readable; the nanosecond suffix keeps backups taken within a second apart
+        # and still sorts by name in creation order
+        ns = max(time.time_ns(), self._last_backup_ns + 1)
+        self._last_backup_ns = ns
+        seconds, fraction = divmod(ns, 1_000_000_000)
+        timestamp = f"{time.strftime('%Y%m%d_%H%M%S', time.localtime(seconds))}_{fraction:09d}"
         filename = os.path.basename(file_path)
         backup_name = f"{filename}.{timestamp}.bak"
         backup_path = os.path.join(self.backup_dir, backup_name)
         
-        shutil.copy2(file_path, backup_path)
+        # Unchanged content is hard-linked to its earlier backup instead of copied again
+        key = (filename, _file_digest(file_path))
+        existing = self._backup_index.get(key)
+        if existing != backup_path and os.path.lexists(backup_path):
+            # Replace, never write through, a name that may share its inode with older backups
+            os.remove(backup_path)
+        if existing and existing != backup_path and os.path.exists(existing):
+            try:
+                os.link(existing, backup_path)
+            except OSError:
+                shutil.copy2(file_path, backup_path)
+        else:
+            shutil.copy2(file_path, backup_path)
+        self._backup_index[key] = backup_path
         return backup_path
     
     def show_diff(self, original_content: str, new_content: str, file_path: str = "file"):
         """Display a colored diff between original and new content"""
-        diff_lines = list(difflib.unified_diff(
+        if original_content == new_content:
+            console.print("[dim]No changes detected[/dim]")
+            return False
+        
+        # Stream the diff into a buffer, stopping once it is too long to be worth showing
+        buffer = io.StringIO()
+        for line in difflib.unified_diff(
             original_content.splitlines(keepends=True),
             new_content.splitlines(keepends=True),
             fromfile=f"a/{file_path}",
             tofile=f"b/{file_path}",
             lineterm=""
-        ))
+        ):
+            buffer.write(line)
+            if buffer.tell() > self.MAX_DIFF_CHARS:
+                buffer.write("\n...[truncated]\n")
+                break
         
-        if not diff_lines:
+        if not buffer.tell():
             console.print("[dim]No changes detected[/dim]")
             return False
         
-        # Convert diff to string and display with syntax highlighting
-        diff_text = "".join(diff_lines)
+        # Display the diff with syntax highlighting; rich's renderables load on first preview
+        from rich.panel import Panel
+        from rich.syntax import Syntax
+        
+        diff_text = buffer.getvalue()
         
         console.print(Panel(
             Syntax(diff_text, "diff", theme="monokai", line_numbers=False),
@@ -71,11 +131,13 @@ class SafeFileEditor:
         if not content.strip():
             warnings.append("Generated content is empty")
         
-        # Check for potential encoding issues
-        try:
-            content.encode('utf-8')
-        except UnicodeEncodeError:
-            warnings.append("Content contains non-UTF-8 characters")
+        # Check for potential encoding issues; only lone surrogates fail to encode, and
+        # ASCII content (the common case) cannot contain them, so it skips the byte copy
+        if not content.isascii():
+            try:
+                content.encode('utf-8')
+            except UnicodeEncodeError:
+                warnings.append("Content contains non-UTF-8 characters")
         
         # Check file extension for syntax validation
         ext = os.path.splitext(file_path)[1].lower()
@@ -99,11 +161,29 @@ class SafeFileEditor:
         if content.strip().startswith('```') or content.strip().endswith('```'):
             warnings.append("Content appears to be wrapped in markdown code blocks")
         
+        syntax_error = self._python_syntax_error(content)
+        if syntax_error is not None:
+            warnings.append(f"Python syntax error: {syntax_error}")
+        return warnings
+    
+    def _python_syntax_error(self, content: str) -> Optional[str]:
+        """Parse content once per distinct source and remember the outcome"""
+        key = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        if key in self._syntax_cache:
+            self._syntax_cache.move_to_end(key)
+            return self._syntax_cache[key]
+        
         try:
-            compile(content, '<string>', 'exec')
+            # Parsing is enough to check grammar; no bytecode is generated
+            ast.parse(content, filename='<string>', mode='exec')
+            syntax_error = None
         except SyntaxError as e:
-            warnings.append(f"Python syntax error: {e}")
-        return warnings
+            syntax_error = str(e)
+        
+        self._syntax_cache[key] = syntax_error
+        if len(self._syntax_cache) > self.SYNTAX_CACHE_SIZE:
+            self._syntax_cache.popitem(last=False)
+        return syntax_error
     
     def _clean_markdown_blocks(self, content: str) -> str:
         """Remove markdown code blocks from content"""
@@ -137,16 +217,20 @@ class SafeFileEditor:
         return warnings
     
     def preview_and_confirm(self, file_path: str, new_content: str, 
-                          auto_confirm: bool = False) -> bool:
-        """Show preview and get user confirmation"""
+                          auto_confirm: bool = False, original_content: Optional[str] = None) -> bool:
+        """Show preview and get user confirmation
+        
+        Callers that already hold the file's current text pass it as original_content.
+        """
         
         # Read original content
-        try:
-            with open(file_path, 'r') as f:
-                original_content = f.read()
-        except FileNotFoundError:
-            original_content = ""
-            console.print(f"[yellow]Creating new file: {file_path}[/yellow]")
+        if original_content is None:
+            try:
+                with open(file_path, 'r') as f:
+                    original_content = f.read()
+            except FileNotFoundError:
+                original_content = ""
+                console.print(f"[yellow]Creating new file: {file_path}[/yellow]")
         
         # Show diff
         has_changes = self.show_diff(original_content, new_content, file_path)
@@ -168,6 +252,8 @@ class SafeFileEditor:
             return True
         
         # Get user confirmation
+        from rich.prompt import Confirm
+        
         console.print()
         return Confirm.ask(
             f"Apply changes to {file_path}?",
@@ -184,39 +270,64 @@ class SafeFileEditor:
             console.print("[yellow]⚠️  Detected and removed markdown code blocks from content[/yellow]")
             content = cleaned_content
         
-        # Create backup if file exists
-        backup_path = None
-        if os.path.exists(file_path):
-            backup_path = self.create_backup(file_path)
-            console.print(f"[dim]Backup created: {backup_path}[/dim]")
+        # Stat the target once; the result drives the preview, the backup and the new file's mode
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            file_stat = None
         
         # Preview and confirm if requested
         if preview:
-            if not self.preview_and_confirm(file_path, content, auto_confirm):
+            original_content = None
+            if file_stat is not None:
+                with open(file_path, 'r') as f:
+                    original_content = f.read()
+            if not self.preview_and_confirm(file_path, content, auto_confirm, original_content=original_content):
                 console.print("[yellow]Changes cancelled[/yellow]")
                 return False
         
+        # Create backup if file exists; only confirmed writes need one
+        if file_stat is not None:
+            backup_path = self.create_backup(file_path, checked=True)
+            console.print(f"[dim]Backup created: {backup_path}[/dim]")
+        
         try:
-            # Write the file
-            with open(file_path, 'w') as f:
-                f.write(content)
+            # Write the file atomically: the original stays intact until the new content is on disk
+            mode = stat.S_IMODE(file_stat.st_mode) if file_stat is not None else None
+            self._atomic_write(file_path, content, mode)
             
             console.print(f"[green]✅ Successfully updated {file_path}[/green]")
             return True
             
         except Exception as e:
             console.print(f"[red]❌ Error writing file: {e}[/red]")
-            
-            # Restore from backup if available
-            if backup_path and os.path.exists(backup_path):
-                try:
-                    shutil.copy2(backup_path, file_path)
-                    console.print(f"[yellow]Restored from backup[/yellow]")
-                except Exception as restore_error:
-                    console.print(f"[red]Failed to restore from backup: {restore_error}[/red]")
-            
             return False
     
+    def _atomic_write(self, file_path: str, content: str, mode: Optional[int] = None):
+        """Write content to a temporary file beside file_path, fsync it and rename it into place
+        
+        ``mode`` is the permission bits to give the file; None means a new file.
+        """
+        # Write through symlinks like open() would, rather than replacing the link itself
+        file_path = os.path.realpath(file_path)
+        directory = os.path.dirname(file_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file 0600; keep the original's mode, or the usual one for new files
+            if mode is None:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
     def list_backups(self, file_path: Optional[str] = None) -> list:
         """List available backups"""
         if not os.path.exists(self.backup_dir):
@@ -225,16 +336,18 @@ class SafeFileEditor:
         backups = []
         filename_filter = os.path.basename(file_path) if file_path else None
         
-        for backup_file in os.listdir(self.backup_dir):
-            if backup_file.endswith('.bak'):
-                if filename_filter and not backup_file.startswith(filename_filter):
+        # One scandir pass; names are filtered before anything is stat'ed
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.bak'):
+                    continue
+                if filename_filter and not entry.name.startswith(filename_filter):
                     continue
                 
-                backup_path = os.path.join(self.backup_dir, backup_file)
-                mtime = os.path.getmtime(backup_path)
+                mtime = entry.stat().st_mtime
                 backups.append({
-                    'file': backup_file,
-                    'path': backup_path,
+                    'file': entry.name,
+                    'path': entry.path,
                     'mtime': mtime,
                     'timestamp': datetime.fromtimestamp(mtime)
                 })
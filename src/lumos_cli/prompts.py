@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 PLAN_INSTRUCTION = """You are a coding assistant. Break down the goal into step-by-step actionable edits.
 Return in markdown list format."""
 
@@ -26,11 +28,16 @@ def hello():
 
 NOT a whole new file with extra classes and imports."""
 
-LANG_PROMPTS = {
+LANG_PROMPTS = MappingProxyType({
     "py": "Follow PEP8 and write clear Google-style docstrings.",
     "js": "Use modern ES6+, async/await where appropriate, and JSDoc comments.",
     "ts": "Use TypeScript types and JSDoc comments. Keep code strongly typed.",
     "go": "Ensure idiomatic Go style, use gofmt formatting, and short clear names.",
     "ps1": "Follow PowerShell Verb-Noun conventions (e.g., Get-Item).",
     "psm1": "Follow PowerShell Verb-Noun conventions and modular script style.",
-}
+})
+
+
+def get_lang_prompt(ext: str) -> str:
+    """Return the language guideline for a file extension, or "" if there is none"""
+    return LANG_PROMPTS.get(ext.lstrip(".").lower(), "")
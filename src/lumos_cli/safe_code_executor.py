@@ -4,22 +4,146 @@ Provides safe code execution with validation and rollback capabilities
 """
 
 import os
+import re
+import ast
+import asyncio
+import threading
+import hashlib
 import tempfile
 import shutil
 import json
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Final, List, Optional, Any, Set, Tuple
+from dataclasses import dataclass, replace
+from itertools import islice
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich import get_console
 
 from .huggingface_manager import get_huggingface_manager
 from .environment_manager import get_environment_manager
 from .debug_logger import debug_logger
 
-console = Console()
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional; without it one alternation regex scans the code instead
+    ahocorasick = None
+
+# rich's global console, so this module shares terminal state with the rest of the CLI
+console = get_console()
+
+# Substrings flagged by _check_security, in the order their issues are reported
+DANGEROUS_PATTERNS: Final[Tuple[str, ...]] = (
+    "exec(",
+    "eval(",
+    "os.system(",
+    "subprocess.call(",
+    "shell=True",
+    "rm -rf",
+    "del /f",
+    "rmdir /s",
+    "format(",
+    "f\"",
+    "f'",
+    "Function(",
+    "setTimeout(",
+    "setInterval("
+)
+
+def _compile_pattern_finder(patterns: Tuple[str, ...]) -> Callable[[str], Set[str]]:
+    """Build a function returning which of ``patterns`` occur in a text, found in one pass"""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            automaton.add_word(pattern, pattern)
+        automaton.make_automaton()
+        return lambda text: {pattern for _, pattern in automaton.iter(text)}
+    
+    # The lookahead matches at every position, so overlapping patterns are all reported
+    regex = re.compile("(?=(" + "|".join(map(re.escape, patterns)) + "))")
+    return lambda text: {match.group(1) for match in regex.finditer(text)}
+
+# Built once at import and shared by every SafeCodeExecutor
+_find_dangerous_patterns: Final = _compile_pattern_finder(DANGEROUS_PATTERNS)
+
+# Python lint markers, counted by _python_lint_counts when the code does not parse
+_PY_LINT_RE: Final[re.Pattern] = re.compile(
+    r"(?P<range_len>for\s+\w+\s+in\s+range\(len\()"
+    r"|(?P<append>\.\s*append\()"
+    r"|(?P<print>print\()"
+    r"|(?P<logging>logging)"
+    r"|(?P<bare_except>except\s*:)"
+    r"|(?P<def_no_hint>def\s+\w+\([^)]*\)\s*:)"
+)
+
+@lru_cache(maxsize=8)
+def _parse_python(code: str) -> Optional[ast.AST]:
+    """Parse code once for both the syntax check and the lint walk; None if it does not parse"""
+    try:
+        return ast.parse(code, filename="<string>", mode="exec")
+    except (SyntaxError, ValueError):
+        return None
+
+class _PythonLintVisitor(ast.NodeVisitor):
+    """Counts the _PY_LINT_RE markers from the syntax tree, ignoring strings and comments"""
+    
+    def __init__(self):
+        self.counts = Counter()
+    
+    def visit_For(self, node: ast.For):
+        iterator = node.iter
+        if (isinstance(iterator, ast.Call) and isinstance(iterator.func, ast.Name) and iterator.func.id == "range"
+                and len(iterator.args) == 1 and isinstance(iterator.args[0], ast.Call)
+                and isinstance(iterator.args[0].func, ast.Name) and iterator.args[0].func.id == "len"):
+            self.counts["range_len"] += 1
+        self.generic_visit(node)
+    
+    def visit_Call(self, node: ast.Call):
+        if isinstance(node.func, ast.Attribute) and node.func.attr == "append":
+            self.counts["append"] += 1
+        elif isinstance(node.func, ast.Name) and node.func.id == "print":
+            self.counts["print"] += 1
+        self.generic_visit(node)
+    
+    def visit_Name(self, node: ast.Name):
+        if node.id == "logging":
+            self.counts["logging"] += 1
+    
+    def visit_Import(self, node: ast.Import):
+        if any(alias.name.split(".")[0] == "logging" for alias in node.names):
+            self.counts["logging"] += 1
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module and node.module.split(".")[0] == "logging":
+            self.counts["logging"] += 1
+    
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        if node.type is None:
+            self.counts["bare_except"] += 1
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        if node.returns is None:
+            self.counts["def_no_hint"] += 1
+        self.generic_visit(node)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+@lru_cache(maxsize=8)
+def _python_lint_counts(code: str) -> Counter:
+    """Lint marker counts shared by the performance and best-practice checks
+    
+    Parseable code is linted with one walk of its (shared) syntax tree; code that
+    does not parse falls back to a single regex scan.
+    """
+    tree = _parse_python(code)
+    if tree is None:
+        return Counter(match.lastgroup for match in _PY_LINT_RE.finditer(code))
+    visitor = _PythonLintVisitor()
+    visitor.visit(tree)
+    return visitor.counts
 
 @dataclass
 class ExecutionResult:
@@ -45,11 +169,27 @@ class CodeValidation:
 class SafeCodeExecutor:
     """Safe code executor with validation and rollback capabilities"""
     
+    # Validation results kept per (code digest, language)
+    VALIDATION_CACHE_SIZE = 512
+    # Results kept for show_execution_history, and the output kept with each
+    HISTORY_SIZE = 200
+    HISTORY_OUTPUT_LIMIT = 4096
+    
     def __init__(self):
         self.console = console
         self.hf_manager = get_huggingface_manager()
         self.env_manager = get_environment_manager()
-        self.execution_history = []
+        self.execution_history = deque(maxlen=self.HISTORY_SIZE)
+        # (blake2b(code), language) -> CodeValidation, least recently used first
+        self._validation_cache = OrderedDict()
+        # Async requests validate on pool threads
+        self._validation_lock = threading.Lock()
+        # Pools for generate_and_execute_async, created on first use: one worker for
+        # generation and an I/O-sized pool for validation and execution
+        self._generation_pool = None
+        self._exec_pool = None
+        # The Hugging Face manager holds a single loaded model, so generations never interleave
+        self._generation_lock = threading.Lock()
         self.backup_dir = None
         self._create_backup_dir()
     
@@ -62,113 +202,195 @@ class SafeCodeExecutor:
     
     def generate_and_execute(self, prompt: str, language: str = "python", 
                            model_type: str = "general_code", 
-                           execute: bool = True) -> ExecutionResult:
-        """Generate code and optionally execute it safely"""
+                           execute: bool = True, validate: bool = True) -> ExecutionResult:
+        """Generate code and optionally execute it safely
+        
+        Validation and execution are separate stages; with execute=False and
+        validate=False the raw generated code is returned unchecked.
+        """
         
         debug_logger.log_function_call("SafeCodeExecutor.generate_and_execute", {
             "prompt": prompt,
             "language": language,
             "model_type": model_type,
-            "execute": execute
+            "execute": execute,
+            "validate": validate
         })
         
         try:
+            generated_code, error = self._generate(prompt, language, model_type)
+            if error:
+                return self._failed_result(error, language, model_type)
+            return self._validate_and_execute(generated_code, language, model_type, execute, validate)
+            
+        except Exception as e:
+            debug_logger.error(f"Generate and execute failed: {e}")
+            return self._failed_result(str(e), language, model_type)
+    
+    async def generate_and_execute_async(self, prompt: str, language: str = "python", 
+                                         model_type: str = "general_code", 
+                                         execute: bool = True, validate: bool = True) -> ExecutionResult:
+        """Async generate_and_execute whose stages pipeline across concurrent requests
+        
+        Generation holds the model for one request at a time, while validation and
+        execution run on a shared pool, so one request can generate while another executes.
+        """
+        debug_logger.log_function_call("SafeCodeExecutor.generate_and_execute_async", {
+            "prompt": prompt,
+            "language": language,
+            "model_type": model_type,
+            "execute": execute,
+            "validate": validate
+        })
+        
+        loop = asyncio.get_running_loop()
+        generation_pool, exec_pool = self._get_pools()
+        try:
+            generated_code, error = await loop.run_in_executor(
+                generation_pool, self._generate, prompt, language, model_type
+            )
+            if error:
+                return self._failed_result(error, language, model_type)
+            return await loop.run_in_executor(
+                exec_pool, self._validate_and_execute, generated_code, language, model_type, execute, validate
+            )
+            
+        except Exception as e:
+            debug_logger.error(f"Generate and execute failed: {e}")
+            return self._failed_result(str(e), language, model_type)
+    
+    def _get_pools(self) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        """Generation and execution pools shared by all async requests"""
+        if self._exec_pool is None:
+            # Queued generations wait in their own pool instead of holding execution workers
+            self._generation_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lumos-generate")
+            # Execution mostly waits on subprocesses, so the default I/O sizing applies
+            self._exec_pool = ThreadPoolExecutor(thread_name_prefix="lumos-exec")
+        return self._generation_pool, self._exec_pool
+    
+    def _generate(self, prompt: str, language: str, model_type: str) -> Tuple[Optional[str], Optional[str]]:
+        """Switch to the model and generate code; returns (code, error)"""
+        with self._generation_lock:
             # Switch to appropriate model
             if not self.hf_manager.switch_model(model_type):
-                return ExecutionResult(
-                    success=False,
-                    output="",
-                    error=f"Failed to load model: {model_type}",
-                    execution_time=0.0,
-                    language=language,
-                    model_used=model_type,
-                    validation_passed=False,
-                    warnings=[]
-                )
+                return None, f"Failed to load model: {model_type}"
             
             # Generate code
             self.console.print(f"[cyan]🤖 Generating {language} code using {model_type}...[/cyan]")
             generated_code = self.hf_manager.generate_code(prompt, language)
-            
-            if not generated_code:
-                return ExecutionResult(
-                    success=False,
-                    output="",
-                    error="Failed to generate code",
-                    execution_time=0.0,
-                    language=language,
-                    model_used=model_type,
-                    validation_passed=False,
-                    warnings=[]
-                )
-            
-            # Validate code
-            self.console.print(f"[yellow]🔍 Validating generated code...[/yellow]")
-            validation = self._validate_code(generated_code, language)
-            
-            if not validation.syntax_valid:
-                return ExecutionResult(
-                    success=False,
-                    output=generated_code,
-                    error=f"Syntax validation failed: {validation.security_issues}",
-                    execution_time=0.0,
-                    language=language,
-                    model_used=model_type,
-                    validation_passed=False,
-                    warnings=validation.best_practices
-                )
-            
-            # Execute code if requested
-            if execute:
-                self.console.print(f"[green]🚀 Executing {language} code...[/green]")
-                success, output, error = self._execute_safely(generated_code, language)
-                
-                execution_result = ExecutionResult(
-                    success=success,
-                    output=output,
-                    error=error,
-                    execution_time=0.0,  # TODO: Add timing
-                    language=language,
-                    model_used=model_type,
-                    validation_passed=validation.overall_score > 0.7,
-                    warnings=validation.best_practices
-                )
-            else:
-                execution_result = ExecutionResult(
-                    success=True,
-                    output=generated_code,
-                    error="",
-                    execution_time=0.0,
-                    language=language,
-                    model_used=model_type,
-                    validation_passed=validation.overall_score > 0.7,
-                    warnings=validation.best_practices
-                )
-            
-            # Store in history
-            self.execution_history.append(execution_result)
-            
+        
+        if not generated_code:
+            return None, "Failed to generate code"
+        return generated_code, None
+    
+    def _failed_result(self, error: str, language: str, model_type: str) -> ExecutionResult:
+        """ExecutionResult for a request that failed before validation"""
+        return ExecutionResult(
+            success=False,
+            output="",
+            error=error,
+            execution_time=0.0,
+            language=language,
+            model_used=model_type,
+            validation_passed=False,
+            warnings=[]
+        )
+    
+    def _validate_and_execute(self, generated_code: str, language: str, model_type: str, 
+                              execute: bool, validate: bool = True) -> ExecutionResult:
+        """Validate generated code, execute it if requested and record the result"""
+        if not execute and not validate:
+            # Generate-only callers get the raw code; nothing vouches for it
+            execution_result = ExecutionResult(
+                success=True,
+                output=generated_code,
+                error="",
+                execution_time=0.0,
+                language=language,
+                model_used=model_type,
+                validation_passed=False,
+                warnings=[]
+            )
+            self._record(execution_result)
             return execution_result
-            
-        except Exception as e:
-            debug_logger.error(f"Generate and execute failed: {e}")
+        
+        # Validate code; code is never executed unvalidated
+        self.console.print(f"[yellow]🔍 Validating generated code...[/yellow]")
+        validation = self._validate_code(generated_code, language)
+        
+        if not validation.syntax_valid:
             return ExecutionResult(
                 success=False,
-                output="",
-                error=str(e),
+                output=generated_code,
+                error=f"Syntax validation failed: {validation.security_issues}",
                 execution_time=0.0,
                 language=language,
                 model_used=model_type,
                 validation_passed=False,
-                warnings=[]
+                warnings=list(validation.best_practices)
+            )
+        
+        # Execute code if requested
+        if execute:
+            self.console.print(f"[green]🚀 Executing {language} code...[/green]")
+            success, output, error = self._execute_safely(generated_code, language)
+            
+            execution_result = ExecutionResult(
+                success=success,
+                output=output,
+                error=error,
+                execution_time=0.0,  # TODO: Add timing
+                language=language,
+                model_used=model_type,
+                validation_passed=validation.overall_score > 0.7,
+                warnings=list(validation.best_practices)
             )
+        else:
+            execution_result = ExecutionResult(
+                success=True,
+                output=generated_code,
+                error="",
+                execution_time=0.0,
+                language=language,
+                model_used=model_type,
+                validation_passed=validation.overall_score > 0.7,
+                warnings=list(validation.best_practices)
+            )
+        
+        # Store in history
+        self._record(execution_result)
+        
+        return execution_result
+    
+    def _record(self, execution_result: ExecutionResult):
+        """Add a result to the history; the caller still gets the full output"""
+        if len(execution_result.output) > self.HISTORY_OUTPUT_LIMIT:
+            self.execution_history.append(replace(execution_result, output=execution_result.output[:self.HISTORY_OUTPUT_LIMIT]))
+        else:
+            self.execution_history.append(execution_result)
     
     def _validate_code(self, code: str, language: str) -> CodeValidation:
-        """Validate generated code for safety and quality"""
-        security_issues = []
-        performance_issues = []
-        best_practices = []
+        """Validate generated code for safety and quality
+        
+        Regenerated snippets are common, so results are reused for identical code;
+        callers must treat the returned CodeValidation as read-only.
+        """
+        key = (hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest(), language)
+        with self._validation_lock:
+            validation = self._validation_cache.get(key)
+            if validation is not None:
+                self._validation_cache.move_to_end(key)
+                return validation
         
+        validation = self._run_validation(code, language)
+        with self._validation_lock:
+            self._validation_cache[key] = validation
+            if len(self._validation_cache) > self.VALIDATION_CACHE_SIZE:
+                self._validation_cache.popitem(last=False)
+        return validation
+    
+    def _run_validation(self, code: str, language: str) -> CodeValidation:
+        """Uncached body of _validate_code"""
         # Basic syntax validation
         syntax_valid = self._check_syntax(code, language)
         
@@ -197,8 +419,7 @@ class SafeCodeExecutor:
         """Check code syntax"""
         try:
             if language == "python":
-                compile(code, "<string>", "exec")
-                return True
+                return _parse_python(code) is not None
             elif language == "javascript":
                 # Basic JS syntax check
                 return "function" in code or "const" in code or "let" in code or "var" in code
@@ -215,27 +436,10 @@ class SafeCodeExecutor:
         """Check for security issues"""
         security_issues = []
         
-        # Common security patterns to avoid
-        dangerous_patterns = [
-            "exec(",
-            "eval(",
-            "os.system(",
-            "subprocess.call(",
-            "shell=True",
-            "rm -rf",
-            "del /f",
-            "rmdir /s",
-            "format(",
-            "f\"",
-            "f'",
-            "eval(",
-            "Function(",
-            "setTimeout(",
-            "setInterval("
-        ]
-        
-        for pattern in dangerous_patterns:
-            if pattern in code:
+        # All dangerous patterns are located in a single scan of the code
+        found = _find_dangerous_patterns(code)
+        for pattern in DANGEROUS_PATTERNS:
+            if pattern in found:
                 security_issues.append(f"Potentially dangerous pattern: {pattern}")
         
         return security_issues
@@ -246,9 +450,10 @@ class SafeCodeExecutor:
         
         # Common performance anti-patterns
         if language == "python":
-            if "for i in range(len(" in code:
+            counts = _python_lint_counts(code)
+            if counts["range_len"]:
                 performance_issues.append("Consider using enumerate() instead of range(len())")
-            if "list.append(" in code and code.count("list.append(") > 5:
+            if counts["append"] > 5:
                 performance_issues.append("Consider using list comprehension for multiple appends")
         
         return performance_issues
@@ -258,11 +463,12 @@ class SafeCodeExecutor:
         best_practices = []
         
         if language == "python":
-            if "print(" in code and "logging" not in code:
+            counts = _python_lint_counts(code)
+            if counts["print"] and not counts["logging"]:
                 best_practices.append("Consider using logging instead of print statements")
-            if "except:" in code:
+            if counts["bare_except"]:
                 best_practices.append("Use specific exception types instead of bare except")
-            if "def " in code and "->" not in code:
+            if counts["def_no_hint"]:
                 best_practices.append("Consider adding type hints to functions")
         
         return best_practices
@@ -319,6 +525,9 @@ class SafeCodeExecutor:
             self.console.print("[yellow]No execution history available[/yellow]")
             return
         
+        # Imported here so loading the executor does not pay for rich's table machinery
+        from rich.table import Table
+        
         table = Table(title="Execution History")
         table.add_column("Language", style="cyan")
         table.add_column("Model", style="green")
@@ -326,7 +535,8 @@ class SafeCodeExecutor:
         table.add_column("Validation", style="bold")
         table.add_column("Warnings", style="yellow")
         
-        for i, result in enumerate(self.execution_history[-10:]):  # Show last 10
+        recent = islice(self.execution_history, max(len(self.execution_history) - 10, 0), None)
+        for i, result in enumerate(recent):  # Show last 10
             success_icon = "✅" if result.success else "❌"
             validation_icon = "✅" if result.validation_passed else "❌"
             warnings_count = len(result.warnings)
@@ -343,6 +553,10 @@ class SafeCodeExecutor:
     
     def cleanup(self) -> None:
         """Clean up resources"""
+        if self._exec_pool is not None:
+            self._generation_pool.shutdown(wait=True)
+            self._exec_pool.shutdown(wait=True)
+            self._generation_pool = self._exec_pool = None
         self.env_manager.cleanup()
         if self.backup_dir and os.path.exists(self.backup_dir):
             shutil.rmtree(self.backup_dir)
@@ -15,12 +15,16 @@ class DebugLogger:
     def __init__(self, name: str = "lumos_debug"):
         self.name = name
         self.logger = None
+        self.enabled = False
         self._setup_logger()
     
     def _setup_logger(self):
         """Setup the debug logger with file and console output"""
         self.logger = logging.getLogger(self.name)
-        self.logger.setLevel(logging.DEBUG)
+        # LUMOS_DEBUG=0 drops DEBUG records so hot paths can skip building them
+        self.logger.setLevel(logging.INFO if os.getenv('LUMOS_DEBUG', '1') == '0' else logging.DEBUG)
+        # Checked once here so callers can guard with a plain attribute read
+        self.enabled = self.logger.isEnabledFor(logging.DEBUG)
         
         # Clear any existing handlers
         self.logger.handlers.clear()
@@ -66,25 +70,25 @@ class DebugLogger:
         
         return str(log_file)
     
-    def debug(self, message: str, **kwargs):
+    def debug(self, message: str, *args, **kwargs):
         """Log debug message"""
         if self.logger:
-            self.logger.debug(message, extra=kwargs)
+            self.logger.debug(message, *args, extra=kwargs)
     
-    def info(self, message: str, **kwargs):
+    def info(self, message: str, *args, **kwargs):
         """Log info message"""
         if self.logger:
-            self.logger.info(message, extra=kwargs)
+            self.logger.info(message, *args, extra=kwargs)
     
-    def warning(self, message: str, **kwargs):
+    def warning(self, message: str, *args, **kwargs):
         """Log warning message"""
         if self.logger:
-            self.logger.warning(message, extra=kwargs)
+            self.logger.warning(message, *args, extra=kwargs)
     
-    def error(self, message: str, **kwargs):
+    def error(self, message: str, *args, **kwargs):
         """Log error message"""
         if self.logger:
-            self.logger.error(message, extra=kwargs)
+            self.logger.error(message, *args, extra=kwargs)
     
     def log_function_call(self, func_name: str, args: dict = None, kwargs: dict = None):
         """Log function call with parameters"""
@@ -4,7 +4,14 @@
 import subprocess
 import sys
 import os
+import codecs
+import locale
+import threading
+from functools import partial
 from typing import Optional, List, Tuple
+
+if not sys.platform.startswith('win'):
+    import select
 from rich.console import Console
 from rich.prompt import Confirm, Prompt
 from rich.panel import Panel
@@ -13,6 +20,42 @@ from rich.text import Text
 
 console = Console()
 
+# Largest read from a command's output pipe
+_READ_SIZE = 1 << 16
+
+
+class _OutputStream:
+    """Decodes one output pipe's bytes, echoing each complete line as it arrives"""
+    
+    def __init__(self, style: Optional[str] = None):
+        self.style = style
+        # Same decoding as text-mode Popen, without failing on stray bytes
+        self._decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))('replace')
+        self._pending = ""
+        self._chunks = []
+    
+    def feed(self, data: bytes, final: bool = False):
+        text = self._decoder.decode(data, final).replace('\r\n', '\n')
+        if not text:
+            return
+        self._chunks.append(text)
+        lines = (self._pending + text).split('\n')
+        self._pending = lines.pop()
+        for line in lines:
+            self._echo(line)
+    
+    def finish(self) -> str:
+        """Flush any unterminated last line and return everything the stream wrote"""
+        self.feed(b"", final=True)
+        if self._pending:
+            self._echo(self._pending)
+            self._pending = ""
+        return ''.join(self._chunks)
+    
+    def _echo(self, line: str):
+        console.print(f"[{self.style}]{line}[/{self.style}]" if self.style else line)
+
+
 class ShellExecutor:
     """Handles safe execution of shell commands with user confirmation"""
     
@@ -157,44 +200,11 @@ class ShellExecutor:
                 command,
                 shell=shell,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                stderr=subprocess.PIPE
             )
             
-            stdout_lines = []
-            stderr_lines = []
-            
-            # Read output in real-time
-            while True:
-                stdout_line = process.stdout.readline()
-                stderr_line = process.stderr.readline()
-                
-                if stdout_line:
-                    stdout_lines.append(stdout_line)
-                    console.print(stdout_line.rstrip())
-                
-                if stderr_line:
-                    stderr_lines.append(stderr_line)
-                    console.print(f"[red]{stderr_line.rstrip()}[/red]")
-                
-                # Check if process is done
-                if process.poll() is not None:
-                    break
-            
-            # Get remaining output
-            remaining_stdout, remaining_stderr = process.communicate()
-            if remaining_stdout:
-                stdout_lines.append(remaining_stdout)
-                console.print(remaining_stdout)
-            if remaining_stderr:
-                stderr_lines.append(remaining_stderr)
-                console.print(f"[red]{remaining_stderr}[/red]")
-            
-            # Combine outputs
-            stdout = ''.join(stdout_lines)
-            stderr = ''.join(stderr_lines)
+            stdout, stderr = self._stream_output(process)
+            process.wait()
             
             console.print("=" * 50)
             
@@ -238,6 +248,49 @@ class ShellExecutor:
             console.print(f"[red]❌ {error_msg}[/red]")
             return False, "", error_msg
     
+    def _stream_output(self, process: subprocess.Popen) -> Tuple[str, str]:
+        """Echo stdout and stderr as they arrive, whichever has data, until both close
+        
+        Returns:
+            Tuple[str, str]: everything written to (stdout, stderr)
+        """
+        out, err = _OutputStream(), _OutputStream("red")
+        streams = {process.stdout.fileno(): out, process.stderr.fileno(): err}
+        
+        if sys.platform.startswith('win'):
+            # select() cannot wait on pipes on Windows; drain each pipe on its own thread
+            def drain(pipe, stream):
+                for data in iter(partial(pipe.read1, _READ_SIZE), b""):
+                    stream.feed(data)
+            
+            readers = [
+                threading.Thread(target=drain, args=(process.stdout, out), daemon=True),
+                threading.Thread(target=drain, args=(process.stderr, err), daemon=True),
+            ]
+            for reader in readers:
+                reader.start()
+            for reader in readers:
+                reader.join()
+        else:
+            open_fds = list(streams)
+            for fd in open_fds:
+                os.set_blocking(fd, False)
+            while open_fds:
+                ready, _, _ = select.select(open_fds, [], [])
+                for fd in ready:
+                    try:
+                        data = os.read(fd, _READ_SIZE)
+                    except BlockingIOError:
+                        continue
+                    if data:
+                        streams[fd].feed(data)
+                    else:
+                        open_fds.remove(fd)
+        
+        process.stdout.close()
+        process.stderr.close()
+        return out.finish(), err.finish()
+    
     def suggest_safe_alternatives(self, dangerous_command: str) -> List[str]:
         """Suggest safer alternatives for dangerous commands"""
         suggestions = []
@@ -0,0 +1,640 @@
+"""
+Unit tests for Neo4j .NET Client
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from neo4j import Record
+from neo4j.exceptions import TransientError, SessionExpired
+from src.lumos_cli.clients.neo4j_dotnet_client import Neo4jDotNetClient, AsyncNeo4jDotNetClient, ClassResult
+
+class TestAsyncNeo4jDotNetClient:
+    """Test cases for AsyncNeo4jDotNetClient"""
+
+    @patch('src.lumos_cli.clients.neo4j_dotnet_client.AsyncGraphDatabase.driver')
+    def test_connect_success(self, mock_driver_factory):
+        """Test successful async connection"""
+        driver = Mock()
+        driver.execute_query = AsyncMock(return_value=([{"test": 1}], None, None))
+        mock_driver_factory.return_value = driver
+
+        client = AsyncNeo4jDotNetClient("bolt://test:7687", "neo4j", "secret")
+
+        assert asyncio.run(client.connect()) is True
+
+    def test_bulk_create_runs_one_write_per_item(self):
+        """Test bulk_create issues every write and reports per-item results"""
+        client = AsyncNeo4jDotNetClient()
+        client.driver = Mock()
+        client.driver.execute_query = AsyncMock(return_value=([], None, None))
+
+        items = [{"name": f"Class{i}", "namespace": "Company.Test"} for i in range(5)]
+        results = asyncio.run(client.bulk_create(items))
+
+        assert results == [True] * 5
+        assert client.driver.execute_query.await_count == 5
+
+    def test_bulk_create_reports_failures(self):
+        """Test a failing write is reported as False without aborting the batch"""
+        client = AsyncNeo4jDotNetClient()
+        client.driver = Mock()
+        client.driver.execute_query = AsyncMock(side_effect=[([], None, None), Exception("boom")])
+
+        items = [{"name": "A", "namespace": "ns"}, {"name": "B", "namespace": "ns"}]
+        results = asyncio.run(client.bulk_create(items, "method"))
+
+        assert sorted(results) == [False, True]
+
+    def test_find_classes_using_constants_runs_concurrent_reads(self):
+        """Test each constant is looked up with its own READ-routed query, results in input order"""
+        client = AsyncNeo4jDotNetClient()
+        client.driver = Mock()
+
+        async def execute_query(query, rows, database_, routing_):
+            name = rows[0]["name"]
+            return ([(name, "Global", f"{name}User", "ns")], None, None)
+
+        client.driver.execute_query = AsyncMock(side_effect=execute_query)
+
+        results = asyncio.run(client.find_classes_using_constants([("A", "Global"), ("B", "Global")]))
+
+        assert results == [[{"class_name": "AUser", "class_namespace": "ns"}], [{"class_name": "BUser", "class_namespace": "ns"}]]
+        assert all(c[1]["routing_"] == "r" for c in client.driver.execute_query.call_args_list)
+
+
+def make_sync_client():
+    """Build a Neo4jDotNetClient whose driver hands out a single mock session"""
+    client = Neo4jDotNetClient("bolt://test:7687", "neo4j", "secret")
+    session = Mock()
+    session.__enter__ = Mock(return_value=session)
+    session.__exit__ = Mock(return_value=False)
+    session.closed.return_value = False
+    client.driver = Mock()
+    client.driver.session.return_value = session
+    client._session_factory = client.driver.session
+    return client, session
+
+class TestNeo4jDotNetClient:
+    """Test cases for Neo4jDotNetClient"""
+
+    def test_bulk_ingest_class_tree_single_round_trip(self):
+        """Test a whole class tree is written with one query"""
+        client, session = make_sync_client()
+        classes = [{
+            "name": "UserController",
+            "namespace": "Company.Controllers",
+            "type": "Controller",
+            "methods": [{"name": "GetUser", "namespace": "Company.Controllers.GetUser"}],
+            "calls_sps": [{"name": "GetUserById", "namespace": "dbo"}]
+        }]
+
+        assert client.bulk_ingest_class_tree(classes) is True
+        session.run.assert_called_once()
+        query = session.run.call_args[0][0]
+        assert "UNWIND $rows AS cl" in query
+        assert session.run.call_args[1] == {"rows": classes}
+
+    def test_bulk_ingest_class_tree_failure(self):
+        """Test a failing ingest returns False"""
+        client, session = make_sync_client()
+        session.run.side_effect = Exception("boom")
+
+        assert client.bulk_ingest_class_tree([{"name": "A", "namespace": "ns"}]) is False
+
+    @patch('src.lumos_cli.clients.neo4j_dotnet_client.GraphDatabase.driver')
+    def test_connect_creates_constraints(self, mock_driver_factory):
+        """Test connect() creates one uniqueness constraint per label, once per database"""
+        Neo4jDotNetClient._schema_ensured.clear()
+        session = Mock()
+        session.__enter__ = Mock(return_value=session)
+        session.__exit__ = Mock(return_value=False)
+        session.run.return_value.single.return_value = {"test": 1}
+        mock_driver_factory.return_value.session.return_value = session
+
+        client = Neo4jDotNetClient("bolt://test:7687", "neo4j", "secret")
+
+        assert client.connect() is True
+        ddl = [c[0][0] for c in session.run.call_args_list if c[0][0].startswith("CREATE CONSTRAINT")]
+        assert len(ddl) == len(Neo4jDotNetClient._LABELS)
+        assert all("IF NOT EXISTS" in q and "IS UNIQUE" in q for q in ddl)
+        explained = [c[0][0] for c in session.run.call_args_list if c[0][0].startswith("EXPLAIN")]
+        assert any("UNWIND $rows AS p" in q for q in explained)
+
+        # A second client for the same server skips the DDL
+        session.run.reset_mock()
+        second = Neo4jDotNetClient("bolt://test:7687", "neo4j", "secret")
+        assert second.connect() is True
+        assert not any(c[0][0].startswith("CREATE") for c in session.run.call_args_list)
+
+        # ...but a client for another database on it does not
+        other = Neo4jDotNetClient("bolt://test:7687", "neo4j", "secret", database="other")
+        assert other.connect() is True
+        assert any(c[0][0].startswith("CREATE CONSTRAINT") for c in session.run.call_args_list)
+        client.close()
+        second.close()
+        other.close()
+
+    @patch('src.lumos_cli.clients.neo4j_dotnet_client.GraphDatabase.driver')
+    def test_connect_survives_failed_controller_labelling(self, mock_driver_factory):
+        """Test a constraint violation while labelling legacy controllers does not fail connect()"""
+        Neo4jDotNetClient._schema_ensured.clear()
+        session = Mock()
+        session.__enter__ = Mock(return_value=session)
+        session.__exit__ = Mock(return_value=False)
+        result = Mock()
+        result.single.return_value = {"test": 1}
+
+        def run(query, **parameters):
+            if "SET c:Controller" in query:
+                raise Exception("ConstraintValidationFailed")
+            return result
+
+        session.run.side_effect = run
+        mock_driver_factory.return_value.session.return_value = session
+
+        client = Neo4jDotNetClient("bolt://test:7687", "neo4j", "secret")
+
+        assert client.connect() is True
+        assert any(c[0][0].startswith("EXPLAIN") for c in session.run.call_args_list)
+        client.close()
+
+    @patch('src.lumos_cli.clients.neo4j_dotnet_client.GraphDatabase.driver')
+    def test_connect_prewarms_pool(self, mock_driver_factory):
+        """Test connect() sizes the pool and opens warm-up sessions"""
+        session = Mock()
+        session.__enter__ = Mock(return_value=session)
+        session.__exit__ = Mock(return_value=False)
+        session.run.return_value.single.return_value = {"test": 1}
+        mock_driver_factory.return_value.session.return_value = session
+
+        client = Neo4jDotNetClient("bolt://test:7687", "neo4j", "secret")
+
+        assert client.connect() is True
+        assert mock_driver_factory.call_args[1]["max_connection_pool_size"] == Neo4jDotNetClient.MAX_POOL_SIZE
+        assert client._session_factory.keywords == {"database": "neo4j", "default_access_mode": "WRITE"}
+        # One session for the connection test plus one per warm-up worker
+        assert mock_driver_factory.return_value.session.call_count == 1 + Neo4jDotNetClient.PREWARM_CONNECTIONS
+        client.close()
+        assert client._executor is None
+
+    def test_relationships_are_batched_between_begin_and_commit(self):
+        """Test singular relationship calls are queued and flushed per type"""
+        client, session = make_sync_client()
+
+        client.begin_bulk()
+        assert client.create_class_has_method("C", "ns", "M1", "ns.M1") is True
+        assert client.create_class_has_method("C", "ns", "M2", "ns.M2") is True
+        assert client.create_class_calls_sp("C", "ns", "SP", "dbo") is True
+        session.run.assert_not_called()
+
+        assert client.commit_bulk() is True
+        assert session.run.call_count == 2
+        pairs_by_query = {c[0][0]: c[1]["rows"] for c in session.run.call_args_list}
+        has_method = next(p for q, p in pairs_by_query.items() if ":HAS_METHOD" in q)
+        assert [p["to_name"] for p in has_method] == ["M1", "M2"]
+
+    def test_relationship_written_immediately_outside_bulk(self):
+        """Test relationship calls still write immediately without begin_bulk()"""
+        client, session = make_sync_client()
+
+        assert client.create_sp_has_table("SP", "dbo", "Users", "dbo") is True
+        session.run.assert_called_once()
+
+    def test_explain_relationship_batch_flattens_plan(self):
+        """Test the EXPLAIN helper returns every operator in the plan tree"""
+        client, session = make_sync_client()
+        session.run.return_value.consume.return_value.plan = {
+            "operatorType": "ProduceResults@neo4j",
+            "children": [{
+                "operatorType": "Apply@neo4j",
+                "children": [
+                    {"operatorType": "NodeIndexSeek@neo4j", "children": []},
+                    {"operatorType": "NodeIndexSeek@neo4j", "children": []}
+                ]
+            }]
+        }
+
+        operators = client.explain_relationship_batch("HAS_METHOD")
+
+        assert operators.count("NodeIndexSeek@neo4j") == 2
+        assert not any(op.startswith("CartesianProduct") for op in operators)
+        assert session.run.call_args[0][0].startswith("EXPLAIN")
+
+    def test_find_controllers_calling_sp_single_query(self):
+        """Test direct and method-mediated controllers come back from one query"""
+        client, session = make_sync_client()
+        session.run.return_value = [
+            Record({"controller_name": "OrderController", "controller_namespace": "Company.Controllers"}),
+            Record({"controller_name": "UserController", "controller_namespace": "Company.Controllers"})
+        ]
+
+        controllers = client.find_controllers_calling_sp("GetUserById", "dbo")
+
+        session.run.assert_called_once()
+        assert "UNION" in session.run.call_args[0][0]
+        assert [c["controller_name"] for c in controllers] == ["OrderController", "UserController"]
+
+    def test_bulk_ingest_via_apoc_uses_periodic_iterate(self):
+        """Test APOC imports go through apoc.periodic.iterate with de-duplicated rows"""
+        client, session = make_sync_client()
+        client._has_apoc = True
+        session.run.return_value.single.return_value = {"errorMessages": {}}
+        rows = [{"name": "A", "namespace": "ns"}, {"name": "A", "namespace": "ns"}, {"name": "B", "namespace": "ns"}]
+
+        assert client.bulk_ingest_via_apoc("Class", rows) is True
+        query = session.run.call_args[0][0]
+        params = session.run.call_args[1]
+        assert "apoc.periodic.iterate" in query
+        assert len(params["rows"]) == 2
+        assert params["parallel"] is True
+
+    def test_bulk_ingest_via_apoc_falls_back_to_unwind(self):
+        """Test imports fall back to a plain UNWIND when APOC is missing"""
+        client, session = make_sync_client()
+
+        assert client.bulk_ingest_via_apoc("Table", [{"name": "Users", "namespace": "dbo"}]) is True
+        query = session.run.call_args[0][0]
+        assert query.startswith("UNWIND $rows")
+        assert "apoc" not in query
+
+    def test_bulk_ingest_via_apoc_reports_batch_errors(self):
+        """Test APOC batch errors are reported as a failed import"""
+        client, session = make_sync_client()
+        client._has_apoc = True
+        session.run.return_value.single.return_value = {"errorMessages": {"lock timeout": 1}}
+
+        assert client.bulk_ingest_via_apoc("Class", [{"name": "A", "namespace": "ns"}]) is False
+
+    def test_bulk_create_parallel_groups_by_label(self):
+        """Test items are de-duplicated and merged with one batch per label"""
+        client, session = make_sync_client()
+        items = [
+            {"label": "Class", "name": "A", "namespace": "ns"},
+            {"label": "Class", "name": "A", "namespace": "ns"},
+            {"label": "Method", "name": "M", "namespace": "ns.M"},
+            {"label": "Table", "name": "Users", "namespace": "dbo"}
+        ]
+
+        assert client.bulk_create_parallel(items, workers=2) is True
+        assert session.run.call_count == 3
+        rows_by_query = {c[0][0]: c[1]["rows"] for c in session.run.call_args_list}
+        class_rows = next(rows for q, rows in rows_by_query.items() if "n:Class" in q)
+        assert class_rows == [{"name": "A", "namespace": "ns"}]
+
+    def test_bulk_create_parallel_reports_failed_batch(self):
+        """Test a failing batch makes the whole call report failure"""
+        client, session = make_sync_client()
+        session.run.side_effect = Exception("boom")
+
+        assert client.bulk_create_parallel([{"label": "Enum", "name": "E", "namespace": "ns"}], workers=1) is False
+
+    @pytest.mark.parametrize("method,label", [
+        ("create_repository_node", "Repository"),
+        ("create_class_node", "Class"),
+        ("create_stored_procedure_node", "StoredProcedure"),
+        ("create_table_node", "Table")
+    ])
+    def test_node_wrappers_dispatch_by_label(self, method, label):
+        """Test each create_*_node wrapper merges its own label with its default type"""
+        client, session = make_sync_client()
+
+        assert getattr(client, method)("Name", "Namespace") is True
+        query = session.run.call_args[0][0]
+        assert f"(n:{label} " in query
+        assert session.run.call_args[1]["type"] == label
+
+    def test_created_at_only_written_on_create(self):
+        """Test re-merging an existing node or relationship leaves created_at untouched"""
+        client, session = make_sync_client()
+
+        client.create_method_node("M", "ns.M")
+        client.create_class_has_method("C", "ns", "M", "ns.M")
+
+        for call in session.run.call_args_list:
+            query = call[0][0]
+            assert "ON CREATE SET" in query
+            assert "created_at" not in query.partition("ON MATCH SET")[2]
+
+    def test_iter_classes_using_constant_streams_lazily(self):
+        """Test the generator yields per record and can be stopped early"""
+        client, session = make_sync_client()
+        session.run.return_value = iter([
+            Record({"constant_name": "MaxRetries", "constant_namespace": "Global", "class_name": "A", "class_namespace": "ns"}),
+            Record({"constant_name": "MaxRetries", "constant_namespace": "Global", "class_name": "B", "class_namespace": "ns"})
+        ])
+
+        classes = client.iter_classes_using_constant("MaxRetries", "Global")
+        session.run.assert_not_called()
+
+        assert next(classes) == {"class_name": "A", "class_namespace": "ns"}
+        classes.close()
+
+    def test_find_classes_using_constant_returns_empty_on_error(self):
+        """Test the list variant still swallows query errors"""
+        client, session = make_sync_client()
+        session.run.side_effect = Exception("boom")
+
+        assert len(client.find_classes_using_constant("MaxRetries", "Global")) == 0
+
+    def test_repeated_creates_are_deduplicated(self):
+        """Test a node or relationship already written this run skips the round trip"""
+        client, session = make_sync_client()
+
+        for _ in range(3):
+            assert client.create_class_node("A", "ns") is True
+            assert client.create_class_has_method("A", "ns", "M", "ns.M") is True
+        assert session.run.call_count == 2
+
+        client.clear_dedup_cache()
+        assert client.create_class_node("A", "ns") is True
+        assert session.run.call_count == 3
+
+    def test_unmatched_relationship_is_not_remembered(self):
+        """Test an edge whose endpoints were missing is written again once they exist"""
+        client, session = make_sync_client()
+        session.run.return_value.consume.return_value.counters.relationships_created = 0
+
+        assert client.create_class_has_method("A", "ns", "M", "ns.M") is True
+        session.run.return_value.consume.return_value.counters.relationships_created = 1
+        assert client.create_class_has_method("A", "ns", "M", "ns.M") is True
+        assert client.create_class_has_method("A", "ns", "M", "ns.M") is True
+        assert session.run.call_count == 2
+
+    def test_node_with_new_properties_is_written_again(self):
+        """Test a repeat node create only skips the round trip when type and source match"""
+        client, session = make_sync_client()
+
+        assert client.create_class_node("A", "ns") is True
+        assert client.create_class_node("A", "ns", type="Interface") is True
+        assert client.create_class_node("A", "ns", type="Interface") is True
+        assert session.run.call_count == 2
+        assert session.run.call_args[1]["type"] == "Interface"
+
+    def test_failed_create_is_not_remembered(self):
+        """Test a failed write is retried on the next call"""
+        client, session = make_sync_client()
+        session.run.side_effect = [Exception("boom"), Mock()]
+
+        assert client.create_table_node("Users", "dbo") is False
+        assert client.create_table_node("Users", "dbo") is True
+        assert session.run.call_count == 2
+
+    def test_render_csv_quotes_values(self):
+        """Test rows are rendered with a header and CSV quoting"""
+        text = Neo4jDotNetClient.render_csv([{"name": "Get,User", "namespace": "ns", "type": 'a "b"'}])
+
+        assert text.splitlines() == ["name,namespace,type,source", '"Get,User",ns,"a ""b""",']
+
+    def test_bulk_ingest_via_csv_writes_file_and_loads_it(self, tmp_path):
+        """Test the CSV is written to the import directory and loaded in batched transactions"""
+        client, session = make_sync_client()
+        rows = [{"name": "A", "namespace": "ns"}, {"name": "A", "namespace": "ns"}]
+
+        assert client.bulk_ingest_via_csv("Class", rows, import_dir=str(tmp_path)) is True
+        assert (tmp_path / "Class.csv").read_text().splitlines() == ["name,namespace,type,source", "A,ns,,"]
+        query = session.run.call_args[0][0]
+        assert query.startswith("LOAD CSV WITH HEADERS FROM $url")
+        assert "IN TRANSACTIONS OF" in query
+        assert session.run.call_args[1] == {"url": "file:///Class.csv"}
+
+    def test_bulk_ingest_via_csv_requires_import_dir(self, monkeypatch):
+        """Test a missing import directory fails without touching Neo4j"""
+        client, session = make_sync_client()
+        monkeypatch.delenv("NEO4J_IMPORT_DIR", raising=False)
+
+        assert client.bulk_ingest_via_csv("Class", [{"name": "A", "namespace": "ns"}]) is False
+        session.run.assert_not_called()
+
+    def test_controller_classes_get_controller_label(self):
+        """Test Class writes label controllers and lookups match on the :Controller label"""
+        client, session = make_sync_client()
+
+        client.create_class_node("UserController", "Company.Controllers", type="Controller")
+        assert "SET n:Controller" in session.run.call_args[0][0]
+
+        client.find_controllers_calling_sp("GetUserById", "dbo")
+        query = session.run.call_args[0][0]
+        assert "(c:Controller)" in query
+        assert 'type: "Controller"' not in query
+
+    @patch('src.lumos_cli.clients.neo4j_dotnet_client.time.sleep')
+    def test_transient_errors_are_retried_with_backoff(self, mock_sleep):
+        """Test a TransientError is retried with exponentially growing delays"""
+        client, session = make_sync_client()
+        session.run.side_effect = [TransientError("lock"), TransientError("lock"), Mock()]
+
+        assert client.create_class_node("A", "ns") is True
+        assert session.run.call_count == 3
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [0.1, 0.2]
+
+    @patch('src.lumos_cli.clients.neo4j_dotnet_client.time.sleep')
+    def test_retries_give_up_after_max_retries(self, mock_sleep):
+        """Test a persistent TransientError fails the write after MAX_RETRIES"""
+        client, session = make_sync_client()
+        session.run.side_effect = TransientError("lock")
+
+        assert client.create_class_node("A", "ns") is False
+        assert session.run.call_count == Neo4jDotNetClient.MAX_RETRIES + 1
+
+    @patch('src.lumos_cli.clients.neo4j_dotnet_client.time.sleep')
+    def test_writes_back_off_when_latency_spikes(self, mock_sleep):
+        """Test writes pause while the rolling median is far above the baseline"""
+        client, session = make_sync_client()
+        client._baseline_latency = 0.01
+        client._latencies.extend([0.2] * Neo4jDotNetClient.LATENCY_WINDOW)
+
+        client.create_table_node("Users", "dbo")
+
+        mock_sleep.assert_called_once_with(0.2)
+
+    def test_overview_is_cached_until_a_write(self):
+        """Test repeated overview lookups hit the cache and writes invalidate it"""
+        client, session = make_sync_client()
+        session.run.return_value.single.return_value = Record({
+            "class_count": 2, "constant_count": 0, "enum_count": 0, "method_count": 3, "controller_count": 1
+        })
+
+        first = client.get_repository_overview("repo", "ns")
+        assert client.get_repository_overview("repo", "ns") == first
+        assert session.run.call_count == 1
+        assert client.cache_stats()["queries"] == {"hits": 1, "misses": 1, "size": 1}
+
+        client.create_class_node("A", "ns")
+        client.get_repository_overview("repo", "ns")
+        assert session.run.call_count == 3
+
+    def test_failed_lookups_are_not_cached(self):
+        """Test an error result is not served from the cache"""
+        client, session = make_sync_client()
+        session.run.side_effect = [Exception("boom"), iter([Record({"constant_name": "MaxRetries", "constant_namespace": "Global", "class_name": "A", "class_namespace": "ns"})])]
+
+        assert len(client.find_classes_using_constant("MaxRetries", "Global")) == 0
+        assert list(client.find_classes_using_constant("MaxRetries", "Global")) == [{"class_name": "A", "class_namespace": "ns"}]
+
+    def test_reads_reuse_one_session_per_thread(self):
+        """Test read calls share a cached READ session that close() ends"""
+        client, session = make_sync_client()
+        session.run.return_value = []
+
+        client.find_controllers_calling_sp("A", "dbo")
+        client.find_controllers_calling_sp("B", "dbo")
+
+        client.driver.session.assert_called_once_with(database="neo4j", default_access_mode="READ")
+        session.close.assert_not_called()
+        client.close()
+        session.close.assert_called_once()
+
+    def test_read_session_is_reopened_after_session_expired(self):
+        """Test a read retries once on a fresh session when the connection dropped"""
+        client, session = make_sync_client()
+        session.run.side_effect = [SessionExpired("gone"), []]
+
+        assert client.find_controllers_calling_sp("A", "dbo") == []
+        assert client.driver.session.call_count == 2
+
+    @patch('src.lumos_cli.clients.neo4j_dotnet_client.GraphDatabase.driver')
+    def test_connect_reuses_existing_driver(self, mock_driver_factory):
+        """Test reconnecting keeps the client's single driver instance"""
+        session = Mock()
+        session.__enter__ = Mock(return_value=session)
+        session.__exit__ = Mock(return_value=False)
+        session.run.return_value.single.return_value = {"test": 1}
+        mock_driver_factory.return_value.session.return_value = session
+
+        client = Neo4jDotNetClient("bolt://test:7687", "neo4j", "secret")
+        client.connect()
+        client.connect()
+
+        mock_driver_factory.assert_called_once()
+        client.close()
+
+    def test_find_classes_using_constants_batch_groups_by_constant(self):
+        """Test several constants are looked up in one UNWIND query and grouped per input"""
+        client, session = make_sync_client()
+        session.run.return_value = [
+            Record({"constant_name": "MaxRetries", "constant_namespace": "Global", "class_name": "A", "class_namespace": "ns"}),
+            Record({"constant_name": "MaxRetries", "constant_namespace": "Global", "class_name": "B", "class_namespace": "ns"})
+        ]
+
+        result = client.find_classes_using_constants_batch([("MaxRetries", "Global"), ("Timeout", "Global")])
+
+        session.run.assert_called_once()
+        assert session.run.call_args[0][0].lstrip().startswith("UNWIND $rows")
+        assert [c["class_name"] for c in result[("MaxRetries", "Global")]] == ["A", "B"]
+        assert result[("Timeout", "Global")] == []
+
+    def test_overview_counts_in_independent_subqueries(self):
+        """Test the overview query aggregates each count in its own CALL subquery"""
+        client, session = make_sync_client()
+        session.run.return_value.single.return_value = Record({
+            "class_count": 2, "constant_count": 0, "enum_count": 1, "method_count": 4, "controller_count": 1
+        })
+
+        overview = client.get_repository_overview("repo", "ns")
+
+        query = session.run.call_args[0][0]
+        assert query.count("CALL {") == 5
+        assert "OPTIONAL MATCH" not in query
+        assert "coalesce(constant_count, 0)" in query
+        session.run.return_value.single.assert_called_once_with(strict=True)
+        assert overview == {"class_count": 2, "constant_count": 0, "enum_count": 1, "method_count": 4, "controller_count": 1}
+
+    def test_iter_counts_streamed_records_only_when_debugging(self):
+        """Test the record counter wraps the stream only with debug logging enabled"""
+        client, session = make_sync_client()
+        session.run.return_value = [Record({"controller_name": "A", "controller_namespace": "ns"})]
+
+        with patch('src.lumos_cli.clients.neo4j_dotnet_client.debug_logger') as mock_logger:
+            mock_logger.enabled = True
+            assert list(client.iter_controllers_calling_sp("SP", "dbo")) == [{"controller_name": "A", "controller_namespace": "ns"}]
+            mock_logger.debug.assert_called_once_with("Streamed %d %s", 1, "controllers calling SP")
+
+            mock_logger.enabled = False
+            mock_logger.debug.reset_mock()
+            assert len(list(client.iter_controllers_calling_sp("SP", "dbo"))) == 1
+            mock_logger.debug.assert_not_called()
+
+    def test_lookup_tracing_skipped_when_debug_disabled(self):
+        """Test call/return tracing is not built for lookups when debug logging is off"""
+        client, session = make_sync_client()
+        session.run.return_value = []
+
+        with patch('src.lumos_cli.clients.neo4j_dotnet_client.debug_logger') as mock_logger:
+            mock_logger.enabled = False
+            client.find_controllers_calling_sp("SP", "dbo")
+
+            mock_logger.log_function_call.assert_not_called()
+            mock_logger.log_function_return.assert_not_called()
+            mock_logger.info.assert_called_once_with("Found %d controllers calling %s", 0, "SP")
+
+    def test_constant_cache_survives_unrelated_writes(self):
+        """Test constant lookups stay cached across node writes but not method-graph writes"""
+        client, session = make_sync_client()
+        record = Record({"constant_name": "MaxRetries", "constant_namespace": "Global", "class_name": "A", "class_namespace": "ns"})
+        session.run.side_effect = lambda *args, **kwargs: [record] if "UNWIND $rows AS p" in args[0] else Mock()
+
+        client.find_classes_using_constant("MaxRetries", "Global")
+        client.create_table_node("Users", "dbo")
+        client.find_classes_using_constant("MaxRetries", "Global")
+        assert client.cache_stats()["constants"]["hits"] == 1
+
+        client.create_class_has_method("A", "ns", "M", "ns.M")
+        client.find_classes_using_constant("MaxRetries", "Global")
+        assert client.cache_stats()["constants"]["misses"] == 2
+
+        client.invalidate_constant("MaxRetries", "Global")
+        assert client.cache_stats()["constants"]["size"] == 0
+
+    def test_clear_repository_deletes_contents_in_chunks_then_repository(self):
+        """Test the repository subgraph is deleted in batched transactions before the node itself"""
+        client, session = make_sync_client()
+
+        assert client.clear_repository_data("repo", "ns") is True
+
+        contents, repository = [c[0][0] for c in session.run.call_args_list]
+        assert "IN TRANSACTIONS OF" in contents and "DETACH DELETE n" in contents
+        assert "DETACH DELETE r" in repository
+
+    def test_find_classes_using_constant_scoped_to_repository(self):
+        """Test a repository filter seeds the query from that Repository node"""
+        client, session = make_sync_client()
+        session.run.return_value = [Record({"class_name": "A", "class_namespace": "ns"})]
+
+        classes = client.find_classes_using_constant("MaxRetries", "Global", repo_name="repo", repo_namespace="org")
+
+        assert list(classes) == [{"class_name": "A", "class_namespace": "ns"}]
+        query = session.run.call_args[0][0]
+        assert query.lstrip().startswith("MATCH (r:Repository")
+        assert session.run.call_args[1]["repo_name"] == "repo"
+
+    def test_find_classes_using_constant_returns_parallel_lists(self):
+        """Test lookup results are held as name/namespace lists and copied out of the cache"""
+        client, session = make_sync_client()
+        session.run.return_value = [
+            Record({"constant_name": "MaxRetries", "constant_namespace": "Global", "class_name": "A", "class_namespace": "ns"}),
+            Record({"constant_name": "MaxRetries", "constant_namespace": "Global", "class_name": "B", "class_namespace": "ns"}),
+        ]
+
+        classes = client.find_classes_using_constant("MaxRetries", "Global")
+        assert isinstance(classes, ClassResult)
+        assert classes.names == ["A", "B"] and classes.namespaces == ["ns", "ns"]
+        assert len(classes) == 2
+
+        classes.names.clear()
+        assert client.find_classes_using_constant("MaxRetries", "Global").names == ["A", "B"]
+
+    def test_profile_mode_logs_db_hits(self, monkeypatch):
+        """Test LUMOS_CYPHER_PROFILE=1 runs a PROFILE pass and logs its db hits"""
+        monkeypatch.setenv("LUMOS_CYPHER_PROFILE", "1")
+        client, session = make_sync_client()
+        profiled = Mock()
+        profiled.consume.return_value.profile = {"operatorType": "NodeIndexSeek@neo4j", "dbHits": 3, "children": []}
+        session.run.side_effect = lambda query, **kwargs: profiled if query.startswith("PROFILE") else []
+
+        with patch('src.lumos_cli.clients.neo4j_dotnet_client.debug_logger') as mock_logger:
+            client.find_controllers_calling_sp("SP", "dbo")
+
+        assert session.run.call_args_list[0][0][0].startswith("PROFILE")
+        message, total = mock_logger.info.call_args_list[0][0][:2]
+        assert message.startswith("PROFILE") and total == 3
@@ -0,0 +1,187 @@
+"""
+Unit tests for repository persona detection
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+from src.lumos_cli.core.persona import RepositoryAnalyzer
+
+class TestRepositoryAnalyzer:
+    """Test cases for RepositoryAnalyzer"""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "app.py").write_text("")
+        (tmp_path / "pkg" / "test_app.py").write_text("")
+        (tmp_path / "pkg" / "notes.pyc").write_text("")
+        (tmp_path / "tools").mkdir()
+        (tmp_path / "tools" / "Makefile").write_text("")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "config").write_text("")
+        (tmp_path / "node_modules" / "left-pad").mkdir(parents=True)
+        (tmp_path / "node_modules" / "left-pad" / "index.js").write_text("")
+        return tmp_path
+
+    def test_file_cache_indexes_files_by_extension_and_name(self, repo):
+        """Test the cache skips hidden directories and indexes files by extension and base name"""
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        assert "pkg/" in analyzer._files
+        assert not any(path.startswith(".git") for path in analyzer._files)
+        assert sorted(analyzer._by_ext[".py"]) == ["pkg/app.py", "pkg/test_app.py"]
+        assert "Makefile" in analyzer._basenames
+        assert analyzer._manifests == {}
+        assert analyzer._n_files == 4
+
+    def test_dependency_directories_are_recorded_but_not_walked(self, repo):
+        """Test pruned directories keep their marker without their contents being listed"""
+        (repo / ".venv").mkdir()
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        assert "node_modules/" in analyzer._files
+        assert ".venv/" in analyzer._files
+        assert not any(path.startswith("node_modules/left-pad") for path in analyzer._files)
+        assert ".js" not in analyzer._by_ext
+
+    def test_walk_stops_at_file_budget(self, repo):
+        """Test the walk honours max_files and lowers confidence when it is cut short"""
+        analyzer = RepositoryAnalyzer(str(repo), max_files=2)
+
+        assert len([path for path in analyzer._files if not path.endswith("/")]) == 2
+        assert analyzer._truncated is True
+        assert analyzer._calculate_confidence({"python": 0.5}, {}) == pytest.approx(0.4)
+
+    def test_globs_match_file_names(self, repo):
+        """Test glob indicators match file names rather than substrings of paths"""
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        assert analyzer._count_glob("*.py") == 2
+        assert analyzer._count_glob("test_*.py") == 1
+        assert "unittest" in analyzer._detect_testing_frameworks()
+        assert "make" in analyzer._detect_build_tools()
+
+    def test_dependency_manifests_are_parsed_once(self, repo):
+        """Test framework detection reuses parsed manifests until they change on disk"""
+        (repo / "requirements.txt").write_text("flask==2.0\n")
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        with patch.object(analyzer, "_parse_requirements_txt", wraps=analyzer._parse_requirements_txt) as parse:
+            frameworks = analyzer.detect_frameworks(["python"])
+            analyzer.extract_dependencies(["python"])
+            analyzer.extract_dependencies(["python", "go"])
+            assert parse.call_count == 1
+
+            (repo / "requirements.txt").write_text("flask==2.0\nrequests==2.31\n")
+            assert analyzer.extract_dependencies(["python", "java"])["python"] == ["flask", "requests"]
+            assert parse.call_count == 2
+
+        assert "python:flask" in frameworks
+
+    def test_python_manifests_are_parsed_structurally(self, repo):
+        """Test pyproject.toml and setup.py dependencies come from the parsed documents"""
+        (repo / "pyproject.toml").write_text(
+            '[project]\ndependencies = ["httpx>=0.27", "rich", "typer[all] ; python_version > \'3.8\'"]\n'
+            '[tool.poetry.dependencies]\npython = "^3.11"\nflask = "^2.0"\n'
+        )
+        (repo / "setup.py").write_text("from setuptools import setup\nsetup(name='x', install_requires=['numpy>=1.26', 'requests'])\n")
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        assert analyzer._parse_pyproject_toml(str(repo / "pyproject.toml")) == ["httpx", "rich", "typer", "flask"]
+        assert analyzer._parse_setup_py(str(repo / "setup.py")) == ["numpy", "requests"]
+
+    def test_analyze_reuses_cached_context_until_invalidated(self, repo, tmp_path_factory, monkeypatch):
+        """Test analyze() serves the on-disk snapshot while the repository signature is unchanged"""
+        monkeypatch.setattr(RepositoryAnalyzer, "CONTEXT_CACHE_DIR", tmp_path_factory.mktemp("context_cache"))
+        context = RepositoryAnalyzer(str(repo)).analyze()
+
+        analyzer = RepositoryAnalyzer(str(repo))
+        with patch.object(analyzer, "_analyze") as full_analysis:
+            assert analyzer.analyze() == context
+            full_analysis.assert_not_called()
+        assert analyzer._walk is None
+
+        analyzer.invalidate()
+        assert not analyzer._context_cache_path().exists()
+
+    def test_large_buckets_match_globs_with_numpy(self, repo, monkeypatch):
+        """Test the vectorised glob path agrees with fnmatch"""
+        monkeypatch.setattr("src.lumos_cli.core.persona.VECTORIZE_THRESHOLD", 0)
+        (repo / "pkg" / "app_test.py").write_text("")
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        assert analyzer._count_glob("test_*.py") == 1
+        assert analyzer._count_glob("*_test.py") == 1
+        assert analyzer._count_glob("app*.py") == 2
+        assert analyzer._count_glob("test_app*test_app.py") == 0
+
+    def test_detect_languages_stops_once_top_languages_saturate(self, repo):
+        """Test languages after the top_n saturated ones are not evaluated"""
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        assert list(analyzer.detect_languages(top_n=1)) == ["python"]
+        assert "python" in analyzer.detect_languages()
+
+    def test_go_mod_reads_only_require_directives(self, repo):
+        """Test go.mod parsing follows require blocks and single-line requires"""
+        (repo / "go.mod").write_text(
+            "module github.com/me/app\n\nrequire (\n\tgithub.com/gin-gonic/gin v1.9.0\n\tgolang.org/x/net v0.1 // indirect\n)\n"
+            "require github.com/stretchr/testify v1.8.0\n\nreplace (\n\tgithub.com/x/y => ../y\n)\n"
+        )
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        assert analyzer._parse_go_mod(str(repo / "go.mod")) == ["gin", "net", "testify"]
+
+    def test_context_snapshot_streams_without_orjson(self, repo, tmp_path_factory, monkeypatch):
+        """Test the json fallback writes a snapshot that analyze() reads back"""
+        monkeypatch.setattr(RepositoryAnalyzer, "CONTEXT_CACHE_DIR", tmp_path_factory.mktemp("context_cache"))
+        monkeypatch.setattr("src.lumos_cli.core.persona.orjson", None)
+        context = RepositoryAnalyzer(str(repo)).analyze()
+
+        analyzer = RepositoryAnalyzer(str(repo))
+        assert analyzer._load_cached_context(analyzer._signature()) == context
+
+    def test_missing_repository_is_analyzed_without_a_snapshot(self, tmp_path, monkeypatch):
+        """Test a path that cannot be stat'ed yields an empty context and writes no snapshot"""
+        monkeypatch.setattr(RepositoryAnalyzer, "CONTEXT_CACHE_DIR", tmp_path / "context_cache")
+        analyzer = RepositoryAnalyzer(str(tmp_path / "missing"))
+
+        context = analyzer.analyze()
+        assert context.primary_languages == []
+        assert not (tmp_path / "context_cache").exists()
+
+    def test_analyze_parses_each_manifest_once(self, repo, tmp_path_factory, monkeypatch):
+        """Test framework detection reuses the dependencies extracted for the context"""
+        monkeypatch.setattr(RepositoryAnalyzer, "CONTEXT_CACHE_DIR", tmp_path_factory.mktemp("context_cache"))
+        (repo / "requirements.txt").write_text("flask==2.0\n")
+        analyzer = RepositoryAnalyzer(str(repo))
+
+        with patch.object(analyzer, "extract_dependencies", wraps=analyzer.extract_dependencies) as extract:
+            context = analyzer._analyze()
+            assert extract.call_count == 1
+        assert "flask" in context.frameworks
+
+    def test_snapshot_tracks_manifests_and_branch_ref(self, repo, tmp_path_factory, monkeypatch):
+        """Test in-place manifest edits and commits to the checked-out branch invalidate the snapshot"""
+        monkeypatch.setattr(RepositoryAnalyzer, "CONTEXT_CACHE_DIR", tmp_path_factory.mktemp("context_cache"))
+        (repo / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (repo / ".git" / "refs" / "heads").mkdir(parents=True)
+        ref = repo / ".git" / "refs" / "heads" / "main"
+        ref.write_text("a" * 40 + "\n")
+        requirements = repo / "requirements.txt"
+        requirements.write_text("flask==2.0\n")
+        signature = RepositoryAnalyzer(str(repo))._signature()
+
+        def touch(path):
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        root_mtime = repo.stat().st_mtime_ns
+        touch(requirements)
+        os.utime(repo, ns=(root_mtime, root_mtime))
+        assert RepositoryAnalyzer(str(repo))._signature() != signature
+
+        signature = RepositoryAnalyzer(str(repo))._signature()
+        touch(ref)
+        assert RepositoryAnalyzer(str(repo))._signature() != signature
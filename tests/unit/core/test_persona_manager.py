@@ -0,0 +1,177 @@
+"""
+Unit tests for PersonaManager
+"""
+
+import gc
+import os
+import weakref
+import pytest
+from unittest.mock import patch
+from src.lumos_cli.core.persona import ProjectContext, RepositoryAnalyzer
+from src.lumos_cli.core.persona_manager import PersonaManager, _flush_live_managers
+
+def make_context(repo_path: str) -> ProjectContext:
+    return ProjectContext(
+        repo_path=repo_path, primary_languages=["python"], frameworks=[], project_type="cli_tool",
+        dependencies={}, config_files=[], build_tools=[], testing_frameworks=[], package_managers=[],
+        git_info={}, confidence_score=0.5
+    )
+
+class TestPersonaManager:
+    """Test cases for PersonaManager"""
+
+    @pytest.fixture(autouse=True)
+    def workdir(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    @patch('src.lumos_cli.core.persona_manager.RepositoryAnalyzer')
+    def test_contexts_are_cached_one_file_per_repository(self, mock_analyzer, workdir):
+        """Test each repository gets its own cache file that a new manager loads lazily"""
+        mock_analyzer.return_value.analyze.side_effect = lambda: make_context("repo")
+        manager = PersonaManager()
+        manager.get_project_context("a")
+        manager.get_project_context("b")
+
+        assert len(os.listdir(workdir / ".lumos_persona_cache")) == 2
+
+        fresh = PersonaManager()
+        assert fresh._context_cache == {}
+        assert fresh.get_project_context("a").project_type == "cli_tool"
+        assert mock_analyzer.return_value.analyze.call_count == 2
+        assert list(fresh._context_cache) == [os.path.abspath("a")]
+
+    @patch('src.lumos_cli.core.persona_manager.RepositoryAnalyzer')
+    def test_invalidate_cache_removes_entry_files(self, mock_analyzer, workdir):
+        """Test invalidating one repository deletes only its file"""
+        mock_analyzer.return_value.analyze.side_effect = lambda: make_context("repo")
+        manager = PersonaManager()
+        manager.get_project_context("a")
+        manager.get_project_context("b")
+
+        manager.invalidate_cache("a")
+        assert manager.get_cache_stats()["cached_repositories"] == 1
+
+        manager.invalidate_cache()
+        assert manager.get_cache_stats()["cached_repositories"] == 0
+
+    def test_system_prompts_are_cached_per_context_and_command(self):
+        """Test a repeated (context, command) pair reuses the generated prompt"""
+        manager = PersonaManager()
+        context = make_context("repo")
+
+        with patch.object(manager, "_build_system_prompt", wraps=manager._build_system_prompt) as build:
+            first = manager.generate_system_prompt(context, "chat")
+            assert manager.generate_system_prompt(make_context("repo"), "chat") == first
+            manager.generate_system_prompt(context, "review")
+            context.frameworks.append("flask")
+            assert "Flask" in manager.generate_system_prompt(context, "chat")
+            assert build.call_count == 3
+
+    @patch('src.lumos_cli.core.persona_manager.RepositoryAnalyzer')
+    def test_unchanged_repository_skips_analysis_after_ttl(self, mock_analyzer, workdir):
+        """Test the repository signature keeps an entry valid past its TTL until the top level changes"""
+        mock_analyzer.return_value.analyze.side_effect = lambda: make_context("repo")
+        (workdir / "a").mkdir()
+        manager = PersonaManager(cache_duration_hours=0)
+
+        manager.get_project_context("a")
+        manager.get_project_context("a")
+        assert mock_analyzer.return_value.analyze.call_count == 1
+
+        (workdir / "a" / "setup.py").write_text("")
+        manager.get_project_context("a")
+        assert mock_analyzer.return_value.analyze.call_count == 2
+
+    @patch('src.lumos_cli.core.persona_manager.RepositoryAnalyzer')
+    def test_failed_writes_are_retried_by_flush(self, mock_analyzer, workdir):
+        """Test an entry whose write failed stays dirty until flush() manages to write it"""
+        mock_analyzer.return_value.analyze.side_effect = lambda: make_context("repo")
+        manager = PersonaManager()
+        
+        with patch('src.lumos_cli.core.persona_manager.tempfile.mkstemp', side_effect=OSError("disk full")):
+            manager.get_project_context("a")
+        assert manager._dirty == {os.path.abspath("a")}
+        
+        manager.flush()
+        assert manager._dirty == set()
+        assert len(os.listdir(workdir / ".lumos_persona_cache")) == 1
+
+    def test_enhanced_messages_only_check_the_first_message(self):
+        """Test a leading system message is kept and a later one needs strict=True"""
+        manager = PersonaManager()
+        context = make_context("repo")
+        leading = [{"role": "system", "content": "s"}, {"role": "user", "content": "hi"}]
+        trailing = [{"role": "user", "content": "hi"}, {"role": "system", "content": "s"}]
+
+        assert manager.get_enhanced_messages(leading, context) is leading
+        assert manager.get_enhanced_messages(trailing, context, strict=True) is trailing
+        enhanced = manager.get_enhanced_messages(trailing, context)
+        assert enhanced[0]["role"] == "system" and enhanced[1:] == trailing
+
+    @patch('src.lumos_cli.core.persona_manager.RepositoryAnalyzer')
+    def test_cache_hits_return_the_same_context_object(self, mock_analyzer, workdir):
+        """Test a cached context is built once and dropped again on invalidation"""
+        mock_analyzer.return_value.analyze.side_effect = lambda: make_context("repo")
+        manager = PersonaManager()
+        first = manager.get_project_context("a")
+
+        assert manager.get_project_context("a") is first
+        assert PersonaManager().get_project_context("a") == first
+
+        manager.invalidate_cache("a")
+        assert manager.get_project_context("a") is not first
+
+    def test_manifest_change_bypasses_the_analyzer_snapshot(self, workdir, monkeypatch):
+        """Test a stale entry is re-analyzed from the repository rather than the analyzer's snapshot"""
+        monkeypatch.setattr(RepositoryAnalyzer, "CONTEXT_CACHE_DIR", workdir / "context_cache")
+        (workdir / "a").mkdir()
+        requirements = workdir / "a" / "requirements.txt"
+        requirements.write_text("flask==2.0\n")
+        assert PersonaManager().get_project_context("a").dependencies == {"python": ["flask"]}
+
+        requirements.write_text("django==4.2\n")
+        os.utime(requirements, ns=(0, requirements.stat().st_mtime_ns + 1_000_000_000))
+        assert PersonaManager().get_project_context("a").dependencies == {"python": ["django"]}
+
+    def test_repo_signature_changes_on_commit(self, workdir):
+        """Test moving the checked-out branch changes the signature even though HEAD is untouched"""
+        (workdir / "a" / ".git" / "refs" / "heads").mkdir(parents=True)
+        (workdir / "a" / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        ref = workdir / "a" / ".git" / "refs" / "heads" / "main"
+        ref.write_text("a" * 40 + "\n")
+        manager = PersonaManager()
+        signature = manager._repo_signature(str(workdir / "a"))
+
+        os.utime(ref, ns=(0, ref.stat().st_mtime_ns + 1_000_000_000))
+        assert manager._repo_signature(str(workdir / "a")) != signature
+
+    def test_exit_flush_does_not_keep_managers_alive(self):
+        """Test a dropped manager is collected and the shared exit hook flushes the live ones"""
+        manager = PersonaManager()
+        ref = weakref.ref(manager)
+        del manager
+        gc.collect()
+        assert ref() is None
+
+        manager = PersonaManager()
+        with patch.object(manager, "flush") as flush:
+            _flush_live_managers()
+            flush.assert_called_once()
+
+    @patch('src.lumos_cli.core.persona_manager.RepositoryAnalyzer')
+    def test_cache_stats_read_no_entry_files(self, mock_analyzer, workdir):
+        """Test stats date loaded and unflushed entries from memory and the rest from file mtimes"""
+        mock_analyzer.return_value.analyze.side_effect = lambda: make_context("repo")
+        PersonaManager().get_project_context("a")
+        manager = PersonaManager()
+        with patch('src.lumos_cli.core.persona_manager.tempfile.mkstemp', side_effect=OSError("disk full")):
+            manager.get_project_context("b")
+
+        with patch.object(manager, "_read_entry_file") as read:
+            stats = manager.get_cache_stats()
+            read.assert_not_called()
+        assert stats["cached_repositories"] == 2
+        assert stats["newest_cache_entry"] == manager._timestamp_cache[os.path.abspath("b")].isoformat()
+        assert stats["oldest_cache_entry"] < stats["newest_cache_entry"]
+        manager.flush()
@@ -2,6 +2,7 @@
 Unit tests for SafeFileEditor
 """
 
+import ast
 import pytest
 import tempfile
 import os
@@ -142,3 +143,93 @@ class TestSafeFileEditor:
             assert info['size'] > 0
             assert info['extension'] == '.py'
             assert info['lines'] == 2
+    
+    def test_python_syntax_is_compiled_once_per_content(self):
+        """Test repeated validation of identical content reuses the parse outcome"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            editor = SafeFileEditor(backup_dir=temp_dir)
+            invalid_code = "def hello(:\n    pass"
+            
+            with patch('src.lumos_cli.core.safety.ast.parse', wraps=ast.parse) as parse:
+                first = editor.validate_content(invalid_code, "app.py")
+                assert editor.validate_content(invalid_code, "other.py") == first
+                assert parse.call_count == 1
+            
+            assert first[0] is False
+            assert any(warning.startswith("Python syntax error") for warning in first[1])
+    
+    def test_show_diff_skips_identical_content_and_truncates_long_diffs(self):
+        """Test identical content is reported without diffing and long diffs are cut short"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            editor = SafeFileEditor(backup_dir=temp_dir)
+            editor.MAX_DIFF_CHARS = 100
+            
+            with patch('src.lumos_cli.core.safety.difflib.unified_diff') as unified_diff:
+                assert editor.show_diff("same\n", "same\n") is False
+                unified_diff.assert_not_called()
+            
+            with patch('rich.syntax.Syntax') as syntax, patch('src.lumos_cli.core.safety.console'):
+                assert editor.show_diff("", "line\n" * 1000) is True
+                diff_text = syntax.call_args[0][0]
+                assert diff_text.endswith("...[truncated]\n")
+                assert len(diff_text) < 200
+    
+    def test_unchanged_file_backups_are_hard_linked(self):
+        """Test back-to-back backups get distinct names and identical content is linked, not copied"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            editor = SafeFileEditor(backup_dir=os.path.join(temp_dir, "backups"))
+            test_file = os.path.join(temp_dir, "test.py")
+            with open(test_file, 'w') as f:
+                f.write("original content")
+            
+            first = editor.create_backup(test_file)
+            second = editor.create_backup(test_file)
+            
+            assert first != second
+            assert os.path.samefile(first, second)
+            with open(second, 'r') as f:
+                assert f.read() == "original content"
+    
+    def test_safe_write_backs_up_only_confirmed_writes(self):
+        """Test a cancelled write leaves no backup and a confirmed one replaces the file in place"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            backup_dir = os.path.join(temp_dir, "backups")
+            editor = SafeFileEditor(backup_dir=backup_dir)
+            test_file = os.path.join(temp_dir, "test.py")
+            with open(test_file, 'w') as f:
+                f.write("x = 1\n")
+            os.chmod(test_file, 0o640)
+            
+            with patch.object(editor, 'preview_and_confirm', return_value=False):
+                assert editor.safe_write(test_file, "x = 2\n") is False
+            assert os.listdir(backup_dir) == []
+            
+            assert editor.safe_write(test_file, "x = 2\n", preview=False) is True
+            with open(test_file, 'r') as f:
+                assert f.read() == "x = 2"
+            assert os.stat(test_file).st_mode & 0o777 == 0o640
+            assert len(os.listdir(backup_dir)) == 1
+            assert not [name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+    
+    def test_safe_write_writes_through_symlinks(self):
+        """Test writing to a symlink updates its target and keeps the link"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            editor = SafeFileEditor(backup_dir=os.path.join(temp_dir, "backups"))
+            real_file = os.path.join(temp_dir, "real.py")
+            link = os.path.join(temp_dir, "link.py")
+            with open(real_file, 'w') as f:
+                f.write("x = 1\n")
+            os.symlink(real_file, link)
+            
+            assert editor.safe_write(link, "x = 2\n", preview=False) is True
+            assert os.path.islink(link)
+            with open(real_file, 'r') as f:
+                assert f.read() == "x = 2"
+    
+    def test_validate_content_flags_lone_surrogates(self):
+        """Test only content that cannot be encoded as UTF-8 gets the encoding warning"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            editor = SafeFileEditor(backup_dir=temp_dir)
+            
+            assert editor.validate_content("héllo = 1", "notes.txt") == (True, [])
+            assert editor.validate_content("x = '\udc80'", "notes.txt") == (False, ["Content contains non-UTF-8 characters"])
@@ -0,0 +1,31 @@
+"""
+Unit tests for ShellExecutor
+"""
+
+import subprocess
+import sys
+from unittest.mock import patch
+from src.lumos_cli.utils.shell_executor import ShellExecutor
+
+class TestShellExecutor:
+    """Test cases for ShellExecutor"""
+
+    @patch('src.lumos_cli.utils.shell_executor.console')
+    def test_stream_output_drains_both_pipes_without_blocking(self, mock_console):
+        """Test a silent stream does not hold up the other and partial lines are completed"""
+        script = (
+            "import sys, time\n"
+            "sys.stdout.write('a\\nb'); sys.stdout.flush()\n"
+            "sys.stderr.write('err\\n'); sys.stderr.flush()\n"
+            "time.sleep(0.2)\n"
+            "sys.stdout.write('c\\nlast')\n"
+        )
+        process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        stdout, stderr = ShellExecutor()._stream_output(process)
+        process.wait()
+
+        assert stdout == "a\nbc\nlast"
+        assert stderr == "err\n"
+        printed = [call.args[0] for call in mock_console.print.call_args_list]
+        assert printed == ["a", "[red]err[/red]", "bc", "last"]